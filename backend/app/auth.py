@@ -1,11 +1,16 @@
 ﻿import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from .database import get_db
@@ -14,6 +19,9 @@ from .models import User
 SECRET_KEY = os.getenv("JWT_SECRET", "CHANGE_ME_IN_PROD_SUPER_SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
+# Verified tokens are remembered per process; the TTL bounds how long another worker may serve a changed user.
+AUTH_CACHE_ITEMS = int(os.getenv("TALENTALIGN_AUTH_CACHE_ITEMS", "10000"))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("TALENTALIGN_AUTH_CACHE_TTL_SECONDS", "60"))
 
 # Use a stable hash scheme across Python/OS environments.
 # This avoids bcrypt backend issues seen on some Windows + Python 3.12 setups.
@@ -35,22 +43,109 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None)
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+@dataclass(frozen=True)
+class AuthIdentity:
+    sub: str
+    expires_at: float
+    # None when only the signature has been checked (request logging); set once resolved against the users table.
+    user_id: Optional[int] = None
+
+
+class _IdentityCache:
+    def __init__(self, max_items: int, ttl_seconds: float):
+        self.max_items = max(0, max_items)
+        self.ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[AuthIdentity]:
+        with self._lock:
+            entry = self._items.get(token)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._items[token]
+                return None
+            self._items.move_to_end(token)
+            return entry[1]
+
+    def put(self, token: str, identity: AuthIdentity):
+        if not self.max_items:
+            return
+        with self._lock:
+            self._items[token] = (min(time.time() + self.ttl_seconds, identity.expires_at), identity)
+            self._items.move_to_end(token)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def invalidate_user(self, user_id: Optional[int] = None, sub: Optional[str] = None):
+        with self._lock:
+            for token, (_, identity) in list(self._items.items()):
+                if (user_id is not None and identity.user_id == user_id) or (sub is not None and identity.sub == sub):
+                    del self._items[token]
+
+
+_identities = _IdentityCache(AUTH_CACHE_ITEMS, AUTH_CACHE_TTL_SECONDS)
+
+
+def verify_token(token: str) -> Optional[AuthIdentity]:
+    """Check a bearer token's signature and expiry, decoding it at most once per cache lifetime."""
+    identity = _identities.get(token)
+    if identity is not None:
+        return identity
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    sub = payload.get("sub")
+    if sub is None:
+        return None
+    identity = AuthIdentity(sub=sub, expires_at=float(payload.get("exp") or time.time() + AUTH_CACHE_TTL_SECONDS))
+    _identities.put(token, identity)
+    return identity
+
+
+def request_identity(request: Request) -> Optional[AuthIdentity]:
+    """The identity authenticated for this request, or a signature-only check of its bearer token."""
+    identity = getattr(request.state, "auth_identity", None)
+    if identity is not None:
+        return identity
+    auth = request.headers.get("Authorization", "")
+    if not auth.startswith("Bearer "):
+        return None
+    return verify_token(auth[len("Bearer ") :].strip())
+
+
+def invalidate_user(user_id: Optional[int] = None, sub: Optional[str] = None):
+    _identities.invalidate_user(user_id=user_id, sub=sub)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target: User):
+    invalidate_user(user_id=target.id, sub=target.email)
+
+
+def get_current_user(request: Request, token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError as exc:
-        raise credentials_exception from exc
+    identity = verify_token(token)
+    if identity is None:
+        raise credentials_exception
+
+    if identity.user_id is not None:
+        # Hot token: a detached User carrying the cached identity; routes only need its id and email.
+        request.state.auth_identity = identity
+        return User(id=identity.user_id, email=identity.sub)
 
-    user = db.query(User).filter(User.email == email).first()
+    user = db.query(User).filter(User.email == identity.sub).first()
     if user is None:
         raise credentials_exception
+    identity = AuthIdentity(sub=identity.sub, expires_at=identity.expires_at, user_id=user.id)
+    _identities.put(token, identity)
+    request.state.auth_identity = identity
     return user
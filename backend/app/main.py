@@ -2,35 +2,45 @@ import json
 import logging
 import time
 import uuid
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
-from .auth import ALGORITHM, SECRET_KEY
-from .database import Base, engine
-from .routes import interview_kit, match, roles, share, system, user
+from .auth import request_identity
+from .database import Base
+from .migrations import AUTO_MIGRATE, run_migrations
+from .routes import interview_kit, jobs, match, roles, share, system, user
+from .services.extraction_pool import get_extraction_pool
+from .services.jobs import start_job_workers, stop_job_workers
+from .services.lexical_model import start_lexical_refresher
+from .services.metrics import HTTP_IN_PROGRESS, HTTP_LATENCY, HTTP_REQUESTS, REGISTRY, count_inserts
+from .services.share_rendering import start_share_purger
+from .services.task_pool import get_task_pool
+from .services.tracing import start_trace
 
 logger = logging.getLogger("talentalign")
 logging.basicConfig(level=logging.INFO)
+count_inserts(Base)
 
 
-def _extract_user_sub(request: Request):
-    auth = request.headers.get("Authorization", "")
-    if not auth.startswith("Bearer "):
-        return None
-    token = auth.replace("Bearer ", "", 1).strip()
-    try:
-        from jose import jwt
-
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload.get("sub")
-    except Exception:
-        return None
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    REGISTRY.remove_stale()
+    start_lexical_refresher()
+    start_share_purger()
+    get_task_pool().warm_up()
+    get_extraction_pool().warm_up()
+    start_job_workers()
+    yield
+    stop_job_workers()
+    get_task_pool().shutdown()
+    get_extraction_pool().shutdown()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="TalentAlign AI API", version="1.0.0")
+    app = FastAPI(title="TalentAlign AI API", version="1.0.0", lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -44,7 +54,8 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    Base.metadata.create_all(bind=engine)
+    if AUTO_MIGRATE:
+        run_migrations()
 
     @app.middleware("http")
     async def request_id_and_logging(request: Request, call_next):
@@ -52,24 +63,34 @@ def create_app() -> FastAPI:
         started = time.perf_counter()
         response = None
         status_code = 500
+        trace = start_trace(request_id)
+        HTTP_IN_PROGRESS.inc(method=request.method)
         try:
             response = await call_next(request)
             status_code = response.status_code
             return response
         finally:
-            elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+            elapsed = time.perf_counter() - started
+            elapsed_ms = round(elapsed * 1000, 2)
+            # Label by route template, never the raw path: share tokens and ids would explode the series count.
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            HTTP_IN_PROGRESS.dec(method=request.method)
+            HTTP_REQUESTS.inc(method=request.method, route=route, status=status_code)
+            HTTP_LATENCY.observe(elapsed, method=request.method, route=route)
             if response is not None:
                 response.headers["X-Request-ID"] = request_id
-            user_sub = _extract_user_sub(request)
+                response.headers["Server-Timing"] = trace.server_timing(elapsed_ms)
+            identity = request_identity(request)
             logger.info(
                 json.dumps(
                     {
                         "request_id": request_id,
                         "route": request.url.path,
                         "method": request.method,
-                        "user_id": user_sub,
+                        "user_id": identity.sub if identity else None,
                         "status": status_code,
                         "duration_ms": elapsed_ms,
+                        "stages_ms": trace.breakdown_ms(),
                     }
                 )
             )
@@ -79,7 +100,9 @@ def create_app() -> FastAPI:
     app.include_router(roles.router)
     app.include_router(interview_kit.router)
     app.include_router(share.router)
+    app.include_router(jobs.router)
     app.include_router(system.router)
+    app.include_router(system.prometheus_router)
 
     @app.get("/")
     def root():
@@ -0,0 +1,218 @@
+import json
+import logging
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from sqlalchemy import JSON, Column, DateTime, Float, Integer, LargeBinary, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateTable
+
+from . import models  # noqa: F401  (registers every table on Base.metadata)
+from .database import Base, engine
+from .services.analysis_store import analysis_columns, role_title_of
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent first starts are not serialised there
+    fcntl = None
+
+logger = logging.getLogger("talentalign")
+
+# Apply pending migrations when the API starts. Multi-node deployments set this to 0 and run
+# `python -m app.migrations` once per release instead.
+AUTO_MIGRATE = os.getenv("TALENTALIGN_AUTO_MIGRATE", "1") == "1"
+# Arbitrary constant shared by every node so only one of them migrates a Postgres database at a time.
+MIGRATION_LOCK_ID = 72817001
+REPACK_BATCH = 500
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def add_column_if_missing(conn: Connection, table: str, column: Column):
+    """
+    Later migrations must be idempotent: the baseline builds tables from the current models, so on a
+    fresh database their columns and indexes already exist when the migration runs.
+    """
+    if column.name in {c["name"] for c in inspect(conn).get_columns(table)}:
+        return
+    column_type = column.type.compile(dialect=conn.dialect)
+    nullable = "" if column.nullable is not False else " NOT NULL"
+    default = f" DEFAULT {column.server_default.arg}" if column.server_default is not None else ""
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column.name} {column_type}{default}{nullable}"))
+
+
+def create_index_if_missing(conn: Connection, table: str, name: str, columns: List[str]):
+    if name in {index["name"] for index in inspect(conn).get_indexes(table)}:
+        return
+    conn.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"))
+
+
+def _0001_baseline(conn: Connection):
+    # Databases created before versioned migrations already have most of these tables; checkfirst keeps them.
+    Base.metadata.create_all(bind=conn, checkfirst=True)
+
+
+def _legacy_analysis_batches(conn: Connection, legacy: Table) -> Iterator[List[Dict]]:
+    """Old analysis rows with their full `result_json` repacked into the compact columns."""
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(legacy).where(legacy.c.id > last_id).order_by(legacy.c.id).limit(REPACK_BATCH)
+        ).mappings().all()
+        if not rows:
+            return
+        batch = []
+        for row in rows:
+            result = row["result_json"]
+            if isinstance(result, str):
+                result = json.loads(result)
+            result = dict(result or {})
+            result.setdefault("score", row["score"] or 0)
+            batch.append(
+                {
+                    "id": row["id"],
+                    "owner_user_id": row["owner_user_id"],
+                    "mode": row["mode"],
+                    "created_at": row["created_at"],
+                    **analysis_columns(result),
+                }
+            )
+        yield batch
+        last_id = rows[-1]["id"]
+
+
+def _0002_compact_analysis_records(conn: Connection):
+    """Numeric score/metric columns and a compressed detail blob instead of the full result_json."""
+    if "result_json" not in {c["name"] for c in inspect(conn).get_columns("analysis_records")}:
+        return
+    legacy = Table("analysis_records", MetaData(), autoload_with=conn)
+    table = models.AnalysisRecord.__table__
+
+    if conn.dialect.name == "sqlite":
+        # SQLite cannot change a column's type, so the table is rebuilt and swapped in under the same name.
+        metadata = MetaData()
+        Table("users", metadata, autoload_with=conn)
+        compact = table.to_metadata(metadata, name="analysis_records_compact")
+        conn.execute(text("DROP TABLE IF EXISTS analysis_records_compact"))
+        conn.execute(CreateTable(compact))
+        for batch in _legacy_analysis_batches(conn, legacy):
+            conn.execute(compact.insert(), batch)
+        conn.execute(text("DROP TABLE analysis_records"))
+        conn.execute(text("ALTER TABLE analysis_records_compact RENAME TO analysis_records"))
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+        return
+
+    conn.execute(text("ALTER TABLE analysis_records ALTER COLUMN score TYPE DOUBLE PRECISION USING score::double precision"))
+    for column in (
+        Column("semantic_similarity", Float),
+        Column("skill_coverage", Float),
+        Column("keyword_alignment", Float),
+        Column("confidence", Float),
+        Column("summary_json", JSON),
+        Column("detail_blob", LargeBinary),
+    ):
+        add_column_if_missing(conn, "analysis_records", column)
+    for batch in _legacy_analysis_batches(conn, legacy):
+        for row in batch:
+            conn.execute(table.update().where(table.c.id == row.pop("id")).values(**row))
+    conn.execute(text("ALTER TABLE analysis_records DROP COLUMN result_json"))
+    conn.execute(text("ALTER TABLE analysis_records ALTER COLUMN summary_json SET NOT NULL"))
+
+
+def _0003_analysis_history_indexes(conn: Connection):
+    """A role_title column for leaderboards, backfilled from the stored summaries, and the keyset indexes."""
+    add_column_if_missing(conn, "analysis_records", Column("role_title", String))
+    table = models.AnalysisRecord.__table__
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(table.c.id, table.c.summary_json)
+            .where(table.c.id > last_id, table.c.role_title.is_(None))
+            .order_by(table.c.id)
+            .limit(REPACK_BATCH)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            title = role_title_of(row.summary_json or {})
+            if title:
+                conn.execute(table.update().where(table.c.id == row.id).values(role_title=title))
+        last_id = rows[-1].id
+    for index in table.indexes:
+        create_index_if_missing(conn, "analysis_records", index.name, [column.name for column in index.columns])
+
+
+def _0004_share_renderings(conn: Connection):
+    # Existing links have no rendering yet; each is built and stored on its first read.
+    for column in (Column("rendered_etag", String), Column("render_version", Integer), Column("rendered_body", LargeBinary)):
+        add_column_if_missing(conn, "shared_reports", column)
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "baseline", _0001_baseline),
+    (2, "compact_analysis_records", _0002_compact_analysis_records),
+    (3, "analysis_history_indexes", _0003_analysis_history_indexes),
+    (4, "share_renderings", _0004_share_renderings),
+]
+
+
+def applied_versions(conn: Connection) -> set:
+    return {row[0] for row in conn.execute(schema_migrations.select().with_only_columns(schema_migrations.c.version))}
+
+
+@contextmanager
+def migration_lock(bind: Engine) -> Iterator[None]:
+    """Serialise migration runs across processes and nodes sharing one database."""
+    if bind.dialect.name == "postgresql":
+        with bind.connect() as conn:
+            conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+                conn.commit()
+        return
+    database = bind.url.database if bind.dialect.name == "sqlite" else None
+    if not database or database == ":memory:" or fcntl is None:
+        yield
+        return
+    # Every uvicorn worker runs create_app; without this they race on CREATE TABLE against the same file.
+    with open(f"{database}.migrate.lock", "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def run_migrations(bind: Engine = engine) -> List[int]:
+    """Apply pending migrations in order, each in its own transaction. Returns the versions applied."""
+    applied: List[int] = []
+    with migration_lock(bind):
+        _metadata.create_all(bind=bind, checkfirst=True)
+        for version, name, migrate in MIGRATIONS:
+            with bind.begin() as conn:
+                if version in applied_versions(conn):
+                    continue
+                migrate(conn)
+                conn.execute(schema_migrations.insert().values(version=version, name=name, applied_at=datetime.utcnow()))
+            logger.info("Applied migration %04d_%s", version, name)
+            applied.append(version)
+    return applied
+
+
+if __name__ == "__main__":
+    from app.migrations import run_migrations as _run_migrations
+
+    logging.basicConfig(level=logging.INFO)
+    _run_migrations()
@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, String, Text, UniqueConstraint
+from sqlalchemy.orm import deferred
 
 from .database import Base
 
@@ -30,17 +31,72 @@ class RoleProfile(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
 
+class RoleFeatures(Base):
+    __tablename__ = "role_features"
+
+    id = Column(Integer, primary_key=True, index=True)
+    role_id = Column(Integer, ForeignKey("role_profiles.id"), nullable=False, unique=True, index=True)
+    format_version = Column(Integer, nullable=False)
+    jd_hash = Column(String, nullable=False)
+    taxonomy_id = Column(String, nullable=True)
+    model_id = Column(String, nullable=True)
+    sentences = Column(JSON, nullable=False)
+    skills = Column(JSON, nullable=False)
+    keyword_counts = Column(JSON, nullable=False)
+    token_count = Column(Integer, nullable=False)
+    doc_embedding = Column(LargeBinary, nullable=True)
+    sentence_embeddings = Column(LargeBinary, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class AnalysisRecord(Base):
     __tablename__ = "analysis_records"
+    # Keyset pages walk these in order; id breaks ties so every cursor position is unique, and the trailing
+    # filter columns let filtered pages skip rows without reading them from the table.
+    __table_args__ = (
+        Index("ix_analysis_records_owner_created", "owner_user_id", "created_at", "id", "mode", "score"),
+        Index("ix_analysis_records_owner_score", "owner_user_id", "score", "id", "mode", "created_at"),
+        Index("ix_analysis_records_owner_role_mode_score", "owner_user_id", "role_title", "mode", "score", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     owner_user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     mode = Column(String, nullable=False, default="standard")
-    score = Column(String, nullable=False)
-    result_json = Column(JSON, nullable=False)
+    role_title = Column(String, nullable=True)
+    score = Column(Float, nullable=False)
+    semantic_similarity = Column(Float, nullable=True)
+    skill_coverage = Column(Float, nullable=True)
+    keyword_alignment = Column(Float, nullable=True)
+    confidence = Column(Float, nullable=True)
+    # Everything but the heavy parts, which live compressed in detail_blob and load only when accessed.
+    summary_json = Column(JSON, nullable=False)
+    detail_blob = deferred(Column(LargeBinary, nullable=True))
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
 
+class CandidateProfile(Base):
+    __tablename__ = "candidate_profiles"
+    __table_args__ = (UniqueConstraint("owner_user_id", "resume_hash", name="uq_candidate_owner_resume"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    owner_user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    resume_hash = Column(String, nullable=False)
+    candidate_name = Column(String, nullable=True)
+    latest_analysis_id = Column(Integer, ForeignKey("analysis_records.id"), nullable=True)
+    resume_text = Column(Text, nullable=False)
+    format_version = Column(Integer, nullable=False)
+    taxonomy_id = Column(String, nullable=True)
+    model_id = Column(String, nullable=True)
+    sentences = Column(JSON, nullable=False)
+    skills = Column(JSON, nullable=False)
+    keyword_counts = Column(JSON, nullable=False)
+    token_count = Column(Integer, nullable=False)
+    doc_embedding = Column(LargeBinary, nullable=True)
+    sentence_embeddings = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class InterviewKit(Base):
     __tablename__ = "interview_kits"
 
@@ -59,4 +115,34 @@ class SharedReport(Base):
     analysis_id = Column(Integer, ForeignKey("analysis_records.id"), nullable=False, index=True)
     token = Column(String, nullable=False, unique=True, index=True)
     expires_at = Column(DateTime, nullable=False, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # The masked public response, built once; ETag checks read only the etag, the body loads when served.
+    rendered_etag = Column(String, nullable=True)
+    render_version = Column(Integer, nullable=True)
+    rendered_body = deferred(Column(LargeBinary, nullable=True))
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status_lease", "status", "lease_expires_at"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    owner_user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    kind = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued")
+    payload = Column(JSON, nullable=False)
+    progress_done = Column(Integer, nullable=False, default=0)
+    progress_total = Column(Integer, nullable=False, default=0)
+    partial_result = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
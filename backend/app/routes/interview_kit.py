@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from ..auth import get_current_user
 from ..database import get_db
 from ..models import AnalysisRecord, InterviewKit, User
+from ..services.rate_limiter import rate_limit
 
 router = APIRouter(prefix="/interview-kit", tags=["interview-kit"])
 
@@ -94,7 +95,7 @@ def _generate_content(analysis: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-@router.post("/generate", response_model=InterviewKitResponse)
+@router.post("/generate", response_model=InterviewKitResponse, dependencies=[Depends(rate_limit("interview_kit.generate"))])
 def generate_interview_kit(
     payload: InterviewKitRequest,
     current_user: User = Depends(get_current_user),
@@ -111,7 +112,8 @@ def generate_interview_kit(
         )
         if not analysis:
             raise HTTPException(status_code=404, detail="analysis_result_id not found")
-        analysis_json = dict(analysis.result_json or {})
+        # The kit only needs skills and strengths, which are all in the summary.
+        analysis_json = dict(analysis.summary_json or {})
         analysis_id = analysis.id
     elif payload.raw_analysis is not None:
         analysis_json = payload.raw_analysis
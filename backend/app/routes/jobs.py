@@ -0,0 +1,87 @@
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from ..auth import get_current_user
+from ..database import SessionLocal, get_db
+from ..models import Job, User
+from ..services.jobs import JOB_POLL_SECONDS, TERMINAL_STATUSES
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+class JobOut(BaseModel):
+    id: int
+    kind: str
+    status: str
+    progress_done: int
+    progress_total: int
+    attempts: int
+    partial_result: Optional[Any] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    updated_at: datetime
+
+
+def job_out(job: Job, include_result: bool = True) -> JobOut:
+    return JobOut(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        progress_done=job.progress_done,
+        progress_total=job.progress_total,
+        attempts=job.attempts,
+        partial_result=job.partial_result if job.status not in TERMINAL_STATUSES else None,
+        result=job.result if include_result else None,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        updated_at=job.updated_at,
+    )
+
+
+def _owned_job(db: Session, job_id: int, user_id: int) -> Job:
+    job = db.query(Job).filter(Job.id == job_id, Job.owner_user_id == user_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job(job_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    return job_out(_owned_job(db, job_id, current_user.id))
+
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Server-sent events: one `job` event per status/progress change, ending after the terminal state."""
+    _owned_job(db, job_id, current_user.id)
+    owner_user_id = current_user.id
+
+    async def events():
+        last_seen = None
+        while True:
+            session = SessionLocal()
+            try:
+                job = _owned_job(session, job_id, owner_user_id)
+                if job.updated_at != last_seen:
+                    last_seen = job.updated_at
+                    payload = job_out(job, include_result=job.status in TERMINAL_STATUSES).model_dump(mode="json")
+                    yield f"event: job\ndata: {json.dumps(payload)}\n\n"
+                if job.status in TERMINAL_STATUSES:
+                    return
+            finally:
+                session.close()
+            await asyncio.sleep(JOB_POLL_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
@@ -1,27 +1,42 @@
+import asyncio
 import hashlib
 import json
-import time
 from datetime import datetime
+from itertools import islice
 from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from ..auth import get_current_user
-from ..database import get_db
-from ..models import AnalysisRecord, RoleProfile, User
-from ..services.analysis_engine import run_analysis
-from ..services.resume_parser import clean_text, extract_text_from_upload, is_supported_upload
+from ..database import SessionLocal, get_db
+from ..models import Job, RoleProfile, User
+from ..services.analysis_engine import comparison_item
+from ..services.analysis_store import analysis_history, persist_analysis
+from ..services.analysis_tasks import analyze_texts, prepare_resume
+from ..services.bulk_screening import (
+    BULK_MAX_FILES,
+    BULK_PERSIST_BATCH,
+    iter_bulk_documents,
+    persist_bulk_results,
+    screen_documents,
+    spool_uploads,
+)
+from ..services.candidate_store import upsert_candidate
+from ..services.jobs import enqueue_job
+from ..services.offload import gather_role_features, in_session, offload, parse_mode, parse_upload, score_roles
+from ..services.rate_limiter import rate_limit
+from ..services.result_cache import content_key, get_result_cache
+from ..services.resume_parser import clean_text, is_supported_upload
+from ..services.role_features import ROLE_FEATURES_VERSION, jd_hash
+from ..services.role_index import search_roles as search_role_index
+from ..services.role_index import unindexed_roles
 
 router = APIRouter(prefix="/match", tags=["matching"])
 
-RATE_LIMIT_STATE: Dict[int, List[float]] = {}
-RATE_LIMIT_MAX_REQUESTS = 30
-RATE_LIMIT_WINDOW_SECONDS = 60
-
-COMPARE_CACHE: Dict[str, Dict] = {}
-COMPARE_CACHE_TTL_SECONDS = 300
+SEARCH_ROLES_MAX_TOP_K = 50
 
 
 class AnalyzeResponse(BaseModel):
@@ -56,15 +71,34 @@ class CompareRolesResponse(BaseModel):
     ranked: List[CompareRoleItem]
 
 
-def _enforce_rate_limit(user_id: int):
-    now = time.time()
-    window_start = now - RATE_LIMIT_WINDOW_SECONDS
-    timestamps = RATE_LIMIT_STATE.get(user_id, [])
-    timestamps = [t for t in timestamps if t >= window_start]
-    if len(timestamps) >= RATE_LIMIT_MAX_REQUESTS:
-        raise HTTPException(status_code=429, detail="Rate limit exceeded for match endpoints")
-    timestamps.append(now)
-    RATE_LIMIT_STATE[user_id] = timestamps
+class SearchRoleItem(CompareRoleItem):
+    retrieval_score: float
+
+
+class SearchRolesResponse(BaseModel):
+    ranked: List[SearchRoleItem]
+    retrieval: str
+
+
+class HistoryItem(BaseModel):
+    analysis_id: int
+    created_at: datetime
+    analysis_mode: str
+    role_title: Optional[str]
+    candidate_name: Optional[str]
+    resume_filename: Optional[str]
+    score: float
+    confidence: Optional[float]
+    semantic_similarity: Optional[float]
+    skill_coverage: Optional[float]
+    keyword_alignment: Optional[float]
+    overlapping_skills: List[str]
+    missing_skills_top5: List[str]
+
+
+class HistoryResponse(BaseModel):
+    items: List[HistoryItem]
+    next_cursor: Optional[str]
 
 
 def _validate_inputs(resume_text: str, jd_text: str):
@@ -76,11 +110,14 @@ def _validate_inputs(resume_text: str, jd_text: str):
         raise HTTPException(status_code=400, detail="Job description text is too short. Provide fuller JD content.")
 
 
-def _parse_mode(analysis_mode: str) -> str:
-    mode = analysis_mode.strip().lower()
-    if mode not in {"standard", "strict"}:
-        raise HTTPException(status_code=400, detail="analysis_mode must be 'standard' or 'strict'")
-    return mode
+def _history_page(db: Session, owner_user_id: int, **filters) -> HistoryResponse:
+    if filters.get("mode") is not None:
+        filters["mode"] = parse_mode(filters["mode"])
+    try:
+        items, next_cursor = analysis_history(db, owner_user_id, **filters)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return HistoryResponse(items=[HistoryItem(**item) for item in items], next_cursor=next_cursor)
 
 
 def _extract_resume_text(resume_file: UploadFile) -> str:
@@ -89,21 +126,73 @@ def _extract_resume_text(resume_file: UploadFile) -> str:
     return ""
 
 
-def _persist_analysis(db: Session, user_id: int, mode: str, result: dict) -> int:
-    record = AnalysisRecord(
-        owner_user_id=user_id,
-        mode=mode,
-        score=str(result["score"]),
-        result_json=result,
-        created_at=datetime.utcnow(),
+def _job_accepted(job: Job) -> JSONResponse:
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job.id, "status": job.status, "status_url": f"/jobs/{job.id}", "events_url": f"/jobs/{job.id}/events"},
+    )
+
+
+@router.get("/history", response_model=HistoryResponse)
+def history(
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    sort: str = Query(default="created_at", pattern="^(created_at|score)$"),
+    order: str = Query(default="desc", pattern="^(asc|desc)$"),
+    analysis_mode: Optional[str] = Query(default=None),
+    role_title: Optional[str] = Query(default=None),
+    min_score: Optional[float] = Query(default=None, ge=0, le=100),
+    max_score: Optional[float] = Query(default=None, ge=0, le=100),
+    created_from: Optional[datetime] = Query(default=None),
+    created_to: Optional[datetime] = Query(default=None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Past analyses, newest first by default. Pass `next_cursor` back as `cursor` for the next page."""
+    return _history_page(
+        db,
+        current_user.id,
+        sort=sort,
+        descending=order == "desc",
+        cursor=cursor,
+        limit=limit,
+        mode=analysis_mode,
+        role_title=(role_title or "").strip() or None,
+        min_score=min_score,
+        max_score=max_score,
+        created_from=created_from,
+        created_to=created_to,
+    )
+
+
+@router.get("/leaderboard", response_model=HistoryResponse)
+def leaderboard(
+    role_title: str = Query(..., min_length=1),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    analysis_mode: str = Query(default="standard"),
+    min_score: Optional[float] = Query(default=None, ge=0, le=100),
+    created_from: Optional[datetime] = Query(default=None),
+    created_to: Optional[datetime] = Query(default=None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Highest-scoring analyses recorded for one role title and mode."""
+    return _history_page(
+        db,
+        current_user.id,
+        sort="score",
+        cursor=cursor,
+        limit=limit,
+        mode=analysis_mode,
+        role_title=role_title.strip(),
+        min_score=min_score,
+        created_from=created_from,
+        created_to=created_to,
     )
-    db.add(record)
-    db.commit()
-    db.refresh(record)
-    return record.id
 
 
-@router.post("/analyze", response_model=AnalyzeResponse)
+@router.post("/analyze", response_model=AnalyzeResponse, dependencies=[Depends(rate_limit("match"))])
 async def analyze(
     request: Request,
     resume_file: UploadFile = File(...),
@@ -112,32 +201,24 @@ async def analyze(
     analysis_mode: str = Form(default="standard"),
     candidate_name: Optional[str] = Form(default=None),
     role_title: Optional[str] = Form(default=None),
+    as_job: bool = Form(default=False),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    _enforce_rate_limit(current_user.id)
-
     if not is_supported_upload(resume_file):
         raise HTTPException(status_code=400, detail="Resume must be PDF or DOCX")
-    try:
-        resume_text = await extract_text_from_upload(resume_file)
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    resume_text = await parse_upload(resume_file)
 
     job_description = clean_text(jd_text or "")
     if jd_file is not None:
         if not is_supported_upload(jd_file):
             raise HTTPException(status_code=400, detail="JD file must be PDF or DOCX")
-        try:
-            job_description = await extract_text_from_upload(jd_file)
-        except ValueError as exc:
-            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        job_description = await parse_upload(jd_file)
 
     _validate_inputs(resume_text, job_description)
-    mode = _parse_mode(analysis_mode)
+    mode = parse_mode(analysis_mode)
 
-    result = run_analysis(resume_text, job_description, mode=mode)
-    result["input_metadata"] = {
+    input_metadata = {
         "candidate_name": (candidate_name or "").strip() or None,
         "role_title": (role_title or "").strip() or None,
         "resume_filename": resume_file.filename,
@@ -145,31 +226,44 @@ async def analyze(
         "jd_filename": jd_file.filename if jd_file else None,
         "jd_chars": len(job_description),
         "has_jd_text": bool((jd_text or "").strip()),
-        **result.pop("metrics"),
     }
-
-    analysis_id = _persist_analysis(db, current_user.id, mode, result)
+    if as_job:
+        payload = {
+            "resume_text": resume_text,
+            "job_description": job_description,
+            "mode": mode,
+            "candidate_name": input_metadata["candidate_name"],
+            "input_metadata": input_metadata,
+        }
+        return _job_accepted(await asyncio.to_thread(enqueue_job, db, current_user.id, "analyze", payload, total=1))
+
+    result, resume_features = await offload(analyze_texts, resume_text, job_description, mode)
+    result["input_metadata"] = {**input_metadata, **result.pop("metrics")}
+
+    analysis_id = (await asyncio.to_thread(persist_analysis, db, current_user.id, mode, result)).id
     result["analysis_id"] = analysis_id
+    await in_session(
+        upsert_candidate, current_user.id, resume_features, candidate_name=(candidate_name or "").strip() or None, analysis_id=analysis_id
+    )
     return AnalyzeResponse(**result)
 
 
-@router.post("/compare-roles", response_model=CompareRolesResponse)
+@router.post("/compare-roles", response_model=CompareRolesResponse, dependencies=[Depends(rate_limit("match"))])
 async def compare_roles(
     resume_file: UploadFile = File(...),
     role_profile_ids_json: Optional[str] = Form(default=None),
     adhoc_jds_json: Optional[str] = Form(default=None),
     analysis_mode: str = Form(default="standard"),
     candidate_name: Optional[str] = Form(default=None),
+    as_job: bool = Form(default=False),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    _enforce_rate_limit(current_user.id)
-
     if not is_supported_upload(resume_file):
         raise HTTPException(status_code=400, detail="Resume must be PDF or DOCX")
-    resume_text = await extract_text_from_upload(resume_file)
+    resume_text = await parse_upload(resume_file)
 
-    mode = _parse_mode(analysis_mode)
+    mode = parse_mode(analysis_mode)
 
     role_ids: List[int] = []
     if role_profile_ids_json:
@@ -191,62 +285,196 @@ async def compare_roles(
     if not role_ids and not adhoc_items:
         raise HTTPException(status_code=400, detail="Provide role_profile_ids_json or adhoc_jds_json")
 
-    comparisons: List[CompareRoleItem] = []
+    if as_job:
+        adhoc = []
+        for idx, item in enumerate(adhoc_items):
+            jd_text = clean_text(str(item.get("jd_text") or ""))
+            if jd_text:
+                adhoc.append({"title": str(item.get("title") or f"Adhoc Role {idx + 1}"), "jd_text": jd_text})
+        payload = {
+            "resume_text": resume_text,
+            "role_ids": role_ids,
+            "adhoc": adhoc,
+            "mode": mode,
+            "candidate_name": (candidate_name or "").strip() or None,
+        }
+        job = await asyncio.to_thread(enqueue_job, db, current_user.id, "compare_roles", payload, total=len(role_ids) + len(adhoc))
+        return _job_accepted(job)
+
     resume_hash = hashlib.sha256(resume_text.encode("utf-8", errors="ignore")).hexdigest()
 
+    # (role_id, title, cache_key, stored role features or raw ad-hoc JD text) for every requested JD, in response order.
+    targets: List[tuple] = []
     if role_ids:
         roles = (
             db.query(RoleProfile)
             .filter(RoleProfile.owner_user_id == current_user.id, RoleProfile.id.in_(role_ids))
             .all()
         )
+        role_features = await gather_role_features(roles)
         for role in roles:
-            cache_key = f"{resume_hash}:{role.id}:{mode}:profile"
-            cached = COMPARE_CACHE.get(cache_key)
-            if cached and (time.time() - cached["ts"] <= COMPARE_CACHE_TTL_SECONDS):
-                analysis = cached["analysis"]
-            else:
-                analysis = run_analysis(resume_text, role.jd_text, mode=mode)
-                COMPARE_CACHE[cache_key] = {"ts": time.time(), "analysis": analysis}
-
-            comparisons.append(
-                CompareRoleItem(
-                    role_id=role.id,
-                    role_title=role.title,
-                    score=analysis["score"],
-                    confidence=analysis["confidence"],
-                    strengths=analysis["strengths"],
-                    missing_skills_top5=analysis["missing_skills"][:5],
-                    summary=f"{candidate_name or 'Candidate'} vs {role.title}: {analysis['score']}% ({mode})",
-                    analysis_payload=analysis,
-                )
-            )
+            cache_key = content_key("compare", resume_hash, "profile", jd_hash(role.jd_text), mode, ROLE_FEATURES_VERSION)
+            targets.append((role.id, role.title, cache_key, role_features[role.id]))
 
     for idx, adhoc in enumerate(adhoc_items):
         title = str(adhoc.get("title") or f"Adhoc Role {idx + 1}")
         jd_text = clean_text(str(adhoc.get("jd_text") or ""))
         if not jd_text:
             continue
-        cache_key = f"{resume_hash}:adhoc:{title}:{mode}"
-        cached = COMPARE_CACHE.get(cache_key)
-        if cached and (time.time() - cached["ts"] <= COMPARE_CACHE_TTL_SECONDS):
-            analysis = cached["analysis"]
-        else:
-            analysis = run_analysis(resume_text, jd_text, mode=mode)
-            COMPARE_CACHE[cache_key] = {"ts": time.time(), "analysis": analysis}
+        targets.append((None, title, content_key("compare", resume_hash, "adhoc", jd_hash(jd_text), mode, ROLE_FEATURES_VERSION), jd_text))
+
+    result_cache = get_result_cache()
+    analyses: Dict[str, Dict] = result_cache.get_many(cache_key for _, _, cache_key, _ in targets)
+    pending = []
+    for _, _, cache_key, jd in targets:
+        if cache_key not in analyses:
+            analyses[cache_key] = {}
+            pending.append((cache_key, jd))
+
+    # Resume features are computed once; uncached JDs are embedded in batches and scored across the task pool.
+    fresh, resume_features = await score_roles(resume_text, [jd for _, jd in pending], mode)
+    for (cache_key, _), analysis in zip(pending, fresh):
+        analyses[cache_key] = analysis
+    result_cache.set_many({cache_key: analyses[cache_key] for cache_key, _ in pending})
 
+    comparisons: List[CompareRoleItem] = []
+    for role_id, title, cache_key, _ in targets:
+        analysis = analyses[cache_key]
         comparisons.append(
-            CompareRoleItem(
-                role_id=None,
-                role_title=title,
-                score=analysis["score"],
-                confidence=analysis["confidence"],
-                strengths=analysis["strengths"],
-                missing_skills_top5=analysis["missing_skills"][:5],
-                summary=f"{candidate_name or 'Candidate'} vs {title}: {analysis['score']}% ({mode})",
-                analysis_payload=analysis,
-            )
+            CompareRoleItem(**comparison_item(role_id, title, analysis, mode, candidate_name))
         )
 
+    await in_session(upsert_candidate, current_user.id, resume_features, candidate_name=(candidate_name or "").strip() or None)
     comparisons = sorted(comparisons, key=lambda x: x.score, reverse=True)
     return CompareRolesResponse(ranked=comparisons)
+
+
+@router.post("/search-roles", response_model=SearchRolesResponse, dependencies=[Depends(rate_limit("match"))])
+async def search_roles(
+    resume_file: UploadFile = File(...),
+    top_k: int = Form(default=5),
+    analysis_mode: str = Form(default="standard"),
+    candidate_name: Optional[str] = Form(default=None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    if not is_supported_upload(resume_file):
+        raise HTTPException(status_code=400, detail="Resume must be PDF or DOCX")
+    resume_text = await parse_upload(resume_file)
+
+    mode = parse_mode(analysis_mode)
+    top_k = min(SEARCH_ROLES_MAX_TOP_K, max(1, top_k))
+
+    # The resume is embedded once for retrieval; full analysis only runs on the top-k roles.
+    resume_features = await offload(prepare_resume, resume_text)
+    missing = await in_session(unindexed_roles, current_user.id)
+    if missing:
+        await gather_role_features(missing)
+    hits, retrieval = await in_session(search_role_index, current_user.id, resume_features, top_k)
+    retrieval_scores = dict(hits)
+
+    roles = (
+        db.query(RoleProfile)
+        .filter(RoleProfile.owner_user_id == current_user.id, RoleProfile.id.in_(list(retrieval_scores)))
+        .all()
+    )
+    role_features = await gather_role_features(roles)
+
+    analyses, resume_features = await score_roles(resume_features, [role_features[role.id] for role in roles], mode)
+
+    ranked: List[SearchRoleItem] = []
+    for role, analysis in zip(roles, analyses):
+        ranked.append(
+            SearchRoleItem(
+                **comparison_item(role.id, role.title, analysis, mode, candidate_name),
+                retrieval_score=round(retrieval_scores[role.id] * 100, 2),
+            )
+        )
+
+    await in_session(upsert_candidate, current_user.id, resume_features, candidate_name=(candidate_name or "").strip() or None)
+    ranked = sorted(ranked, key=lambda x: x.score, reverse=True)
+    return SearchRolesResponse(ranked=ranked, retrieval=retrieval)
+
+
+@router.post("/bulk-screen", dependencies=[Depends(rate_limit("match")), Depends(rate_limit("match.bulk_screen"))])
+async def bulk_screen(
+    role_id: int = Form(...),
+    resume_files: List[UploadFile] = File(...),
+    analysis_mode: str = Form(default="standard"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Screen many resumes (PDF/DOCX files and/or ZIP archives of them) against one role.
+    Streams NDJSON: a "result" or "error" row per resume as it finishes, "persisted" rows with
+    analysis ids after each stored batch, and a final "summary" row.
+    """
+    mode = parse_mode(analysis_mode)
+
+    role = (
+        db.query(RoleProfile)
+        .filter(RoleProfile.owner_user_id == current_user.id, RoleProfile.id == role_id)
+        .first()
+    )
+    if not role:
+        raise HTTPException(status_code=404, detail="Role profile not found")
+    # JD features (and, with a stable model, its embeddings) are prepared once for the whole batch.
+    role_features = (await gather_role_features([role]))[role.id]
+    owner_user_id = current_user.id
+    uploads = await asyncio.to_thread(spool_uploads, resume_files)
+
+    async def rows():
+        documents = iter_bulk_documents(uploads)
+        # The request-scoped session is closed once the response starts, so the stream persists through its own.
+        session = SessionLocal()
+        stream_role = session.get(RoleProfile, role_id)
+        batch = []
+        processed = failed = 0
+
+        async def persist(outcomes) -> str:
+            stored = await asyncio.to_thread(persist_bulk_results, session, owner_user_id, mode, stream_role, outcomes)
+            return json.dumps({"type": "persisted", "items": [{"index": i, "analysis_id": a} for i, a in stored]}) + "\n"
+
+        try:
+            async for outcome in screen_documents(islice(documents, BULK_MAX_FILES), role_features, mode):
+                document = outcome.document
+                if outcome.error:
+                    failed += 1
+                    yield json.dumps({"type": "error", "index": document.index, "filename": document.filename, "error": outcome.error}) + "\n"
+                    continue
+                processed += 1
+                analysis = outcome.analysis
+                yield json.dumps(
+                    {
+                        "type": "result",
+                        "index": document.index,
+                        "filename": document.filename,
+                        "score": analysis["score"],
+                        "confidence": analysis["confidence"],
+                        **analysis["metrics"],
+                        "overlapping_skills": analysis["overlapping_skills"],
+                        "missing_skills_top5": analysis["missing_skills"][:5],
+                    }
+                ) + "\n"
+                batch.append(outcome)
+                if len(batch) >= BULK_PERSIST_BATCH:
+                    yield await persist(batch)
+                    batch = []
+            if batch:
+                yield await persist(batch)
+            yield json.dumps(
+                {
+                    "type": "summary",
+                    "role_id": stream_role.id,
+                    "role_title": stream_role.title,
+                    "processed": processed,
+                    "failed": failed,
+                    "truncated": next(documents, None) is not None,
+                }
+            ) + "\n"
+        finally:
+            session.close()
+            for upload in uploads:
+                upload.file.close()
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
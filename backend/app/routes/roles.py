@@ -1,14 +1,20 @@
+import asyncio
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from ..auth import get_current_user
 from ..database import get_db
 from ..models import RoleProfile, User
-from ..services.resume_parser import clean_text, extract_text_from_upload, is_supported_upload
+from ..services.analysis_tasks import prepare_roles
+from ..services.candidate_store import rank_candidates
+from ..services.offload import candidate_similarities, gather_role_features, offload, parse_mode, parse_upload
+from ..services.rate_limiter import rate_limit
+from ..services.resume_parser import clean_text, is_supported_upload
+from ..services.role_features import delete_role_features, store_role_features
 
 router = APIRouter(prefix="/roles", tags=["roles"])
 
@@ -26,6 +32,28 @@ class RoleProfileOut(BaseModel):
     updated_at: datetime
 
 
+class RoleCandidateOut(BaseModel):
+    candidate_id: int
+    candidate_name: Optional[str]
+    latest_analysis_id: Optional[int]
+    score: float
+    semantic_similarity: Optional[float]
+    skill_coverage: float
+    keyword_alignment: float
+    overlapping_skills: List[str]
+    missing_skills_top5: List[str]
+    updated_at: datetime
+
+
+class RoleCandidatesResponse(BaseModel):
+    role_id: int
+    total: int
+    offset: int
+    limit: int
+    next_offset: Optional[int]
+    items: List[RoleCandidateOut]
+
+
 class RoleProfileUpdate(BaseModel):
     title: Optional[str] = None
     level: Optional[str] = None
@@ -35,7 +63,7 @@ class RoleProfileUpdate(BaseModel):
     jd_text: Optional[str] = Field(default=None, min_length=20)
 
 
-@router.post("", response_model=RoleProfileOut)
+@router.post("", response_model=RoleProfileOut, dependencies=[Depends(rate_limit("roles.create"))])
 async def create_role(
     title: str = Form(...),
     level: Optional[str] = Form(default=None),
@@ -57,12 +85,13 @@ async def create_role(
     if jd_file is not None:
         if not is_supported_upload(jd_file):
             raise HTTPException(status_code=400, detail="JD file must be PDF or DOCX")
-        parsed_jd = await extract_text_from_upload(jd_file)
+        parsed_jd = await parse_upload(jd_file)
         source_filename = jd_file.filename
 
     if not parsed_jd:
         raise HTTPException(status_code=400, detail="Provide jd_text or jd_file")
 
+    (features,) = await offload(prepare_roles, [parsed_jd])
     now = datetime.utcnow()
     role = RoleProfile(
         owner_user_id=current_user.id,
@@ -76,9 +105,15 @@ async def create_role(
         created_at=now,
         updated_at=now,
     )
-    db.add(role)
-    db.commit()
-    db.refresh(role)
+
+    def save():
+        db.add(role)
+        db.flush()
+        store_role_features(db, role, features)
+        db.commit()
+        db.refresh(role)
+
+    await asyncio.to_thread(save)
     return RoleProfileOut(**role.__dict__)
 
 
@@ -108,8 +143,38 @@ def get_role(
     return RoleProfileOut(**role.__dict__)
 
 
+@router.get("/{role_id}/candidates", response_model=RoleCandidatesResponse)
+async def list_role_candidates(
+    role_id: int,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=20, ge=1, le=100),
+    analysis_mode: str = Query(default="standard"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    role = db.query(RoleProfile).filter(RoleProfile.id == role_id, RoleProfile.owner_user_id == current_user.id).first()
+    if not role:
+        raise HTTPException(status_code=404, detail="Role profile not found")
+    mode = parse_mode(analysis_mode)
+
+    features = (await gather_role_features([role]))[role.id]
+    similarities = await candidate_similarities(current_user.id, features)
+    total, items = await asyncio.to_thread(
+        rank_candidates, db, current_user.id, features, mode=mode, offset=offset, limit=limit, similarities=similarities
+    )
+    next_offset = offset + limit if offset + limit < total else None
+    return RoleCandidatesResponse(
+        role_id=role.id,
+        total=total,
+        offset=offset,
+        limit=limit,
+        next_offset=next_offset,
+        items=[RoleCandidateOut(**item) for item in items],
+    )
+
+
 @router.put("/{role_id}", response_model=RoleProfileOut)
-def update_role(
+async def update_role(
     role_id: int,
     payload: RoleProfileUpdate,
     current_user: User = Depends(get_current_user),
@@ -119,6 +184,7 @@ def update_role(
     if not role:
         raise HTTPException(status_code=404, detail="Role profile not found")
 
+    previous_jd = role.jd_text
     for key, value in payload.model_dump(exclude_unset=True).items():
         if key == "title" and value is not None:
             value = value.strip()
@@ -131,9 +197,17 @@ def update_role(
         setattr(role, key, value)
 
     role.updated_at = datetime.utcnow()
-    db.add(role)
-    db.commit()
-    db.refresh(role)
+    # Features are computed in the task pool like on create; the write then runs off the event loop.
+    features = (await offload(prepare_roles, [role.jd_text]))[0] if role.jd_text != previous_jd else None
+
+    def save():
+        db.add(role)
+        if features is not None:
+            store_role_features(db, role, features)
+        db.commit()
+        db.refresh(role)
+
+    await asyncio.to_thread(save)
     return RoleProfileOut(**role.__dict__)
 
 
@@ -146,6 +220,7 @@ def delete_role(
     role = db.query(RoleProfile).filter(RoleProfile.id == role_id, RoleProfile.owner_user_id == current_user.id).first()
     if not role:
         raise HTTPException(status_code=404, detail="Role profile not found")
+    delete_role_features(db, role.id)
     db.delete(role)
     db.commit()
     return {"ok": True}
\ No newline at end of file
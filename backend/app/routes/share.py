@@ -1,21 +1,27 @@
-import re
 import secrets
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from ..auth import get_current_user
 from ..database import get_db
 from ..models import AnalysisRecord, SharedReport, User
+from ..services.rate_limiter import rate_limit, rate_limit_by_client
+from ..services.share_rendering import (
+    cache_headers,
+    drop_rendering,
+    etag_matches,
+    get_share_cache,
+    has_current_rendering,
+    load_rendering,
+    store_rendering,
+)
 
 router = APIRouter(prefix="/share", tags=["share"])
 
-EMAIL_RE = re.compile(r"([A-Za-z0-9._%+-])[A-Za-z0-9._%+-]*@([A-Za-z0-9.-]+\.[A-Za-z]{2,})")
-PHONE_RE = re.compile(r"\b(?:\+?\d{1,3}[\s.-]?)?(?:\(?\d{3}\)?[\s.-]?)\d{3}[\s.-]?\d{4}\b")
-
 
 class CreateShareRequest(BaseModel):
     analysis_id: int
@@ -26,18 +32,7 @@ class RevokeShareRequest(BaseModel):
     token: str
 
 
-def mask_pii(value: Any) -> Any:
-    if isinstance(value, dict):
-        return {k: mask_pii(v) for k, v in value.items()}
-    if isinstance(value, list):
-        return [mask_pii(v) for v in value]
-    if isinstance(value, str):
-        value = EMAIL_RE.sub(lambda m: f"{m.group(1)}***@{m.group(2)}", value)
-        value = PHONE_RE.sub("***-***-****", value)
-    return value
-
-
-@router.post("/create")
+@router.post("/create", dependencies=[Depends(rate_limit("share.create"))])
 def create_share(
     payload: CreateShareRequest,
     current_user: User = Depends(get_current_user),
@@ -53,16 +48,19 @@ def create_share(
 
     expires_days = min(30, max(1, int(payload.expires_in_days or 7)))
     token = secrets.token_urlsafe(32)
+    now = datetime.utcnow()
     rec = SharedReport(
         owner_user_id=current_user.id,
         analysis_id=analysis.id,
         token=token,
-        expires_at=datetime.utcnow() + timedelta(days=expires_days),
-        created_at=datetime.utcnow(),
+        expires_at=now + timedelta(days=expires_days),
+        created_at=now,
     )
+    # Masking runs once here; every view of the link is then served from the stored rendering.
+    rendered = store_rendering(rec, analysis)
     db.add(rec)
     db.commit()
-    db.refresh(rec)
+    get_share_cache().put(token, rendered)
     return {
         "token": token,
         "share_url": f"/shared/{token}",
@@ -81,24 +79,32 @@ def revoke_share(
         raise HTTPException(status_code=404, detail="Share token not found")
     db.delete(rec)
     db.commit()
+    get_share_cache().discard(payload.token)
     return {"ok": True}
 
 
-@router.get("/{token}")
-def read_share(token: str, db: Session = Depends(get_db)):
-    rec = db.query(SharedReport).filter(SharedReport.token == token).first()
-    if not rec:
-        raise HTTPException(status_code=404, detail="Invalid token")
-    if rec.expires_at < datetime.utcnow():
-        raise HTTPException(status_code=410, detail="Share link expired")
-
-    analysis = db.query(AnalysisRecord).filter(AnalysisRecord.id == rec.analysis_id).first()
-    if not analysis:
-        raise HTTPException(status_code=404, detail="Analysis not found")
-
-    masked = mask_pii(dict(analysis.result_json or {}))
-    return {
-        "analysis": masked,
-        "expires_at": rec.expires_at.isoformat(),
-        "watermark": "Generated by TalentAlign AI (Demo)",
-    }
\ No newline at end of file
+@router.get("/{token}", dependencies=[Depends(rate_limit_by_client("share.read"))])
+def read_share(token: str, if_none_match: Optional[str] = Header(default=None), db: Session = Depends(get_db)):
+    cache = get_share_cache()
+    rendered = cache.get(token)
+    if rendered is None:
+        rec = db.query(SharedReport).filter(SharedReport.token == token).first()
+        if not rec:
+            raise HTTPException(status_code=404, detail="Invalid token")
+        if rec.expires_at < datetime.utcnow():
+            if rec.rendered_etag is not None:
+                drop_rendering(rec)
+                db.commit()
+            raise HTTPException(status_code=410, detail="Share link expired")
+        # Revalidation only needs the stored ETag; the rendered body stays unloaded.
+        if has_current_rendering(rec) and etag_matches(if_none_match, rec.rendered_etag):
+            return Response(status_code=304, headers=cache_headers(rec.rendered_etag, rec.expires_at))
+        rendered = load_rendering(db, rec)
+        if rendered is None:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        cache.put(token, rendered)
+
+    headers = cache_headers(rendered.etag, rendered.expires_at)
+    if etag_matches(if_none_match, rendered.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=rendered.body, media_type="application/json", headers=headers)
@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 
 from ..database import get_db
 from ..models import AnalysisRecord, RoleProfile, SharedReport, User
+from ..services.metrics import REGISTRY
 
 router = APIRouter(prefix="/api", tags=["system"])
+# Prometheus scrapes the conventional unprefixed path.
+prometheus_router = APIRouter(tags=["system"])
 
 
 @router.get("/health")
@@ -19,4 +23,14 @@ def metrics(db: Session = Depends(get_db)):
         "total_users": db.query(User).count(),
         "total_roles": db.query(RoleProfile).count(),
         "total_shared_reports": db.query(SharedReport).count(),
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/metrics/summary")
+def metrics_summary(db: Session = Depends(get_db)):
+    return metrics(db)
+
+
+@prometheus_router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
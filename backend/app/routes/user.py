@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from ..auth import create_access_token, get_current_user, get_password_hash, verify_password
 from ..database import get_db
 from ..models import User
+from ..services.rate_limiter import rate_limit_by_client
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -29,7 +30,7 @@ class UserResponse(BaseModel):
     email: EmailStr
 
 
-@router.post("/register", response_model=AuthResponse)
+@router.post("/register", response_model=AuthResponse, dependencies=[Depends(rate_limit_by_client("auth"))])
 def register(payload: RegisterRequest, db: Session = Depends(get_db)):
     normalized_email = payload.email.strip().lower()
     existing_user = db.query(User).filter(User.email == normalized_email).first()
@@ -45,7 +46,7 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)):
     return AuthResponse(access_token=token)
 
 
-@router.post("/login", response_model=AuthResponse)
+@router.post("/login", response_model=AuthResponse, dependencies=[Depends(rate_limit_by_client("auth"))])
 def login(payload: LoginRequest, db: Session = Depends(get_db)):
     normalized_email = payload.email.strip().lower()
     user = db.query(User).filter(User.email == normalized_email).first()
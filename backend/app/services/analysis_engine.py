@@ -1,14 +1,18 @@
-from typing import Dict, List
+from dataclasses import replace
+from typing import Dict, List, Optional
 
-from .embedding_engine import compute_similarity
+import numpy as np
+
+from .document_features import AnalysisPlan, DocumentFeatures, extract_document_features
+from .embedding_engine import embedding_model_id, similarity_from_vectors
 from .insights_generator import (
+    build_heatmap,
     build_keyword_breakdown,
     build_strengths,
     build_suggestions,
-    generate_heatmap_data,
-    top_matching_sections,
 )
-from .skill_extractor import extract_skills, keyword_density
+from .skill_extractor import density_array
+from .tracing import time_stage
 
 
 def ratio(numerator: float, denominator: float) -> float:
@@ -17,48 +21,156 @@ def ratio(numerator: float, denominator: float) -> float:
     return numerator / denominator
 
 
-def keyword_alignment(resume_density: Dict[str, float], jd_density: Dict[str, float]) -> float:
-    if not jd_density:
+def keyword_alignment_from_counts(
+    resume_counts: np.ndarray,
+    resume_total_words: int,
+    jd_counts: np.ndarray,
+    jd_total_words: int,
+) -> float:
+    """
+    How closely the resume's keyword densities track the JD's: 1 minus the mean relative gap over the tracked
+    keywords, from raw counts of the same tracked keyword list.
+    """
+    if jd_counts.size == 0:
         return 0.0
-    total_gap = 0.0
-    keys = list(jd_density.keys())
-    for key in keys:
-        jd_v = float(jd_density.get(key, 0.0))
-        rs_v = float(resume_density.get(key, 0.0))
-        if jd_v <= 0:
-            continue
-        total_gap += min(1.0, abs(jd_v - rs_v) / jd_v)
-    avg_gap = total_gap / max(1, len(keys))
-    return max(0.0, 1.0 - avg_gap)
+    jd_density = density_array(jd_counts, jd_total_words)
+    resume_density = density_array(resume_counts, resume_total_words)
+    present = jd_density > 0
+    gaps = np.minimum(1.0, np.abs(jd_density[present] - resume_density[present]) / jd_density[present])
+    return max(0.0, 1.0 - float(gaps.sum()) / jd_counts.size)
+
+
+def keyword_alignments(
+    resume_counts: np.ndarray,
+    resume_total_words: np.ndarray,
+    jd_counts: np.ndarray,
+    jd_total_words: int,
+    tracked: np.ndarray,
+    tracked_sizes: np.ndarray,
+) -> np.ndarray:
+    """
+    keyword_alignment_from_counts for many resumes at once. Columns are the JD's keywords; `tracked` marks
+    which of them are in each resume's tracked list, whose full size (JD plus resume skills) is `tracked_sizes`.
+    """
+    jd_density = density_array(jd_counts, jd_total_words)
+    resume_density = np.round(resume_counts / np.maximum(resume_total_words, 1)[:, None] * 100, 3)
+    present = jd_density > 0
+    gaps = np.zeros(resume_counts.shape, dtype=np.float64)
+    gaps[:, present] = np.minimum(1.0, np.abs(jd_density[present] - resume_density[:, present]) / jd_density[present])
+    totals = (gaps * tracked).sum(axis=1)
+    return np.where(tracked_sizes > 0, np.maximum(0.0, 1.0 - totals / np.maximum(tracked_sizes, 1)), 0.0)
+
+
+def hybrid_score(
+    semantic_similarity: float,
+    skill_coverage: float,
+    alignment: float,
+    mode: str = "standard",
+    has_jd_skills: bool = True,
+) -> float:
+    base_score = (
+        (semantic_similarity * 100 * 0.60)
+        + (skill_coverage * 100 * 0.25)
+        + (alignment * 100 * 0.15)
+    )
+
+    if mode == "strict" and has_jd_skills:
+        strict_penalty = (1.0 - skill_coverage) * 15.0
+        base_score = max(0.0, base_score - strict_penalty)
+
+    return round(max(0.0, min(100.0, base_score)), 2)
+
+
+def hybrid_scores(
+    semantic_similarity: np.ndarray,
+    skill_coverage: np.ndarray,
+    alignment: np.ndarray,
+    mode: str = "standard",
+    has_jd_skills: bool = True,
+) -> np.ndarray:
+    """hybrid_score over arrays, with the same weights; a NaN similarity (no comparable vectors) counts as 0."""
+    semantic_similarity = np.nan_to_num(np.asarray(semantic_similarity, dtype=np.float64), nan=0.0)
+    scores = semantic_similarity * 100 * 0.60 + skill_coverage * 100 * 0.25 + alignment * 100 * 0.15
+    if mode == "strict" and has_jd_skills:
+        scores = np.maximum(0.0, scores - (1.0 - skill_coverage) * 15.0)
+    return np.round(np.clip(scores, 0.0, 100.0), 2)
+
+
+def run_analysis(
+    resume_text: str,
+    job_description: str,
+    mode: str = "standard",
+    resume_features: Optional[DocumentFeatures] = None,
+    jd_features: Optional[DocumentFeatures] = None,
+) -> Dict:
+    resume = resume_features or extract_document_features(resume_text)
+    jd = jd_features or extract_document_features(job_description)
+    AnalysisPlan([resume, jd]).embed()
+    return analyze_features(resume, jd, mode)
+
+
+def run_batch_analysis(resume: DocumentFeatures, jds: List[DocumentFeatures], mode: str = "standard") -> List[Dict]:
+    """
+    Score one resume against many JDs. With a stable embedding model the resume, every JD and all their
+    sentences go through a single encode (stored role vectors and an already embedded resume are reused). Roles
+    are then scored one after another: this runs inside a task-pool process, and large comparisons are split
+    into one chunk per worker by the caller (offload.score_roles). Results are returned in the order of `jds`.
+    """
+    if not jds:
+        return []
+
+    if embedding_model_id() is not None:
+        AnalysisPlan([resume, *jds]).embed()
+
+        def _score(jd: DocumentFeatures) -> Dict:
+            return analyze_features(resume, jd, mode)
+
+    else:
+        # Ad-hoc TF-IDF: fit per pair so each score matches what /match/analyze returns for the same inputs.
+        def _score(jd: DocumentFeatures) -> Dict:
+            pair_resume = replace(resume)
+            AnalysisPlan([pair_resume, jd]).embed()
+            return analyze_features(pair_resume, jd, mode)
+
+    return [_score(jd) for jd in jds]
+
+
+def comparison_item(role_id: Optional[int], title: str, analysis: Dict, mode: str, candidate_name: Optional[str] = None) -> Dict:
+    """One ranked entry of a resume-vs-roles comparison, shared by the compare routes and background jobs."""
+    return {
+        "role_id": role_id,
+        "role_title": title,
+        "score": analysis["score"],
+        "confidence": analysis["confidence"],
+        "strengths": analysis["strengths"],
+        "missing_skills_top5": analysis["missing_skills"][:5],
+        "summary": f"{candidate_name or 'Candidate'} vs {title}: {analysis['score']}% ({mode})",
+        "analysis_payload": analysis,
+    }
 
 
-def run_analysis(resume_text: str, job_description: str, mode: str = "standard") -> Dict:
-    semantic_similarity = compute_similarity(resume_text, job_description)
+def analyze_features(resume: DocumentFeatures, jd: DocumentFeatures, mode: str = "standard") -> Dict:
+    resume_text = resume.text
+    job_description = jd.text
+    semantic_similarity = similarity_from_vectors(resume.doc_embedding, jd.doc_embedding)
 
-    resume_skills = set(extract_skills(resume_text))
-    jd_skills = set(extract_skills(job_description))
+    resume_skills = set(resume.skills)
+    jd_skills = set(jd.skills)
 
     overlapping_skills = sorted(resume_skills & jd_skills)
     missing_skills = sorted(jd_skills - resume_skills)
 
     tracked_keywords = sorted(jd_skills | resume_skills)
-    resume_density = keyword_density(resume_text, tracked_keywords)
-    jd_density = keyword_density(job_description, tracked_keywords)
+    with time_stage("density"):
+        resume_density = resume.density(tracked_keywords)
+        jd_density = jd.density(tracked_keywords)
 
-    alignment = keyword_alignment(resume_density, jd_density)
+        alignment = keyword_alignment_from_counts(
+            resume.counts(tracked_keywords), resume.token_count, jd.counts(tracked_keywords), jd.token_count
+        )
     skill_coverage = ratio(len(overlapping_skills), max(1, len(jd_skills)))
 
-    base_score = (
-        (semantic_similarity * 100 * 0.60)
-        + (skill_coverage * 100 * 0.25)
-        + (alignment * 100 * 0.15)
-    )
-
-    if mode == "strict" and jd_skills:
-        strict_penalty = (1.0 - skill_coverage) * 15.0
-        base_score = max(0.0, base_score - strict_penalty)
-
-    score = round(max(0.0, min(100.0, base_score)), 2)
+    score = hybrid_score(semantic_similarity, skill_coverage, alignment, mode, bool(jd_skills))
 
     score_explanation = (
         "Hybrid score = 60% semantic + 25% skill coverage + 15% keyword alignment, with strict penalty for missing JD skills."
@@ -80,7 +192,13 @@ def run_analysis(resume_text: str, job_description: str, mode: str = "standard")
     confidence -= min(0.35, len(reliability_notes) * 0.12)
     confidence = round(max(0.55, confidence), 2)
 
-    heatmap_data = generate_heatmap_data(resume_text, job_description)
+    with time_stage("heatmap"):
+        heatmap_data, top_sections = build_heatmap(
+            resume.sentences,
+            jd.sentences,
+            resume.sentence_embeddings,
+            jd.sentence_embeddings,
+        )
 
     return {
         "score": score,
@@ -94,7 +212,7 @@ def run_analysis(resume_text: str, job_description: str, mode: str = "standard")
         "suggestions": build_suggestions(missing_skills, score),
         "keyword_density": build_keyword_breakdown(resume_density, jd_density),
         "heatmap_data": heatmap_data,
-        "top_matching_sections": top_matching_sections(heatmap_data),
+        "top_matching_sections": top_sections,
         "metrics": {
             "semantic_similarity": round(semantic_similarity * 100, 2),
             "skill_coverage": round(skill_coverage * 100, 2),
@@ -0,0 +1,188 @@
+import base64
+import binascii
+import json
+import math
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session
+
+from ..models import AnalysisRecord
+from .tracing import time_stage
+
+# Result fields kept as plain JSON for summary views; everything else (heatmap, keyword density, section
+# previews, prose) is stored compressed and only read by views that show the full analysis.
+SUMMARY_FIELDS = ("score", "analysis_mode", "confidence", "overlapping_skills", "missing_skills", "input_metadata", "analysis_id")
+METRIC_FIELDS = ("semantic_similarity", "skill_coverage", "keyword_alignment")
+HISTORY_SORTS = {"created_at": AnalysisRecord.created_at, "score": AnalysisRecord.score}
+# List views select only these, so the deferred detail blob is never read.
+HISTORY_COLUMNS = (
+    AnalysisRecord.id,
+    AnalysisRecord.created_at,
+    AnalysisRecord.mode,
+    AnalysisRecord.role_title,
+    AnalysisRecord.score,
+    AnalysisRecord.confidence,
+    AnalysisRecord.semantic_similarity,
+    AnalysisRecord.skill_coverage,
+    AnalysisRecord.keyword_alignment,
+    AnalysisRecord.summary_json,
+)
+
+
+def _number(value) -> Optional[float]:
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def pack_detail(detail: Dict) -> bytes:
+    return zlib.compress(json.dumps(detail, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def unpack_detail(blob: Optional[bytes]) -> Dict:
+    return json.loads(zlib.decompress(blob)) if blob else {}
+
+
+def analysis_columns(result: Dict) -> Dict:
+    """Column values for one analysis result: numeric summary columns, a light JSON summary and the packed detail."""
+    metrics = {**(result.get("input_metadata") or {}), **(result.get("metrics") or {})}
+    return {
+        "score": float(result["score"]),
+        **{field: _number(metrics.get(field)) for field in METRIC_FIELDS},
+        "confidence": _number(result.get("confidence")),
+        "summary_json": {key: value for key, value in result.items() if key in SUMMARY_FIELDS},
+        "detail_blob": pack_detail({key: value for key, value in result.items() if key not in SUMMARY_FIELDS}),
+    }
+
+
+def role_title_of(result: Dict) -> Optional[str]:
+    return (result.get("input_metadata") or {}).get("role_title") or None
+
+
+def analysis_result(record: AnalysisRecord) -> Dict:
+    """The full stored analysis, as the API returned it. Loads the deferred detail blob."""
+    return {**(record.summary_json or {}), **unpack_detail(record.detail_blob)}
+
+
+def persist_analysis(db: Session, owner_user_id: int, mode: str, result: Dict, commit: bool = True) -> AnalysisRecord:
+    record = AnalysisRecord(
+        owner_user_id=owner_user_id,
+        mode=mode,
+        role_title=role_title_of(result),
+        created_at=datetime.utcnow(),
+        **analysis_columns(result),
+    )
+    with time_stage("persist"):
+        db.add(record)
+        if not commit:
+            db.flush()
+            return record
+        db.commit()
+        db.refresh(record)
+        return record
+
+
+def encode_cursor(sort: str, descending: bool, value, record_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort, descending, value, record_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, descending: bool) -> Tuple[object, int]:
+    """The (sort value, id) position a cursor resumes after. Raises ValueError for foreign or tampered cursors."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        cursor_sort, cursor_descending, value, record_id = payload
+        if isinstance(record_id, bool) or not isinstance(record_id, int) or isinstance(value, bool):
+            raise TypeError("cursor position has the wrong type")
+        position = datetime.fromisoformat(value) if cursor_sort == "created_at" else float(value)
+        if isinstance(position, float) and not math.isfinite(position):
+            raise ValueError("cursor score is not finite")
+    except (binascii.Error, ValueError, TypeError, OverflowError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if cursor_sort != sort or cursor_descending != descending:
+        raise ValueError("cursor was issued for a different sort order")
+    return position, record_id
+
+
+def history_item(row) -> Dict:
+    summary = row.summary_json or {}
+    metadata = summary.get("input_metadata") or {}
+    return {
+        "analysis_id": row.id,
+        "created_at": row.created_at,
+        "analysis_mode": row.mode,
+        "role_title": row.role_title,
+        "candidate_name": metadata.get("candidate_name"),
+        "resume_filename": metadata.get("resume_filename"),
+        "score": row.score,
+        "confidence": row.confidence,
+        "semantic_similarity": row.semantic_similarity,
+        "skill_coverage": row.skill_coverage,
+        "keyword_alignment": row.keyword_alignment,
+        "overlapping_skills": list(summary.get("overlapping_skills") or []),
+        "missing_skills_top5": list(summary.get("missing_skills") or [])[:5],
+    }
+
+
+def analysis_history(
+    db: Session,
+    owner_user_id: int,
+    sort: str = "created_at",
+    descending: bool = True,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    mode: Optional[str] = None,
+    role_title: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    One keyset page of a user's analyses and the cursor for the next one (None on the last page).
+    Pages seek past the previous (sort value, id) instead of counting an offset, so page 1000 costs the
+    same as page 1 on the (owner_user_id, created_at|score, id) indexes.
+    """
+    key = HISTORY_SORTS[sort]
+    sqlite = db.get_bind().dialect.name == "sqlite"
+
+    def unordered(column, condition):
+        # SQLite would rather range-scan a filtered column and sort every match than walk the sort index and
+        # stop after one page; likely() marks the filter as unselective so it keeps walking in sort order.
+        return func.likely(condition) if sqlite and column is not key else condition
+
+    query = db.query(*HISTORY_COLUMNS).filter(AnalysisRecord.owner_user_id == owner_user_id)
+    if mode is not None:
+        query = query.filter(AnalysisRecord.mode == mode)
+    if role_title is not None:
+        query = query.filter(AnalysisRecord.role_title == role_title)
+    if min_score is not None:
+        query = query.filter(unordered(AnalysisRecord.score, AnalysisRecord.score >= min_score))
+    if max_score is not None:
+        query = query.filter(unordered(AnalysisRecord.score, AnalysisRecord.score <= max_score))
+    if created_from is not None:
+        query = query.filter(unordered(AnalysisRecord.created_at, AnalysisRecord.created_at >= created_from))
+    if created_to is not None:
+        query = query.filter(unordered(AnalysisRecord.created_at, AnalysisRecord.created_at < created_to))
+    if cursor:
+        position = tuple_(key, AnalysisRecord.id)
+        after = tuple_(*decode_cursor(cursor, sort, descending))
+        query = query.filter(position < after if descending else position > after)
+    if descending:
+        query = query.order_by(key.desc(), AnalysisRecord.id.desc())
+    else:
+        query = query.order_by(key.asc(), AnalysisRecord.id.asc())
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, descending, getattr(last, sort), last.id)
+    return [history_item(row) for row in rows], next_cursor
@@ -0,0 +1,55 @@
+from dataclasses import replace
+from typing import Dict, List, Tuple, Union
+
+from .analysis_engine import run_analysis, run_batch_analysis
+from .document_features import AnalysisPlan, DocumentFeatures, extract_document_features
+from .embedding_engine import embedding_model_id, similarity_from_vectors
+from .role_features import compute_roles_features
+
+# Entry points for the task pool: module-level so they pickle, and every argument and result crosses a process boundary.
+
+
+def analyze_texts(resume_text: str, job_description: str, mode: str) -> Tuple[Dict, DocumentFeatures]:
+    resume = extract_document_features(resume_text)
+    result = run_analysis(resume_text, job_description, mode=mode, resume_features=resume)
+    return result, resume
+
+
+def prepare_resume(resume_text: str) -> DocumentFeatures:
+    """Resume features, embedded when a stable model exists so the API process can search with them directly."""
+    resume = extract_document_features(resume_text)
+    if embedding_model_id() is not None:
+        AnalysisPlan([resume]).embed()
+    return resume
+
+
+def prepare_roles(jd_texts: List[str]) -> List[DocumentFeatures]:
+    """Features for stale or new roles, embedded in one batch, for the API process to store."""
+    return compute_roles_features(jd_texts)
+
+
+def score_against(
+    resume: Union[str, DocumentFeatures],
+    jds: List[Union[str, DocumentFeatures]],
+    mode: str,
+) -> Tuple[List[Dict], DocumentFeatures]:
+    """Batch-score one resume against stored role features and/or raw JD texts."""
+    if isinstance(resume, str):
+        resume = extract_document_features(resume)
+    jd_features = [extract_document_features(jd) if isinstance(jd, str) else jd for jd in jds]
+    return run_batch_analysis(resume, jd_features, mode=mode), resume
+
+
+def embed_documents(documents: List[DocumentFeatures]) -> List[DocumentFeatures]:
+    """Stored documents (e.g. candidates) missing vectors from the active stable model, embedded in one batch."""
+    return AnalysisPlan(documents).embed()
+
+
+def pair_similarities(role: DocumentFeatures, candidates: List[DocumentFeatures]) -> List[float]:
+    """Ad-hoc TF-IDF similarity of each candidate to the role, fitted per pair exactly as /match/analyze does."""
+    similarities = []
+    for candidate in candidates:
+        pair = [replace(candidate, model_id=None), replace(role, model_id=None)]
+        AnalysisPlan(pair).embed()
+        similarities.append(similarity_from_vectors(pair[0].doc_embedding, pair[1].doc_embedding))
+    return similarities
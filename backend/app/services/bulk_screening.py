@@ -0,0 +1,207 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+
+from ..models import RoleProfile
+from .analysis_store import persist_analysis
+from .analysis_tasks import score_against
+from .candidate_store import upsert_candidate
+from .document_features import DocumentFeatures
+from .extraction_pool import get_extraction_pool
+from .task_pool import TaskPoolUnavailable, get_task_pool
+
+BULK_MAX_FILES = int(os.getenv("TALENTALIGN_BULK_MAX_FILES", "2000"))
+BULK_MAX_FILE_BYTES = int(os.getenv("TALENTALIGN_BULK_MAX_FILE_MB", "10")) * 1024 * 1024
+BULK_CONCURRENCY = int(os.getenv("TALENTALIGN_BULK_CONCURRENCY", "4"))
+BULK_PERSIST_BATCH = int(os.getenv("TALENTALIGN_BULK_PERSIST_BATCH", "25"))
+# How long one resume may keep waiting for a busy pool before its row is reported as failed.
+BULK_POOL_WAIT_SECONDS = 60.0
+MIN_RESUME_CHARS = 120
+
+KIND_BY_SUFFIX = {".pdf": "pdf", ".docx": "docx"}
+
+
+@dataclass
+class BulkDocument:
+    index: int
+    filename: str
+    kind: str
+    read: Callable[[], bytes]
+    error: Optional[str] = None
+
+
+@dataclass
+class SpooledUpload:
+    filename: str
+    content_type: str
+    file: IO[bytes]
+
+
+@dataclass
+class BulkOutcome:
+    document: BulkDocument
+    analysis: Optional[Dict] = None
+    resume: Optional[DocumentFeatures] = None
+    resume_chars: int = 0
+    error: Optional[str] = None
+
+
+def spool_uploads(uploads: List[UploadFile]) -> List[SpooledUpload]:
+    """
+    Copy uploads to temporary files the caller owns: the framework closes request files as soon as
+    a streaming response starts, and on disk the archive never has to fit in memory.
+    """
+    spooled = []
+    for upload in uploads:
+        handle = tempfile.TemporaryFile()
+        upload.file.seek(0)
+        shutil.copyfileobj(upload.file, handle)
+        handle.seek(0)
+        spooled.append(SpooledUpload(upload.filename or "", upload.content_type or "", handle))
+    return spooled
+
+
+def _is_zip(upload: SpooledUpload) -> bool:
+    return Path(upload.filename).suffix.lower() == ".zip" or upload.content_type in {
+        "application/zip",
+        "application/x-zip-compressed",
+    }
+
+
+def _read_upload(upload: SpooledUpload) -> bytes:
+    upload.file.seek(0)
+    return upload.file.read(BULK_MAX_FILE_BYTES + 1)
+
+
+def _read_entry(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> bytes:
+    # Bounded read: the size in the central directory is not trusted.
+    with archive.open(info) as handle:
+        return handle.read(BULK_MAX_FILE_BYTES + 1)
+
+
+def iter_bulk_documents(uploads: List[SpooledUpload]) -> Iterator[BulkDocument]:
+    """
+    Lazily enumerate resumes across plain uploads and ZIP archives. Nothing is read until a
+    document's `read` is called, so only the documents currently being screened are held in memory.
+    """
+    index = 0
+    for upload in uploads:
+        if _is_zip(upload):
+            try:
+                archive = zipfile.ZipFile(upload.file)
+            except zipfile.BadZipFile:
+                yield BulkDocument(index, upload.filename, "unknown", lambda: b"", error="Not a valid ZIP archive")
+                index += 1
+                continue
+            for info in archive.infolist():
+                name = Path(info.filename).name
+                if info.is_dir() or info.filename.startswith("__MACOSX/") or name.startswith("."):
+                    continue
+                kind = KIND_BY_SUFFIX.get(Path(name).suffix.lower(), "unknown")
+                error = None
+                if kind == "unknown":
+                    error = "Unsupported file type. Use PDF or DOCX."
+                elif info.file_size > BULK_MAX_FILE_BYTES:
+                    error = f"File exceeds {BULK_MAX_FILE_BYTES // (1024 * 1024)} MB"
+                yield BulkDocument(index, info.filename, kind, lambda a=archive, i=info: _read_entry(a, i), error=error)
+                index += 1
+        else:
+            kind = KIND_BY_SUFFIX.get(Path(upload.filename).suffix.lower(), "unknown")
+            error = None if kind != "unknown" else "Unsupported file type. Use PDF or DOCX."
+            yield BulkDocument(index, upload.filename, kind, lambda u=upload: _read_upload(u), error=error)
+            index += 1
+
+
+async def _wait_for_pool(call: Callable):
+    deadline = time.monotonic() + BULK_POOL_WAIT_SECONDS
+    delay = 0.25
+    while True:
+        try:
+            return await call()
+        except TaskPoolUnavailable:
+            if time.monotonic() + delay > deadline:
+                raise
+            await asyncio.sleep(delay)
+            delay = min(2.0, delay * 2)
+
+
+async def _screen_one(document: BulkDocument, role: DocumentFeatures, mode: str) -> BulkOutcome:
+    if document.error:
+        return BulkOutcome(document, error=document.error)
+    try:
+        contents = document.read()
+        if len(contents) > BULK_MAX_FILE_BYTES:
+            return BulkOutcome(document, error=f"File exceeds {BULK_MAX_FILE_BYTES // (1024 * 1024)} MB")
+        resume_text = await _wait_for_pool(lambda: get_extraction_pool().extract(contents, document.kind))
+        del contents
+        if len(resume_text) < MIN_RESUME_CHARS:
+            return BulkOutcome(document, error="Resume text is too short after parsing.")
+        analyses, resume = await _wait_for_pool(lambda: get_task_pool().run(score_against, resume_text, [role], mode))
+        return BulkOutcome(document, analysis=analyses[0], resume=resume, resume_chars=len(resume_text))
+    except Exception as exc:
+        return BulkOutcome(document, error=str(exc) or exc.__class__.__name__)
+
+
+async def screen_documents(
+    documents: Iterator[BulkDocument],
+    role: DocumentFeatures,
+    mode: str,
+    concurrency: int = BULK_CONCURRENCY,
+) -> AsyncIterator[BulkOutcome]:
+    """Screen documents against one prepared role, at most `concurrency` at a time, yielding in completion order."""
+    pending = set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max(1, concurrency):
+                document = next(documents, None)
+                if document is None:
+                    exhausted = True
+                else:
+                    pending.add(asyncio.ensure_future(_screen_one(document, role, mode)))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def persist_bulk_results(
+    db: Session,
+    owner_user_id: int,
+    mode: str,
+    role: RoleProfile,
+    outcomes: List[BulkOutcome],
+) -> List[Tuple[int, int]]:
+    """Store a batch of screened resumes and their candidate profiles in one transaction; returns (index, analysis_id)."""
+    records = []
+    for outcome in outcomes:
+        result = dict(outcome.analysis)
+        result["input_metadata"] = {
+            "candidate_name": None,
+            "role_title": role.title,
+            "role_id": role.id,
+            "resume_filename": outcome.document.filename,
+            "resume_chars": outcome.resume_chars,
+            "jd_filename": None,
+            "jd_chars": len(role.jd_text),
+            "has_jd_text": False,
+            **result.pop("metrics"),
+        }
+        records.append((outcome, persist_analysis(db, owner_user_id, mode, result, commit=False)))
+    for outcome, record in records:
+        upsert_candidate(db, owner_user_id, outcome.resume, analysis_id=record.id, commit=False)
+    db.commit()
+    return [(outcome.document.index, record.id) for outcome, record in records]
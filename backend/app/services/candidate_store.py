@@ -0,0 +1,369 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from ..models import CandidateProfile
+from .analysis_engine import hybrid_scores, keyword_alignments
+from .document_features import DocumentFeatures, extract_document_features
+from .embedding_engine import embedding_model_id
+from .metrics import export_stats, register_collector
+from .result_cache import content_key
+from .role_features import ROLE_FEATURES_VERSION, features_from_row, jd_hash, unpack_matrix, write_feature_columns
+from .skill_taxonomy import get_skill_taxonomy
+
+# Candidates per task-pool call when many are embedded or scored at once.
+CANDIDATE_BATCH_SIZE = int(os.getenv("TALENTALIGN_CANDIDATE_BATCH_SIZE", "200"))
+# Ranking snapshots are kept per owner in an LRU bounded by both count and approximate size.
+SNAPSHOT_CACHE_ITEMS = int(os.getenv("TALENTALIGN_SNAPSHOT_CACHE_ITEMS", "64"))
+SNAPSHOT_CACHE_MB = float(os.getenv("TALENTALIGN_SNAPSHOT_CACHE_MB", "256"))
+
+
+def resume_hash(resume_text: str) -> str:
+    return hashlib.sha256(resume_text.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def upsert_candidate(
+    db: Session,
+    owner_user_id: int,
+    features: DocumentFeatures,
+    candidate_name: Optional[str] = None,
+    analysis_id: Optional[int] = None,
+    commit: bool = True,
+) -> CandidateProfile:
+    """
+    Keep the parsed resume and its features so later role searches never re-parse or re-encode it.
+    With commit=False the row is only flushed, so callers can persist many candidates in one transaction.
+    """
+    digest = resume_hash(features.text)
+    row = (
+        db.query(CandidateProfile)
+        .filter(CandidateProfile.owner_user_id == owner_user_id, CandidateProfile.resume_hash == digest)
+        .first()
+    )
+    if row is None:
+        row = CandidateProfile(
+            owner_user_id=owner_user_id,
+            resume_hash=digest,
+            resume_text=features.text,
+            created_at=datetime.utcnow(),
+        )
+    if candidate_name:
+        row.candidate_name = candidate_name
+    if analysis_id is not None:
+        row.latest_analysis_id = analysis_id
+    # Never downgrade stored vectors to "none" just because this request ran on the ad-hoc fallback.
+    if row.doc_embedding is None or features.is_embedded_with(features.model_id):
+        write_feature_columns(row, features)
+    else:
+        row.updated_at = datetime.utcnow()
+    db.add(row)
+    if not commit:
+        db.flush()
+        return row
+    db.commit()
+    db.refresh(row)
+    return row
+
+
+def candidates_missing_vectors(db: Session, owner_user_id: int) -> Tuple[List[int], List[DocumentFeatures]]:
+    """
+    Stored candidates without a vector from the active stable model, as features ready to embed.
+    Empty on the ad-hoc TF-IDF fallback, where vectors are never comparable across calls.
+    """
+    model_id = embedding_model_id()
+    if model_id is None:
+        return [], []
+    rows = (
+        db.query(CandidateProfile)
+        .filter(
+            CandidateProfile.owner_user_id == owner_user_id,
+            or_(
+                CandidateProfile.model_id.is_(None),
+                CandidateProfile.model_id != model_id,
+                CandidateProfile.doc_embedding.is_(None),
+            ),
+        )
+        .order_by(CandidateProfile.id)
+        .all()
+    )
+    return [row.id for row in rows], [features_from_row(row, row.resume_text) for row in rows]
+
+
+def save_candidate_vectors(db: Session, candidate_ids: List[int], features: List[DocumentFeatures]):
+    rows = {row.id: row for row in db.query(CandidateProfile).filter(CandidateProfile.id.in_(candidate_ids)).all()}
+    for candidate_id, candidate in zip(candidate_ids, features):
+        row = rows.get(candidate_id)
+        if row is not None:
+            write_feature_columns(row, candidate)
+    db.commit()
+
+
+def similarity_keys(db: Session, owner_user_id: int, role: DocumentFeatures) -> Dict[int, str]:
+    """Result-cache key per candidate for its ad-hoc similarity to `role`; both texts are part of the key."""
+    role_hash = jd_hash(role.text)
+    rows = db.query(CandidateProfile.id, CandidateProfile.resume_hash).filter(CandidateProfile.owner_user_id == owner_user_id)
+    return {
+        candidate_id: content_key("candidate_similarity", digest, role_hash, ROLE_FEATURES_VERSION)
+        for candidate_id, digest in rows.all()
+    }
+
+
+def candidate_features(db: Session, candidate_ids: List[int]) -> Tuple[List[int], List[DocumentFeatures]]:
+    """Stored features of the given candidates that still exist, with their ids in the same order."""
+    rows = db.query(CandidateProfile).filter(CandidateProfile.id.in_(candidate_ids)).order_by(CandidateProfile.id).all()
+    return [row.id for row in rows], [features_from_row(row, row.resume_text) for row in rows]
+
+
+@dataclass
+class _CandidateSnapshot:
+    signature: Tuple
+    model_id: Optional[str]
+    ids: np.ndarray
+    names: List[Optional[str]]
+    analysis_ids: List[Optional[int]]
+    updated_at: List[datetime]
+    skills: List[frozenset]
+    # Column per skill or keyword seen in any candidate; rows follow `ids`.
+    vocabulary: Dict[str, int]
+    counts: sparse.csr_matrix
+    skill_bitmap: sparse.csr_matrix
+    skill_sizes: np.ndarray
+    token_counts: np.ndarray
+    embedded_rows: np.ndarray
+    matrix: Optional[np.ndarray]
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.ids, self.skill_sizes, self.token_counts, self.embedded_rows]
+        for matrix in (self.counts, self.skill_bitmap):
+            arrays.extend((matrix.data, matrix.indices, matrix.indptr))
+        if self.matrix is not None:
+            arrays.append(self.matrix)
+        # Python-side lists and the vocabulary are estimated per entry rather than walked.
+        return sum(array.nbytes for array in arrays) + 200 * len(self.names) + 100 * len(self.vocabulary)
+
+
+_snapshots: "OrderedDict[int, _CandidateSnapshot]" = OrderedDict()
+_snapshot_bytes = 0
+_snapshot_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_lock = threading.Lock()
+
+
+def _remember_snapshot(owner_user_id: int, snapshot: _CandidateSnapshot):
+    global _snapshot_bytes
+    with _lock:
+        previous = _snapshots.pop(owner_user_id, None)
+        if previous is not None:
+            _snapshot_bytes -= previous.nbytes
+        if snapshot.nbytes > SNAPSHOT_CACHE_MB * 1024 * 1024 or SNAPSHOT_CACHE_ITEMS <= 0:
+            return
+        _snapshots[owner_user_id] = snapshot
+        _snapshot_bytes += snapshot.nbytes
+        while len(_snapshots) > SNAPSHOT_CACHE_ITEMS or _snapshot_bytes > SNAPSHOT_CACHE_MB * 1024 * 1024:
+            _, evicted = _snapshots.popitem(last=False)
+            _snapshot_bytes -= evicted.nbytes
+            _snapshot_stats["evictions"] += 1
+
+
+def snapshot_cache_stats() -> Dict[str, int]:
+    with _lock:
+        return {**_snapshot_stats, "items": len(_snapshots), "bytes": _snapshot_bytes}
+
+
+register_collector(lambda: export_stats("candidate_snapshots", snapshot_cache_stats()))
+
+
+def _signature(db: Session, owner_user_id: int, model_id: Optional[str]) -> Tuple:
+    count, latest = (
+        db.query(func.count(CandidateProfile.id), func.max(CandidateProfile.updated_at))
+        .filter(CandidateProfile.owner_user_id == owner_user_id)
+        .one()
+    )
+    return count, latest, model_id
+
+
+def _refresh_stale_skills(db: Session, owner_user_id: int):
+    # Re-extracting skills and counts from stored text is cheap; stored embeddings are kept as they are.
+    fingerprint = get_skill_taxonomy().fingerprint
+    stale = (
+        db.query(CandidateProfile)
+        .filter(
+            CandidateProfile.owner_user_id == owner_user_id,
+            or_(
+                CandidateProfile.taxonomy_id.is_(None),
+                CandidateProfile.taxonomy_id != fingerprint,
+                CandidateProfile.format_version != ROLE_FEATURES_VERSION,
+            ),
+        )
+        .all()
+    )
+    for row in stale:
+        features = extract_document_features(row.resume_text)
+        row.skills = features.skills
+        row.keyword_counts = features.keyword_counts
+        row.token_count = features.token_count
+        row.taxonomy_id = features.taxonomy_id
+        row.format_version = ROLE_FEATURES_VERSION
+        row.updated_at = datetime.utcnow()
+    if stale:
+        db.commit()
+
+
+def _load_snapshot(db: Session, owner_user_id: int) -> _CandidateSnapshot:
+    _refresh_stale_skills(db, owner_user_id)
+    model_id = embedding_model_id()
+    signature = _signature(db, owner_user_id, model_id)
+    with _lock:
+        cached = _snapshots.get(owner_user_id)
+        if cached and cached.signature == signature:
+            _snapshots.move_to_end(owner_user_id)
+            _snapshot_stats["hits"] += 1
+            return cached
+        _snapshot_stats["misses"] += 1
+
+    rows = (
+        db.query(
+            CandidateProfile.id,
+            CandidateProfile.candidate_name,
+            CandidateProfile.latest_analysis_id,
+            CandidateProfile.updated_at,
+            CandidateProfile.format_version,
+            CandidateProfile.model_id,
+            CandidateProfile.skills,
+            CandidateProfile.keyword_counts,
+            CandidateProfile.token_count,
+            CandidateProfile.doc_embedding,
+        )
+        .filter(CandidateProfile.owner_user_id == owner_user_id)
+        .order_by(CandidateProfile.id)
+        .all()
+    )
+    embedded = [
+        i
+        for i, row in enumerate(rows)
+        if model_id is not None and row.model_id == model_id and row.doc_embedding is not None
+        and row.format_version == ROLE_FEATURES_VERSION
+    ]
+    skills = [frozenset(row.skills or []) for row in rows]
+    vocabulary: Dict[str, int] = {}
+    count_cells: Tuple[List[int], List[int], List[int]] = ([], [], [])
+    skill_cells: Tuple[List[int], List[int]] = ([], [])
+    for i, row in enumerate(rows):
+        for keyword, count in (row.keyword_counts or {}).items():
+            count_cells[0].append(i)
+            count_cells[1].append(vocabulary.setdefault(keyword, len(vocabulary)))
+            count_cells[2].append(int(count))
+        for skill in skills[i]:
+            skill_cells[0].append(i)
+            skill_cells[1].append(vocabulary.setdefault(skill, len(vocabulary)))
+    shape = (len(rows), max(1, len(vocabulary)))
+    snapshot = _CandidateSnapshot(
+        signature=signature,
+        model_id=model_id,
+        ids=np.array([row.id for row in rows], dtype=np.int64),
+        names=[row.candidate_name for row in rows],
+        analysis_ids=[row.latest_analysis_id for row in rows],
+        updated_at=[row.updated_at for row in rows],
+        skills=skills,
+        vocabulary=vocabulary,
+        counts=sparse.csr_matrix((count_cells[2], (count_cells[0], count_cells[1])), shape=shape, dtype=np.int64),
+        skill_bitmap=sparse.csr_matrix(
+            (np.ones(len(skill_cells[0]), dtype=np.int8), (skill_cells[0], skill_cells[1])), shape=shape
+        ),
+        skill_sizes=np.array([len(candidate_skills) for candidate_skills in skills], dtype=np.int64),
+        token_counts=np.array([int(row.token_count or 0) for row in rows], dtype=np.int64),
+        embedded_rows=np.array(embedded, dtype=np.int64),
+        matrix=np.vstack([unpack_matrix(rows[i].doc_embedding) for i in embedded]) if embedded else None,
+    )
+    _remember_snapshot(owner_user_id, snapshot)
+    return snapshot
+
+
+def rank_candidates(
+    db: Session,
+    owner_user_id: int,
+    role: DocumentFeatures,
+    mode: str = "standard",
+    offset: int = 0,
+    limit: int = 20,
+    similarities: Optional[Dict[int, float]] = None,
+) -> Tuple[int, List[Dict]]:
+    """
+    Score every stored candidate against a role with array math over the whole snapshot: one matrix-vector
+    product for semantic similarity, and column slices of the skill bitmap and keyword count matrix for
+    coverage and alignment. Scores use the same formula as /match/analyze. On the ad-hoc TF-IDF fallback
+    the caller passes each candidate's per-pair `similarities` instead of stored vectors. A candidate still
+    without a similarity (added since its vectors were backfilled) is ranked after every scored one and
+    reported with semantic_similarity None.
+    """
+    snapshot = _load_snapshot(db, owner_user_id)
+    total = int(snapshot.ids.shape[0])
+    if not total or offset >= total:
+        return total, []
+
+    semantic = np.full(total, np.nan, dtype=np.float32)
+    if similarities is not None:
+        semantic[:] = [similarities.get(int(candidate_id), np.nan) for candidate_id in snapshot.ids]
+    elif snapshot.matrix is not None and role.is_embedded_with(snapshot.model_id):
+        query = np.asarray(role.doc_embedding, dtype=np.float32).reshape(-1)
+        semantic[snapshot.embedded_rows] = np.clip(snapshot.matrix @ query, 0.0, 1.0)
+
+    jd_skills = set(role.skills)
+    columns = [snapshot.vocabulary.get(skill) for skill in sorted(jd_skills)]
+    overlap = np.asarray(snapshot.skill_bitmap[:, [c for c in columns if c is not None]].sum(axis=1)).reshape(-1)
+    coverage = overlap / max(1, len(jd_skills))
+
+    # Only keywords with a JD density contribute a gap; a keyword outside the JD's skills counts only
+    # for candidates that have it, since only then is it among the pair's tracked keywords.
+    keywords = sorted(keyword for keyword, count in role.keyword_counts.items() if count)
+    keyword_columns = [snapshot.vocabulary.get(keyword) for keyword in keywords]
+    tracked = np.zeros((total, len(keywords)), dtype=bool)
+    candidate_counts = np.zeros((total, len(keywords)), dtype=np.int64)
+    present = [j for j, column in enumerate(keyword_columns) if column is not None]
+    if present:
+        picked = [keyword_columns[j] for j in present]
+        candidate_counts[:, present] = snapshot.counts[:, picked].toarray()
+        tracked[:, present] = snapshot.skill_bitmap[:, picked].toarray() > 0
+    tracked[:, [j for j, keyword in enumerate(keywords) if keyword in jd_skills]] = True
+    alignment = keyword_alignments(
+        candidate_counts,
+        snapshot.token_counts,
+        role.counts(keywords),
+        role.token_count,
+        tracked,
+        len(jd_skills) + snapshot.skill_sizes - overlap,
+    )
+    scores = hybrid_scores(semantic, coverage, alignment, mode, bool(jd_skills))
+    # Scores are within 0-100, so shifting unscored candidates down by 1000 puts their whole group last.
+    rank_key = np.where(np.isnan(semantic), scores - 1000.0, scores)
+
+    window = min(total, offset + limit)
+    order = np.argpartition(-rank_key, window - 1)[:window] if window < total else np.arange(total)
+    order = order[np.lexsort((snapshot.ids[order], -rank_key[order]))][offset:window]
+
+    items = []
+    for i in order:
+        items.append(
+            {
+                "candidate_id": int(snapshot.ids[i]),
+                "candidate_name": snapshot.names[i],
+                "latest_analysis_id": snapshot.analysis_ids[i],
+                "score": round(float(scores[i]), 2),
+                "semantic_similarity": None if np.isnan(semantic[i]) else round(float(semantic[i]) * 100, 2),
+                "skill_coverage": round(float(coverage[i]) * 100, 2),
+                "keyword_alignment": round(float(alignment[i]) * 100, 2),
+                "overlapping_skills": sorted(snapshot.skills[i] & jd_skills),
+                "missing_skills_top5": sorted(jd_skills - snapshot.skills[i])[:5],
+                "updated_at": snapshot.updated_at[i],
+            }
+        )
+    return total, items
@@ -0,0 +1,92 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .embedding_engine import embed_texts, embedding_model_id
+from .insights_generator import heatmap_sections
+from .tracing import time_stage
+from .skill_extractor import density_from_counts, word_count
+from .skill_taxonomy import get_skill_taxonomy
+
+
+@dataclass
+class DocumentFeatures:
+    """Everything the scorer needs from one document, so it can be computed once and reused."""
+
+    text: str
+    sentences: List[str]
+    skills: List[str]
+    keyword_counts: Dict[str, int]
+    token_count: int
+    taxonomy_id: Optional[str] = None
+    model_id: Optional[str] = None
+    doc_embedding: Optional[object] = None
+    sentence_embeddings: Optional[object] = None
+
+    def is_embedded_with(self, model_id: Optional[str]) -> bool:
+        return model_id is not None and self.model_id == model_id and self.doc_embedding is not None
+
+    def density(self, keywords: List[str]) -> Dict[str, float]:
+        return density_from_counts(self.keyword_counts, self.token_count, keywords)
+
+    def counts(self, keywords: List[str]) -> np.ndarray:
+        return np.array([self.keyword_counts.get(keyword, 0) for keyword in keywords], dtype=np.int64)
+
+
+def extract_document_features(text: str) -> DocumentFeatures:
+    taxonomy = get_skill_taxonomy()
+    with time_stage("heatmap"):
+        sentences = heatmap_sections(text)
+    with time_stage("skills"):
+        # Counts come from the same matcher that detects skills, so a skill found through an alias
+        # ("k8s") is counted under its canonical name too.
+        keyword_counts = taxonomy.matcher.count(text)
+        skills = sorted(keyword_counts)
+    with time_stage("density"):
+        token_count = word_count(text)
+    return DocumentFeatures(
+        text=text,
+        sentences=sentences,
+        skills=skills,
+        keyword_counts=keyword_counts,
+        token_count=token_count,
+        taxonomy_id=taxonomy.fingerprint,
+    )
+
+
+@dataclass
+class AnalysisPlan:
+    """
+    Documents whose full text and heatmap chunks are embedded together in one batched call.
+    Documents already embedded with the active model (e.g. stored role features) are skipped.
+    """
+
+    documents: List[DocumentFeatures] = field(default_factory=list)
+
+    def texts_for(self, documents: List[DocumentFeatures]) -> List[str]:
+        texts: List[str] = []
+        for doc in documents:
+            texts.append(doc.text)
+            texts.extend(doc.sentences)
+        return texts
+
+    def embed(self) -> List[DocumentFeatures]:
+        model_id = embedding_model_id()
+        # Ad-hoc TF-IDF vectors only agree within one fit, so everything is embedded together.
+        pending = [doc for doc in self.documents if not doc.is_embedded_with(model_id)]
+        if model_id is None:
+            pending = list(self.documents)
+        if not pending:
+            return self.documents
+
+        with time_stage("embed"):
+            vectors = embed_texts(self.texts_for(pending))
+        offset = 0
+        for doc in pending:
+            doc.doc_embedding = vectors[offset : offset + 1]
+            doc.sentence_embeddings = vectors[offset + 1 : offset + 1 + len(doc.sentences)]
+            doc.model_id = model_id
+            offset += 1 + len(doc.sentences)
+        return self.documents
+
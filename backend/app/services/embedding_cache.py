@@ -0,0 +1,165 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .metrics import export_stats, register_collector
+
+EMBED_CACHE_MEMORY_ITEMS = int(os.getenv("TALENTALIGN_EMBED_CACHE_MEMORY_ITEMS", "20000"))
+EMBED_CACHE_DISK_ITEMS = int(os.getenv("TALENTALIGN_EMBED_CACHE_DISK_ITEMS", "500000"))
+# Empty path disables the on-disk tier and keeps the cache in-process only.
+EMBED_CACHE_PATH = os.getenv("TALENTALIGN_EMBED_CACHE_PATH", "./talentalign_embeddings.db")
+EMBED_CACHE_DTYPE = np.float16
+
+
+def normalize_cache_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def cache_key(model_id: str, text: str) -> str:
+    payload = f"{model_id}\x00{normalize_cache_text(text)}".encode("utf-8", errors="ignore")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed vector cache with an in-process LRU tier in front of a SQLite tier.
+    Vectors are stored as float16 and returned as float32.
+    """
+
+    def __init__(self, memory_items: int, disk_items: int, path: Optional[str]):
+        self.memory_items = max(0, memory_items)
+        self.disk_items = max(0, disk_items)
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "memory_evictions": 0, "disk_evictions": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_count = 0
+        if path and self.disk_items:
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_embeddings_last_access ON embeddings (last_access)")
+            self._disk_count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _remember(self, key: str, vector: np.ndarray):
+        if not self.memory_items:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+            self._stats["memory_evictions"] += 1
+
+    def _disk_get(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        if self._conn is None or not keys:
+            return {}
+        found: Dict[str, np.ndarray] = {}
+        for start in range(0, len(keys), 500):
+            chunk = list(keys[start : start + 500])
+            placeholders = ",".join("?" for _ in chunk)
+            rows = self._conn.execute(
+                f"SELECT key, dim, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            for key, dim, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=EMBED_CACHE_DTYPE, count=dim)
+        if found:
+            now = time.time()
+            self._conn.executemany("UPDATE embeddings SET last_access = ? WHERE key = ?", [(now, k) for k in found])
+        return found
+
+    def _disk_put(self, items: Dict[str, np.ndarray]):
+        if self._conn is None or not items:
+            return
+        now = time.time()
+        before = self._conn.total_changes
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO embeddings (key, dim, vector, last_access) VALUES (?, ?, ?, ?)",
+            [(key, int(vec.shape[0]), vec.tobytes(), now) for key, vec in items.items()],
+        )
+        self._disk_count += self._conn.total_changes - before
+        overflow = self._disk_count - self.disk_items
+        if overflow > 0:
+            # Evict a little extra so we do not pay for a delete on every insert once the tier is full.
+            batch = overflow + max(1, self.disk_items // 20)
+            deleted = self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_access LIMIT ?)",
+                (batch,),
+            ).rowcount
+            self._disk_count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            self._stats["disk_evictions"] += max(0, deleted)
+
+    def get_or_compute(
+        self,
+        model_id: str,
+        texts: List[str],
+        compute: Callable[[List[str]], np.ndarray],
+    ) -> np.ndarray:
+        keys = [cache_key(model_id, text) for text in texts]
+        resolved: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            pending: List[str] = []
+            for key in dict.fromkeys(keys):
+                vector = self._memory.get(key)
+                if vector is None:
+                    pending.append(key)
+                    continue
+                self._memory.move_to_end(key)
+                resolved[key] = vector
+                self._stats["memory_hits"] += 1
+
+            for key, vector in self._disk_get(pending).items():
+                resolved[key] = vector
+                self._remember(key, vector)
+                self._stats["disk_hits"] += 1
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in resolved:
+                missing.setdefault(key, text)
+        if missing:
+            computed = np.asarray(compute(list(missing.values())), dtype=np.float32)
+            fresh = {key: computed[i].astype(EMBED_CACHE_DTYPE) for i, key in enumerate(missing)}
+            with self._lock:
+                self._stats["misses"] += len(fresh)
+                for key, vector in fresh.items():
+                    self._remember(key, vector)
+                self._disk_put(fresh)
+            resolved.update(fresh)
+
+        return np.vstack([resolved[key] for key in keys]).astype(np.float32)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._stats,
+                "memory_items": len(self._memory),
+                "disk_items": self._disk_count,
+                "memory_capacity": self.memory_items,
+                "disk_capacity": self.disk_items if self._conn is not None else 0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embeddings")
+                self._disk_count = 0
+
+
+@lru_cache(maxsize=1)
+def get_embedding_cache() -> EmbeddingCache:
+    cache = EmbeddingCache(EMBED_CACHE_MEMORY_ITEMS, EMBED_CACHE_DISK_ITEMS, EMBED_CACHE_PATH or None)
+    register_collector(lambda: export_stats("embedding_cache", cache.stats()))
+    return cache
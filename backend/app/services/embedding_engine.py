@@ -1,4 +1,5 @@
 from functools import lru_cache
+import importlib.util
 import os
 from typing import List, Optional
 
@@ -7,37 +8,86 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.preprocessing import normalize
 
+from .embedding_cache import get_embedding_cache
+from .lexical_model import get_lexical_model
+from .metrics import EMBED_LATENCY, EMBEDDED_TEXTS
+
+SENTENCE_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+@lru_cache(maxsize=1)
+def sentence_model_enabled() -> bool:
+    """Whether the SentenceTransformer backend is configured and installed, decided without loading the model."""
+    if os.getenv("TALENTALIGN_ENABLE_ST", "0") != "1":
+        return False
+    return importlib.util.find_spec("sentence_transformers") is not None
+
 
 @lru_cache(maxsize=1)
 def get_model() -> Optional[object]:
     """
-    Try loading SentenceTransformer lazily.
-    If unavailable in local runtime, return None and use TF-IDF fallback.
+    Try loading SentenceTransformer lazily. None when the backend is not enabled (TF-IDF fallback)
+    or the model cannot be loaded, in which case encoding fails rather than mixing vector spaces.
     """
-    if os.getenv("TALENTALIGN_ENABLE_ST", "0") != "1":
+    if not sentence_model_enabled():
         return None
 
     try:
         from sentence_transformers import SentenceTransformer
 
-        return SentenceTransformer("all-MiniLM-L6-v2")
+        return SentenceTransformer(SENTENCE_MODEL_NAME)
     except Exception:
         return None
 
 
+def embedding_model_id() -> Optional[str]:
+    """
+    Identifier of the active per-text embedding model, derived from configuration so the API process can
+    tag and compare stored vectors without loading the model itself (only the task pool encodes).
+    None means vectors depend on the whole batch (ad-hoc TF-IDF) and must not be cached or compared across calls.
+    """
+    if sentence_model_enabled():
+        return f"st:{SENTENCE_MODEL_NAME}"
+    lexical = get_lexical_model()
+    if lexical is not None:
+        return lexical.model_id
+    return None
+
+
 def embed_texts(texts: List[str]) -> np.ndarray:
-    model = get_model()
-    if model is not None:
-        vectors = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
-        return vectors
+    if sentence_model_enabled():
+        model = get_model()
+        if model is None:
+            # Vectors are tagged with the configured model's id, so falling back here would mislabel them.
+            raise RuntimeError(f"Sentence model {SENTENCE_MODEL_NAME} is enabled but could not be loaded")
+        EMBEDDED_TEXTS.inc(len(texts), backend="sentence_transformer")
+        with EMBED_LATENCY.time(backend="sentence_transformer"):
+            return get_embedding_cache().get_or_compute(
+                embedding_model_id(),
+                texts,
+                lambda missing: model.encode(missing, convert_to_numpy=True, normalize_embeddings=True),
+            )
 
     # Fallback path: lexical embeddings if transformer stack is unavailable.
-    vectorizer = TfidfVectorizer(ngram_range=(1, 2), max_features=5000)
-    matrix = vectorizer.fit_transform(texts).astype(np.float32)
-    return normalize(matrix, norm="l2", axis=1)
+    # Prefer the corpus-fitted model so request time only transforms.
+    lexical = get_lexical_model()
+    if lexical is not None:
+        EMBEDDED_TEXTS.inc(len(texts), backend="lexical")
+        with EMBED_LATENCY.time(backend="lexical"):
+            return lexical.transform(texts)
+
+    EMBEDDED_TEXTS.inc(len(texts), backend="tfidf_adhoc")
+    with EMBED_LATENCY.time(backend="tfidf_adhoc"):
+        vectorizer = TfidfVectorizer(ngram_range=(1, 2), max_features=5000)
+        matrix = vectorizer.fit_transform(texts).astype(np.float32)
+        return normalize(matrix, norm="l2", axis=1)
+
+
+def similarity_from_vectors(vector_a, vector_b) -> float:
+    score = cosine_similarity(vector_a, vector_b)[0][0]
+    return float(max(0.0, min(1.0, score)))
 
 
 def compute_similarity(text_a: str, text_b: str) -> float:
     vectors = embed_texts([text_a, text_b])
-    score = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
-    return float(max(0.0, min(1.0, score)))
+    return similarity_from_vectors(vectors[0:1], vectors[1:2])
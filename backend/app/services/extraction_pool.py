@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Set
+
+from .metrics import export_stats, register_collector
+from .task_pool import TaskPoolUnavailable
+from .tracing import time_stage
+
+logger = logging.getLogger("talentalign")
+
+# 0 parses in API-process threads: page and character caps still apply, time and memory caps do not.
+EXTRACT_WORKERS = int(os.getenv("TALENTALIGN_EXTRACT_WORKERS", "2"))
+EXTRACT_QUEUE_SIZE = int(os.getenv("TALENTALIGN_EXTRACT_QUEUE_SIZE", "16"))
+EXTRACT_MAX_PAGES = int(os.getenv("TALENTALIGN_EXTRACT_MAX_PAGES", "50"))
+EXTRACT_MAX_CHARS = int(os.getenv("TALENTALIGN_EXTRACT_MAX_CHARS", "200000"))
+EXTRACT_TIMEOUT_SECONDS = float(os.getenv("TALENTALIGN_EXTRACT_TIMEOUT_SECONDS", "20"))
+EXTRACT_MAX_MEMORY_MB = int(os.getenv("TALENTALIGN_EXTRACT_MAX_MEMORY_MB", "512"))
+EXTRACT_MAX_JOBS_PER_WORKER = int(os.getenv("TALENTALIGN_EXTRACT_MAX_JOBS_PER_WORKER", "200"))
+
+
+class DocumentLimitExceeded(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class ExtractionLimits:
+    max_pages: int = EXTRACT_MAX_PAGES
+    max_chars: int = EXTRACT_MAX_CHARS
+    timeout_seconds: float = EXTRACT_TIMEOUT_SECONDS
+    max_memory_mb: int = EXTRACT_MAX_MEMORY_MB
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        # Peak rather than current RSS, which only makes recycling more eager.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _worker_main(conn):
+    # Imported here so the parent process never needs PyMuPDF just to manage workers.
+    from .resume_parser import iter_clean_text
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        contents, kind, limits = job
+        try:
+            for piece in iter_clean_text(contents, kind, limits.max_pages, limits.max_chars):
+                if _rss_mb() > limits.max_memory_mb:
+                    conn.send(("limit", f"Document needs more than {limits.max_memory_mb} MB to parse"))
+                    return
+                conn.send(("text", piece))
+            del contents
+            conn.send(("done", _rss_mb() > limits.max_memory_mb))
+        except Exception as exc:
+            conn.send(("error", f"Could not read document: {exc}"))
+
+
+class _ExtractionWorker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True, name="talentalign-extract")
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self):
+        try:
+            self.conn.close()
+        finally:
+            self.process.kill()
+            self.process.join(timeout=1)
+
+
+class ExtractionPool:
+    """
+    Dedicated processes that parse uploaded PDF/DOCX bytes and stream cleaned text back one page at a time.
+    Each driver thread owns one worker process; a worker that runs past the time or memory limit, dies,
+    or reaches its job quota is killed and replaced on the next job.
+    """
+
+    def __init__(self, workers: int, queue_size: int, limits: ExtractionLimits, max_jobs_per_worker: int):
+        self.workers = max(0, workers)
+        self.capacity = max(1, self.workers) + max(0, queue_size)
+        self.limits = limits
+        self.max_jobs_per_worker = max(1, max_jobs_per_worker)
+        self._context = multiprocessing.get_context("spawn")
+        self._executor = ThreadPoolExecutor(max_workers=max(1, self.workers or min(4, os.cpu_count() or 1)), thread_name_prefix="extract")
+        self._local = threading.local()
+        self._live: Set[_ExtractionWorker] = set()
+        self._outstanding = 0
+        self._lock = threading.Lock()
+
+    def _worker(self) -> _ExtractionWorker:
+        worker = getattr(self._local, "worker", None)
+        if worker is None or not worker.alive():
+            if worker is not None:
+                self._retire(worker)
+            worker = _ExtractionWorker(self._context)
+            self._local.worker = worker
+            with self._lock:
+                self._live.add(worker)
+        return worker
+
+    def _retire(self, worker: _ExtractionWorker):
+        self._local.worker = None
+        with self._lock:
+            self._live.discard(worker)
+        worker.stop()
+
+    def _extract_in_worker(self, contents: bytes, kind: str) -> str:
+        worker = self._worker()
+        worker.jobs += 1
+        limits = self.limits
+        pieces: List[str] = []
+        recycle = True
+        try:
+            worker.conn.send((contents, kind, limits))
+            deadline = time.monotonic() + limits.timeout_seconds
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not worker.conn.poll(remaining):
+                    logger.warning("Extraction worker %s exceeded %ss; recycling", worker.process.pid, limits.timeout_seconds)
+                    raise DocumentLimitExceeded(f"Document could not be parsed within {limits.timeout_seconds:g}s")
+                message, payload = worker.conn.recv()
+                if message == "text":
+                    pieces.append(payload)
+                elif message == "done":
+                    recycle = payload or worker.jobs >= self.max_jobs_per_worker
+                    return "".join(pieces)
+                elif message == "limit":
+                    raise DocumentLimitExceeded(payload)
+                else:
+                    recycle = not worker.alive()
+                    raise ValueError(payload)
+        except (EOFError, OSError) as exc:
+            logger.warning("Extraction worker %s died while parsing", worker.process.pid)
+            raise ValueError("Could not read document") from exc
+        finally:
+            if recycle:
+                self._retire(worker)
+
+    def _extract_inline(self, contents: bytes, kind: str) -> str:
+        from .resume_parser import extract_text_from_bytes
+
+        return extract_text_from_bytes(contents, kind, self.limits.max_pages, self.limits.max_chars)
+
+    async def extract(self, contents: bytes, kind: str) -> str:
+        if kind not in {"pdf", "docx"}:
+            raise ValueError("Unsupported file type. Use PDF or DOCX.")
+        with self._lock:
+            if self._outstanding >= self.capacity:
+                raise TaskPoolUnavailable("Document extraction queue is full, retry shortly")
+            self._outstanding += 1
+        try:
+            target = self._extract_in_worker if self.workers else self._extract_inline
+            with time_stage("parse"):
+                return await asyncio.get_running_loop().run_in_executor(self._executor, target, contents, kind)
+        finally:
+            with self._lock:
+                self._outstanding -= 1
+
+    def warm_up(self):
+        """Start every driver thread's worker ahead of the first upload, which would otherwise pay for the spawn."""
+        if not self.workers:
+            return
+        barrier = threading.Barrier(self.workers)
+
+        def start():
+            self._worker()
+            try:
+                # Hold the thread so each submission lands on a different driver thread.
+                barrier.wait(timeout=self.limits.timeout_seconds)
+            except threading.BrokenBarrierError:
+                pass
+
+        for _ in range(self.workers):
+            self._executor.submit(start)
+
+    def shutdown(self):
+        with self._lock:
+            workers, self._live = list(self._live), set()
+        for worker in workers:
+            worker.stop()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache(maxsize=1)
+def get_extraction_pool() -> ExtractionPool:
+    pool = ExtractionPool(EXTRACT_WORKERS, EXTRACT_QUEUE_SIZE, ExtractionLimits(), EXTRACT_MAX_JOBS_PER_WORKER)
+    register_collector(lambda: export_stats("extraction_pool", {"outstanding": pool._outstanding, "capacity": pool.capacity}))
+    return pool
@@ -1,45 +1,119 @@
-﻿from typing import Dict, List
+﻿import math
+import os
+from typing import Dict, List, Tuple
 
-from .embedding_engine import embed_texts
-from .resume_parser import split_sentences
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
+from sklearn.utils.extmath import row_norms, safe_sparse_dot
 
+from .resume_parser import split_sentences
 
-def generate_heatmap_data(resume_text: str, jd_text: str, max_points: int = 12) -> List[Dict]:
-    resume_sections = list(split_sentences(resume_text))[:max_points]
-    jd_sections = list(split_sentences(jd_text))[:max_points]
 
+# Consecutive sentences are merged into chunks of about this many words, so the whole document is covered.
+HEATMAP_CHUNK_WORDS = int(os.getenv("TALENTALIGN_HEATMAP_CHUNK_WORDS", "30"))
+# Longer documents get proportionally larger chunks instead of being cut off.
+HEATMAP_MAX_CHUNKS = int(os.getenv("TALENTALIGN_HEATMAP_MAX_CHUNKS", "256"))
+# Best JD chunks kept per resume chunk in the sparse heatmap.
+HEATMAP_ROW_TOP_K = int(os.getenv("TALENTALIGN_HEATMAP_ROW_TOP_K", "3"))
+# Similarities are computed this many cells at a time, which caps memory on long documents.
+HEATMAP_BLOCK_CELLS = 65536
+HEATMAP_PREVIEW_CHARS = 140
+TOP_SECTIONS = 5
+
+
+def heatmap_sections(text: str, chunk_words: int = HEATMAP_CHUNK_WORDS, max_chunks: int = HEATMAP_MAX_CHUNKS) -> List[str]:
+    sentences = [sentence.split() for sentence in split_sentences(text)]
+    total_words = sum(len(words) for words in sentences)
+    # Greedy packing fills each pair of neighbouring chunks past the limit, so this keeps the count within max_chunks.
+    limit = max(1, chunk_words, math.ceil(2 * total_words / max(1, max_chunks)))
+
+    chunks: List[str] = []
+    current: List[str] = []
+    for words in sentences:
+        # Sentences longer than a chunk (e.g. unpunctuated PDF text) are split on word boundaries.
+        for start in range(0, len(words), limit):
+            piece = words[start : start + limit]
+            if current and len(current) + len(piece) > limit:
+                chunks.append(" ".join(current))
+                current = []
+            current.extend(piece)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _top_indices(values: np.ndarray, k: int) -> np.ndarray:
+    if k >= values.size:
+        return np.arange(values.size)
+    return np.argpartition(values, values.size - k)[values.size - k :]
+
+
+def build_heatmap(
+    resume_sections: List[str],
+    jd_sections: List[str],
+    resume_embeddings,
+    jd_embeddings,
+    row_top_k: int = HEATMAP_ROW_TOP_K,
+    top_k: int = TOP_SECTIONS,
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Sparse heatmap over every chunk pair: the `row_top_k` best JD chunks for each resume chunk, and the
+    `top_k` best pairs overall with chunk previews. The similarity matrix is scored a block of rows at a
+    time and reduced with partial selection, so it is never held or sorted in full.
+    """
     if not resume_sections or not jd_sections:
-        return []
-
-    # Embed both lists in one pass so fallback vectorizers share the same feature space.
-    combined_sections = resume_sections + jd_sections
-    combined_embeddings = embed_texts(combined_sections)
-    split_index = len(resume_sections)
-    resume_embeddings = combined_embeddings[:split_index]
-    jd_embeddings = combined_embeddings[split_index:]
-
-    similarity_matrix = cosine_similarity(resume_embeddings, jd_embeddings)
-
-    heatmap = []
-    for i, resume_chunk in enumerate(resume_sections):
-        for j, jd_chunk in enumerate(jd_sections):
-            heatmap.append(
-                {
-                    "resume_index": i,
-                    "jd_index": j,
-                    "value": round(float(similarity_matrix[i][j]) * 100, 2),
-                    "resume_chunk": resume_chunk[:140],
-                    "jd_chunk": jd_chunk[:140],
-                }
-            )
-
-    return heatmap
-
-
-def top_matching_sections(heatmap_data: List[Dict], top_k: int = 5) -> List[Dict]:
-    ranked = sorted(heatmap_data, key=lambda x: x["value"], reverse=True)
-    return ranked[:top_k]
+        return [], []
+
+    # Cosine similarity without copying the (possibly wide) embedding matrices to normalise them.
+    resume_norms = row_norms(resume_embeddings)
+    jd_norms = row_norms(jd_embeddings)
+    resume_norms[resume_norms == 0] = 1.0
+    jd_norms[jd_norms == 0] = 1.0
+    jd_count = len(jd_sections)
+    row_k = min(row_top_k, jd_count)
+    block_rows = max(1, HEATMAP_BLOCK_CELLS // jd_count)
+
+    heatmap: List[Dict] = []
+    best_values = np.empty(0, dtype=np.float64)
+    best_cells = np.empty(0, dtype=np.int64)
+    for start in range(0, len(resume_sections), block_rows):
+        block = np.asarray(safe_sparse_dot(resume_embeddings[start : start + block_rows], jd_embeddings.T, dense_output=True), dtype=np.float64)
+        block /= resume_norms[start : start + block_rows, None]
+        block /= jd_norms[None, :]
+
+        if row_k < jd_count:
+            columns = np.argpartition(block, jd_count - row_k, axis=1)[:, jd_count - row_k :]
+        else:
+            columns = np.broadcast_to(np.arange(jd_count), block.shape)
+        values = np.take_along_axis(block, columns, axis=1)
+        order = np.argsort(-values, axis=1, kind="stable")
+        columns = np.take_along_axis(columns, order, axis=1).tolist()
+        values = np.round(np.take_along_axis(values, order, axis=1) * 100, 2).tolist()
+        for offset, (row_columns, row_values) in enumerate(zip(columns, values)):
+            for j, value in zip(row_columns, row_values):
+                heatmap.append({"resume_index": start + offset, "jd_index": j, "value": value})
+
+        flat = block.ravel()
+        picked = _top_indices(flat, top_k)
+        best_values = np.concatenate([best_values, flat[picked]])
+        best_cells = np.concatenate([best_cells, picked + start * jd_count])
+        keep = _top_indices(best_values, top_k)
+        best_values, best_cells = best_values[keep], best_cells[keep]
+
+    top_sections = []
+    # Highest first; ties keep document order like a stable sort of the full matrix would.
+    order = np.lexsort((best_cells, -best_values))
+    for cell, value in zip(best_cells[order].tolist(), best_values[order].tolist()):
+        i, j = divmod(cell, jd_count)
+        top_sections.append(
+            {
+                "resume_index": i,
+                "jd_index": j,
+                "value": round(value * 100, 2),
+                "resume_chunk": resume_sections[i][:HEATMAP_PREVIEW_CHARS],
+                "jd_chunk": jd_sections[j][:HEATMAP_PREVIEW_CHARS],
+            }
+        )
+    return heatmap, top_sections
 
 
 def build_strengths(overlap: List[str], score: float) -> List[str]:
@@ -0,0 +1,330 @@
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import Job, RoleProfile
+from .analysis_engine import comparison_item, run_batch_analysis
+from .analysis_store import persist_analysis
+from .analysis_tasks import analyze_texts
+from .candidate_store import upsert_candidate
+from .document_features import extract_document_features
+from .role_features import load_role_features
+from .task_pool import preload_models
+
+logger = logging.getLogger("talentalign")
+
+# Worker processes started with the API; 0 leaves jobs to workers run with `python -m app.services.jobs`.
+JOB_WORKERS = int(os.getenv("TALENTALIGN_JOB_WORKERS", "1"))
+JOB_LEASE_SECONDS = int(os.getenv("TALENTALIGN_JOB_LEASE_SECONDS", "60"))
+JOB_POLL_SECONDS = float(os.getenv("TALENTALIGN_JOB_POLL_SECONDS", "1"))
+JOB_MAX_ATTEMPTS = int(os.getenv("TALENTALIGN_JOB_MAX_ATTEMPTS", "3"))
+JOB_COMPARE_CHUNK = 8
+
+TERMINAL_STATUSES = {"succeeded", "failed"}
+
+
+class JobLeaseLost(Exception):
+    pass
+
+
+def enqueue_job(db: Session, owner_user_id: int, kind: str, payload: Dict, total: int = 0) -> Job:
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    now = datetime.utcnow()
+    job = Job(
+        owner_user_id=owner_user_id,
+        kind=kind,
+        status="queued",
+        payload=payload,
+        progress_total=total,
+        max_attempts=JOB_MAX_ATTEMPTS,
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def _claimable(now: datetime):
+    # Queued work, or running work whose worker stopped heartbeating (crashed, killed, or hung).
+    return or_(Job.status == "queued", and_(Job.status == "running", Job.lease_expires_at < now))
+
+
+def claim_next_job(db: Session, worker_id: str) -> Optional[int]:
+    """Take the oldest claimable job with a conditional UPDATE, so two workers can never both win it."""
+    now = datetime.utcnow()
+    for (job_id,) in db.query(Job.id).filter(_claimable(now)).order_by(Job.id).limit(5).all():
+        claimed = (
+            db.query(Job)
+            .filter(Job.id == job_id, _claimable(now))
+            .update(
+                {
+                    Job.status: "running",
+                    Job.lease_owner: worker_id,
+                    Job.lease_expires_at: now + timedelta(seconds=JOB_LEASE_SECONDS),
+                    Job.heartbeat_at: now,
+                    Job.attempts: Job.attempts + 1,
+                    Job.started_at: now,
+                    Job.updated_at: now,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        if claimed:
+            return job_id
+    return None
+
+
+def _update_owned(db: Session, job_id: int, worker_id: str, values: Dict) -> bool:
+    values = {**values, Job.updated_at: datetime.utcnow()}
+    updated = (
+        db.query(Job)
+        .filter(Job.id == job_id, Job.lease_owner == worker_id, Job.status == "running")
+        .update(values, synchronize_session=False)
+    )
+    if not updated:
+        db.rollback()
+        return False
+    db.commit()
+    return True
+
+
+def renew_lease(db: Session, job_id: int, worker_id: str) -> bool:
+    now = datetime.utcnow()
+    return _update_owned(
+        db, job_id, worker_id, {Job.lease_expires_at: now + timedelta(seconds=JOB_LEASE_SECONDS), Job.heartbeat_at: now}
+    )
+
+
+def _finish(db: Session, job_id: int, worker_id: str, status: str, **values) -> bool:
+    return _update_owned(
+        db,
+        job_id,
+        worker_id,
+        {
+            Job.status: status,
+            Job.lease_owner: None,
+            Job.lease_expires_at: None,
+            Job.finished_at: datetime.utcnow(),
+            **{getattr(Job, key): value for key, value in values.items()},
+        },
+    )
+
+
+class JobContext:
+    """Handed to a job handler: progress reporting plus a heartbeat that keeps the lease alive while it runs."""
+
+    def __init__(self, job_id: int, worker_id: str):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._db = SessionLocal()
+        self._heartbeat = threading.Thread(target=self._beat, name=f"job-{job_id}-heartbeat", daemon=True)
+
+    def __enter__(self):
+        self._heartbeat.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._heartbeat.join()
+        self._db.close()
+
+    def _beat(self):
+        while not self._stop.wait(max(1.0, JOB_LEASE_SECONDS / 3)):
+            with self._lock:
+                try:
+                    renewed = renew_lease(self._db, self.job_id, self.worker_id)
+                except Exception:
+                    # A busy database is not a lost lease; try again on the next beat.
+                    logger.exception("Heartbeat for job %s failed", self.job_id)
+                    self._db.rollback()
+                    continue
+                if not renewed:
+                    self.lost.set()
+                    return
+
+    def progress(self, done: int, total: Optional[int] = None, partial: Optional[Dict] = None):
+        values: Dict = {Job.progress_done: done}
+        if total is not None:
+            values[Job.progress_total] = total
+        if partial is not None:
+            values[Job.partial_result] = partial
+        with self._lock:
+            if self.lost.is_set() or not _update_owned(self._db, self.job_id, self.worker_id, values):
+                self.lost.set()
+                raise JobLeaseLost(f"Lease on job {self.job_id} was lost")
+
+
+def _run_analyze(db: Session, job: Job, ctx: JobContext) -> Dict:
+    payload = job.payload
+    ctx.progress(0, 1)
+    result, resume = analyze_texts(payload["resume_text"], payload["job_description"], payload["mode"])
+    result["input_metadata"] = {**payload.get("input_metadata", {}), **result.pop("metrics")}
+    record = persist_analysis(db, job.owner_user_id, payload["mode"], result, commit=False)
+    result["analysis_id"] = record.id
+    upsert_candidate(
+        db, job.owner_user_id, resume, candidate_name=payload.get("candidate_name"), analysis_id=record.id, commit=False
+    )
+    return result
+
+
+def _run_compare_roles(db: Session, job: Job, ctx: JobContext) -> Dict:
+    payload = job.payload
+    mode = payload["mode"]
+    candidate_name = payload.get("candidate_name")
+
+    targets = []
+    role_ids = payload.get("role_ids") or []
+    if role_ids:
+        roles = (
+            db.query(RoleProfile)
+            .filter(RoleProfile.owner_user_id == job.owner_user_id, RoleProfile.id.in_(role_ids))
+            .all()
+        )
+        role_features = load_role_features(db, roles)
+        targets.extend((role.id, role.title, role_features[role.id]) for role in roles)
+    for adhoc in payload.get("adhoc") or []:
+        targets.append((None, adhoc["title"], extract_document_features(adhoc["jd_text"])))
+
+    resume = extract_document_features(payload["resume_text"])
+    ctx.progress(0, len(targets))
+    ranked: List[Dict] = []
+    for start in range(0, len(targets), JOB_COMPARE_CHUNK):
+        chunk = targets[start : start + JOB_COMPARE_CHUNK]
+        analyses = run_batch_analysis(resume, [jd for _, _, jd in chunk], mode=mode)
+        for (role_id, title, _), analysis in zip(chunk, analyses):
+            ranked.append(comparison_item(role_id, title, analysis, mode, candidate_name))
+        ranked.sort(key=lambda item: item["score"], reverse=True)
+        partial = [{key: value for key, value in item.items() if key != "analysis_payload"} for item in ranked]
+        ctx.progress(len(ranked), partial={"ranked": partial})
+
+    upsert_candidate(db, job.owner_user_id, resume, candidate_name=candidate_name, commit=False)
+    return {"ranked": ranked}
+
+
+JOB_HANDLERS: Dict[str, Callable[[Session, Job, JobContext], Dict]] = {
+    "analyze": _run_analyze,
+    "compare_roles": _run_compare_roles,
+}
+
+
+def process_next_job(worker_id: str) -> bool:
+    """Claim and run one job. Returns False when there was nothing to claim."""
+    db = SessionLocal()
+    try:
+        job_id = claim_next_job(db, worker_id)
+        if job_id is None:
+            return False
+        job = db.get(Job, job_id)
+        if job.attempts > job.max_attempts:
+            _finish(db, job_id, worker_id, "failed", error=f"Gave up after {job.max_attempts} attempts; the worker kept stopping")
+            return True
+
+        with JobContext(job_id, worker_id) as ctx:
+            try:
+                result = JOB_HANDLERS[job.kind](db, job, ctx)
+            except JobLeaseLost:
+                db.rollback()
+                logger.warning("Job %s lease lost by %s; leaving it to the new owner", job_id, worker_id)
+                return True
+            except Exception as exc:
+                db.rollback()
+                logger.exception("Job %s failed", job_id)
+                _finish(db, job_id, worker_id, "failed", error=str(exc) or exc.__class__.__name__)
+                return True
+            # Results and the job's completion commit together, so a crash never leaves half-stored output.
+            if ctx.lost.is_set() or not _finish(db, job_id, worker_id, "succeeded", result=result, progress_done=Job.progress_total):
+                logger.warning("Job %s lease lost by %s before completion", job_id, worker_id)
+        return True
+    finally:
+        db.close()
+
+
+def run_worker(stop: Optional[threading.Event] = None, worker_id: Optional[str] = None):
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+    stop = stop or threading.Event()
+    preload_models()
+    logger.info("Job worker %s started", worker_id)
+    while not stop.is_set():
+        try:
+            if not process_next_job(worker_id):
+                stop.wait(JOB_POLL_SECONDS)
+        except Exception:
+            logger.exception("Job worker %s loop error", worker_id)
+            stop.wait(JOB_POLL_SECONDS)
+
+
+class _WorkerSupervisor:
+    """Keeps JOB_WORKERS local worker processes alive; a crashed worker is replaced and its job re-leased."""
+
+    def __init__(self, count: int):
+        self.count = count
+        self.processes: List[multiprocessing.Process] = []
+        self._context = multiprocessing.get_context("spawn")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _spawn(self) -> multiprocessing.Process:
+        process = self._context.Process(target=run_worker, name="talentalign-job-worker", daemon=True)
+        process.start()
+        return process
+
+    def _watch(self):
+        while not self._stop.wait(5):
+            for index, process in enumerate(self.processes):
+                if not process.is_alive() and not self._stop.is_set():
+                    logger.warning("Job worker %s exited with %s; restarting", process.pid, process.exitcode)
+                    self.processes[index] = self._spawn()
+
+    def start(self):
+        self.processes = [self._spawn() for _ in range(self.count)]
+        self._thread = threading.Thread(target=self._watch, name="job-supervisor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(timeout=5)
+
+
+_supervisor: Optional[_WorkerSupervisor] = None
+
+
+def start_job_workers() -> Optional[_WorkerSupervisor]:
+    global _supervisor
+    if JOB_WORKERS <= 0 or _supervisor is not None:
+        return _supervisor
+    _supervisor = _WorkerSupervisor(JOB_WORKERS)
+    _supervisor.start()
+    return _supervisor
+
+
+def stop_job_workers():
+    global _supervisor
+    if _supervisor is not None:
+        _supervisor.stop()
+        _supervisor = None
+
+
+if __name__ == "__main__":
+    from app.services.jobs import run_worker as _run_worker
+
+    logging.basicConfig(level=logging.INFO)
+    _run_worker()
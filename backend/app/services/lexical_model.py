@@ -0,0 +1,213 @@
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+try:
+    import fcntl
+except ImportError:  # Windows: every worker runs its own refresher there
+    fcntl = None
+
+logger = logging.getLogger("talentalign")
+
+LEXICAL_MODEL_PATH = os.getenv("TALENTALIGN_LEXICAL_MODEL_PATH", "./talentalign_lexical.pkl")
+LEXICAL_MIN_DOCUMENTS = int(os.getenv("TALENTALIGN_LEXICAL_MIN_DOCUMENTS", "20"))
+LEXICAL_MAX_FEATURES = 5000
+LEXICAL_SVD_MIN_DOCUMENTS = int(os.getenv("TALENTALIGN_LEXICAL_SVD_MIN_DOCUMENTS", "500"))
+LEXICAL_SVD_COMPONENTS = 256
+# 0 disables the in-process refresher; the model can still be fitted offline with `python -m app.services.lexical_model`.
+LEXICAL_REFRESH_SECONDS = int(os.getenv("TALENTALIGN_LEXICAL_REFRESH_SECONDS", "0"))
+LEXICAL_RELOAD_CHECK_SECONDS = 5.0
+
+
+class LexicalModel:
+    """TF-IDF (optionally LSA-projected) model fitted once on the stored corpus; request time only transforms."""
+
+    def __init__(self, vectorizer: TfidfVectorizer, svd: Optional[TruncatedSVD], n_documents: int):
+        self.vectorizer = vectorizer
+        self.svd = svd
+        self.n_documents = n_documents
+        self.fitted_at = datetime.utcnow()
+        self.model_id = f"tfidf:{self._fingerprint()}"
+
+    def _fingerprint(self) -> str:
+        digest = hashlib.sha256()
+        digest.update("\n".join(sorted(self.vectorizer.vocabulary_)).encode("utf-8"))
+        digest.update(self.vectorizer.idf_.tobytes())
+        if self.svd is not None:
+            digest.update(self.svd.components_.tobytes())
+        return digest.hexdigest()[:16]
+
+    @property
+    def dimensions(self) -> int:
+        if self.svd is not None:
+            return int(self.svd.n_components)
+        return len(self.vectorizer.vocabulary_)
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        matrix = self.vectorizer.transform(texts)
+        if self.svd is not None:
+            matrix = self.svd.transform(matrix)
+        else:
+            matrix = matrix.toarray()
+        return normalize(matrix.astype(np.float32), norm="l2", axis=1)
+
+
+def fit_lexical_model(documents: Iterable[str]) -> Optional[LexicalModel]:
+    corpus = [doc for doc in dict.fromkeys(d.strip() for d in documents) if doc]
+    if len(corpus) < LEXICAL_MIN_DOCUMENTS:
+        return None
+
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2), max_features=LEXICAL_MAX_FEATURES, sublinear_tf=True)
+    matrix = vectorizer.fit_transform(corpus)
+
+    svd = None
+    n_components = min(LEXICAL_SVD_COMPONENTS, matrix.shape[1] - 1)
+    if len(corpus) >= LEXICAL_SVD_MIN_DOCUMENTS and n_components > 1:
+        svd = TruncatedSVD(n_components=n_components, random_state=0)
+        svd.fit(matrix)
+
+    return LexicalModel(vectorizer, svd, len(corpus))
+
+
+def save_lexical_model(model: LexicalModel, path: str = LEXICAL_MODEL_PATH):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as handle:
+        pickle.dump(model, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    # Atomic swap so concurrent readers never see a half-written model.
+    os.replace(tmp_path, path)
+
+
+def load_training_corpus(db) -> List[str]:
+    from ..models import CandidateProfile, RoleProfile
+
+    # Whole documents, the same kind of text the model later embeds: every stored JD and every stored resume.
+    documents = [row.jd_text for row in db.query(RoleProfile.jd_text).all()]
+    documents.extend(resume_text for (resume_text,) in db.query(CandidateProfile.resume_text).yield_per(500))
+    return documents
+
+
+class _LexicalModelHolder:
+    def __init__(self, path: str):
+        self.path = path
+        self.model: Optional[LexicalModel] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[LexicalModel]:
+        now = time.monotonic()
+        if now - self._checked_at < LEXICAL_RELOAD_CHECK_SECONDS:
+            return self.model
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError:
+                return self.model
+            if mtime != self._mtime:
+                try:
+                    with open(self.path, "rb") as handle:
+                        self.model = pickle.load(handle)
+                    self._mtime = mtime
+                    logger.info("Loaded lexical model %s from %s", self.model.model_id, self.path)
+                except Exception:
+                    logger.exception("Failed to load lexical model from %s", self.path)
+            return self.model
+
+    def swap(self, model: LexicalModel):
+        with self._lock:
+            self.model = model
+            self._checked_at = time.monotonic()
+            try:
+                self._mtime = os.stat(self.path).st_mtime
+            except OSError:
+                self._mtime = None
+
+
+_holder = _LexicalModelHolder(LEXICAL_MODEL_PATH)
+
+
+def get_lexical_model() -> Optional[LexicalModel]:
+    return _holder.get()
+
+
+def refresh_lexical_model() -> Optional[LexicalModel]:
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        corpus = load_training_corpus(db)
+    finally:
+        db.close()
+
+    model = fit_lexical_model(corpus)
+    if model is None:
+        logger.info("Lexical model not fitted: corpus has fewer than %s documents", LEXICAL_MIN_DOCUMENTS)
+        return None
+    current = _holder.get()
+    if current is not None and current.model_id == model.model_id:
+        return current
+
+    save_lexical_model(model, _holder.path)
+    _holder.swap(model)
+    logger.info("Fitted lexical model %s on %s documents", model.model_id, model.n_documents)
+    return model
+
+
+_refresher_lock = None
+
+
+def _elect_refresher() -> bool:
+    """
+    Every uvicorn worker starts a refresher, but only the one holding this lock refits; the others pick the new
+    model up from disk. The lock is held for the life of the process, so another worker takes over if it exits.
+    """
+    global _refresher_lock
+    if _refresher_lock is not None or fcntl is None:
+        return True
+    handle = open(f"{_holder.path}.refresh.lock", "a")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return False
+    _refresher_lock = handle
+    logger.info("Process %s refreshes the lexical model", os.getpid())
+    return True
+
+
+def start_lexical_refresher() -> Optional[threading.Thread]:
+    if LEXICAL_REFRESH_SECONDS <= 0:
+        return None
+
+    def _loop():
+        while True:
+            try:
+                if _elect_refresher():
+                    refresh_lexical_model()
+            except Exception:
+                logger.exception("Lexical model refresh failed")
+            time.sleep(LEXICAL_REFRESH_SECONDS)
+
+    thread = threading.Thread(target=_loop, name="lexical-model-refresher", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    # Re-import through the package so the pickled class path is app.services.lexical_model, not __main__.
+    from app.services import lexical_model
+
+    logging.basicConfig(level=logging.INFO)
+    fitted = lexical_model.refresh_lexical_model()
+    print(fitted.model_id if fitted else "corpus too small; no model written")
@@ -0,0 +1,276 @@
+import atexit
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("talentalign")
+
+# When set, each process (API workers, task-pool and job workers) snapshots its metrics into this directory and a
+# scrape sums them; multi-process deployments should point it at a private tmp dir. Unset reports only the process
+# that serves the scrape.
+METRICS_DIR = os.getenv("TALENTALIGN_METRICS_DIR", "")
+METRICS_FLUSH_SECONDS = float(os.getenv("TALENTALIGN_METRICS_FLUSH_SECONDS", "5"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help_text: str, labelnames: Sequence[str]):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[LabelValues, object] = {}
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+        self.registry.touch()
+
+
+class Gauge(_Metric):
+    """Summed across live processes; a process that exits stops contributing."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self.registry.lock:
+            self.values[self._key(labels)] = float(value)
+        self.registry.touch()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+        self.registry.touch()
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name, help_text, labelnames, buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(registry, name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.registry.lock:
+            # [per-bucket counts (last is +Inf), sum]
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+        self.registry.touch()
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+
+class MetricsRegistry:
+    def __init__(self, directory: Optional[str], flush_seconds: float):
+        self.directory = Path(directory) if directory else None
+        self.flush_seconds = flush_seconds
+        self.lock = threading.Lock()
+        self.metrics: Dict[str, _Metric] = {}
+        # Called at snapshot time to refresh gauges that mirror other components (cache sizes, queue depth).
+        self.collectors: List[Callable[[], None]] = []
+        self._flusher_pid: Optional[int] = None
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(self, name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, help_text, labelnames, buckets))
+
+    def _register(self, metric):
+        with self.lock:
+            return self.metrics.setdefault(metric.name, metric)
+
+    def touch(self):
+        # Every process that records anything gets one flusher thread, started on first use.
+        if self.directory is None or self._flusher_pid == os.getpid():
+            return
+        with self.lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True).start()
+        atexit.register(self.flush)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Metrics flush failed")
+
+    def snapshot(self) -> Dict:
+        for collect in self.collectors:
+            try:
+                collect()
+            except Exception:
+                logger.exception("Metrics collector failed")
+        with self.lock:
+            return {
+                name: [[list(key), _copy(value)] for key, value in metric.values.items()]
+                for name, metric in self.metrics.items()
+            }
+
+    def flush(self):
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{os.getpid()}.json"
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"pid": os.getpid(), "metrics": self.snapshot()}))
+        os.replace(tmp, path)
+
+    def remove_stale(self):
+        """Drop snapshots of processes that no longer exist (left over from a previous run)."""
+        if self.directory is None or not self.directory.exists():
+            return
+        for path in self.directory.glob("*.json"):
+            if path.stem.isdigit() and not _pid_alive(int(path.stem)):
+                path.unlink(missing_ok=True)
+
+    def _snapshots(self) -> List[Tuple[bool, Dict]]:
+        own = (True, self.snapshot())
+        if self.directory is None or not self.directory.exists():
+            return [own]
+        snapshots = [own]
+        for path in self.directory.glob("*.json"):
+            if not path.stem.isdigit() or int(path.stem) == os.getpid():
+                continue
+            try:
+                snapshots.append((_pid_alive(int(path.stem)), json.loads(path.read_text())["metrics"]))
+            except (OSError, ValueError, KeyError):
+                continue
+        return snapshots
+
+    def render(self) -> str:
+        """All processes' metrics merged, in the Prometheus text exposition format."""
+        merged: Dict[str, Dict[LabelValues, object]] = {name: {} for name in self.metrics}
+        for alive, snapshot in self._snapshots():
+            for name, samples in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None or (metric.kind == "gauge" and not alive):
+                    continue
+                target = merged[name]
+                for key, value in samples:
+                    key = tuple(key)
+                    if metric.kind == "histogram":
+                        state = target.setdefault(key, [[0] * len(value[0]), 0.0])
+                        state[0] = [a + b for a, b in zip(state[0], value[0])]
+                        state[1] += value[1]
+                    else:
+                        target[key] = target.get(key, 0.0) + value
+
+        lines: List[str] = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for key, value in sorted(merged[name].items()):
+                labels = list(zip(metric.labelnames, key))
+                if metric.kind != "histogram":
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip([*metric.buckets, float("inf")], value[0]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels([*labels, ('le', _number(bound))])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(value[1])}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _copy(value):
+    return [list(value[0]), value[1]] if isinstance(value, list) else value
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+REGISTRY = MetricsRegistry(METRICS_DIR or None, METRICS_FLUSH_SECONDS)
+
+HTTP_REQUESTS = REGISTRY.counter("talentalign_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+HTTP_LATENCY = REGISTRY.histogram("talentalign_http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+HTTP_IN_PROGRESS = REGISTRY.gauge("talentalign_http_requests_in_progress", "HTTP requests being served.", ("method",))
+STAGE_LATENCY = REGISTRY.histogram("talentalign_analysis_stage_seconds", "Time spent per analysis pipeline stage.", ("stage",))
+EMBED_LATENCY = REGISTRY.histogram("talentalign_embedding_seconds", "Embedding call latency by backend.", ("backend",))
+EMBEDDED_TEXTS = REGISTRY.counter("talentalign_embedded_texts_total", "Texts embedded by backend.", ("backend",))
+ROWS_CREATED = REGISTRY.counter("talentalign_rows_created_total", "Rows inserted, counted on write.", ("table",))
+COMPONENT_STATS = REGISTRY.gauge("talentalign_component_stat", "Cache and pool statistics per process.", ("component", "stat"))
+
+
+def count_inserts(base):
+    """Count inserted rows per table as they are written, so nothing has to COUNT(*) whole tables on a scrape."""
+    from sqlalchemy import event
+
+    def _after_insert(mapper, connection, target):
+        ROWS_CREATED.inc(table=mapper.local_table.name)
+
+    event.listen(base, "after_insert", _after_insert, propagate=True)
+
+
+def register_collector(collect: Callable[[], None]):
+    REGISTRY.collectors.append(collect)
+
+
+def export_stats(component: str, stats: Dict[str, float]):
+    for stat, value in stats.items():
+        COMPONENT_STATS.set(value, component=component, stat=stat)
@@ -0,0 +1,131 @@
+import asyncio
+import math
+import os
+from typing import Dict, List, Optional, Tuple, Union
+
+from fastapi import HTTPException, UploadFile
+
+from ..database import SessionLocal
+from ..models import RoleProfile
+from .analysis_tasks import embed_documents, pair_similarities, prepare_resume, prepare_roles, score_against
+from .candidate_store import (
+    CANDIDATE_BATCH_SIZE,
+    candidate_features,
+    candidates_missing_vectors,
+    save_candidate_vectors,
+    similarity_keys,
+)
+from .document_features import DocumentFeatures
+from .embedding_engine import embedding_model_id
+from .result_cache import get_result_cache
+from .resume_parser import extract_text_from_upload
+from .role_features import save_role_features, split_role_features
+from .task_pool import TaskPoolUnavailable, TaskTimeout, get_task_pool
+
+# Helpers async routes share to keep CPU-bound and blocking database work off the event loop.
+
+# Comparisons with more roles than this are split into one chunk per task-pool worker.
+COMPARE_MIN_CHUNK = int(os.getenv("TALENTALIGN_COMPARE_MIN_CHUNK", "8"))
+
+
+def parse_mode(analysis_mode: str) -> str:
+    mode = analysis_mode.strip().lower()
+    if mode not in {"standard", "strict"}:
+        raise HTTPException(status_code=400, detail="analysis_mode must be 'standard' or 'strict'")
+    return mode
+
+
+async def offload(fn, *args):
+    try:
+        return await get_task_pool().run(fn, *args)
+    except TaskPoolUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "5"}) from exc
+    except TaskTimeout as exc:
+        raise HTTPException(status_code=504, detail=str(exc)) from exc
+
+
+async def parse_upload(file: UploadFile) -> str:
+    try:
+        return await extract_text_from_upload(file)
+    except TaskPoolUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "5"}) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+async def in_session(fn, *args, **kwargs):
+    """Run blocking database work on a worker thread, through a session of its own."""
+
+    def run():
+        session = SessionLocal()
+        try:
+            return fn(session, *args, **kwargs)
+        finally:
+            session.close()
+
+    return await asyncio.to_thread(run)
+
+
+async def gather_role_features(roles: List[RoleProfile]) -> Dict[int, DocumentFeatures]:
+    """Stored features per role; stale ones are rebuilt in the task pool with a single encode, then saved."""
+    loaded, stale = await in_session(split_role_features, roles)
+    if stale:
+        fresh = await offload(prepare_roles, [role.jd_text for role in stale])
+        await in_session(save_role_features, stale, fresh)
+        loaded.update(zip((role.id for role in stale), fresh))
+    return loaded
+
+
+async def _offload_batches(fn, head: tuple, items: list) -> list:
+    """fn(*head, batch) over CANDIDATE_BATCH_SIZE slices of items, one wave per pool worker at a time."""
+    batches = [items[i : i + CANDIDATE_BATCH_SIZE] for i in range(0, len(items), CANDIDATE_BATCH_SIZE)]
+    width = max(1, get_task_pool().workers)
+    results: list = []
+    for start in range(0, len(batches), width):
+        for part in await asyncio.gather(*(offload(fn, *head, batch) for batch in batches[start : start + width])):
+            results.extend(part)
+    return results
+
+
+async def candidate_similarities(owner_user_id: int, role: DocumentFeatures) -> Optional[Dict[int, float]]:
+    """
+    Prepare a role's candidate ranking so every candidate is scored the way /match/analyze scores the pair.
+    With a stable model, candidates missing its vectors are embedded in the task pool and saved, and None is
+    returned (ranking uses the stored vectors). On the ad-hoc TF-IDF fallback each pair is fitted on its own,
+    so the similarities are computed per pair in the pool, cached per pair, and returned by candidate id.
+    """
+    if embedding_model_id() is not None:
+        candidate_ids, pending = await in_session(candidates_missing_vectors, owner_user_id)
+        if candidate_ids:
+            await in_session(save_candidate_vectors, candidate_ids, await _offload_batches(embed_documents, (), pending))
+        return None
+
+    keys = await in_session(similarity_keys, owner_user_id, role)
+    result_cache = get_result_cache()
+    cached = await asyncio.to_thread(result_cache.get_many, keys.values())
+    similarities = {candidate_id: cached[key] for candidate_id, key in keys.items() if key in cached}
+    missing = [candidate_id for candidate_id in keys if candidate_id not in similarities]
+    if missing:
+        candidate_ids, pending = await in_session(candidate_features, missing)
+        fresh = dict(zip(candidate_ids, await _offload_batches(pair_similarities, (role,), pending)))
+        similarities.update(fresh)
+        await asyncio.to_thread(result_cache.set_many, {keys[candidate_id]: value for candidate_id, value in fresh.items()})
+    return similarities
+
+
+async def score_roles(
+    resume: Union[str, DocumentFeatures],
+    jds: List[Union[str, DocumentFeatures]],
+    mode: str,
+) -> Tuple[List[Dict], DocumentFeatures]:
+    """
+    score_against spread over the task pool. The resume is parsed and embedded once; the JDs are then split into
+    one chunk per worker, each chunk embedding its JDs in a single batch and scoring them, in the order of `jds`.
+    """
+    size = max(COMPARE_MIN_CHUNK, math.ceil(len(jds) / max(1, get_task_pool().workers)))
+    if len(jds) <= size:
+        return await offload(score_against, resume, jds, mode)
+    if isinstance(resume, str):
+        resume = await offload(prepare_resume, resume)
+    parts = await asyncio.gather(*(offload(score_against, resume, jds[i : i + size], mode) for i in range(0, len(jds), size)))
+    return [analysis for analyses, _ in parts for analysis in analyses], resume
@@ -0,0 +1,204 @@
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request
+
+from ..auth import get_current_user
+from ..models import User
+
+logger = logging.getLogger("talentalign")
+
+# Buckets live in this SQLite file so every worker process draws from the same budget; empty keeps them in-process.
+RATE_LIMIT_PATH = os.getenv("TALENTALIGN_RATE_LIMIT_PATH", "./talentalign_ratelimit.db")
+RATE_LIMIT_DEFAULT = os.getenv("TALENTALIGN_RATE_LIMIT_DEFAULT", "30/60")
+# Per-scope overrides as "scope=requests/seconds" pairs, e.g. "match.bulk_screen=2/60,auth=10/60";
+# "*" applies to every scope without its own override. Client-address scopes ("auth", "share.read") are only
+# limited when named here, since many users can share one address behind a proxy.
+RATE_LIMIT_OVERRIDES = os.getenv("TALENTALIGN_RATE_LIMITS", "")
+RATE_LIMIT_SWEEP_SECONDS = 60.0
+
+DEFAULT_SCOPE_LIMITS = {
+    # One budget shared by every /match endpoint; bulk screening also has its own, tighter cap.
+    "match": "30/60",
+    "match.bulk_screen": "5/60",
+    "roles.create": "30/60",
+    "interview_kit.generate": "30/60",
+    "share.create": "30/60",
+}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    capacity: float
+    period_seconds: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period_seconds
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimit":
+        requests, _, seconds = spec.strip().partition("/")
+        limit = cls(float(requests), float(seconds or 60))
+        if limit.capacity <= 0 or limit.period_seconds <= 0:
+            raise ValueError(f"Invalid rate limit: {spec!r}")
+        return limit
+
+
+def _parse_overrides(raw: str) -> Dict[str, str]:
+    overrides = {}
+    for item in raw.split(","):
+        scope, _, spec = item.partition("=")
+        if scope.strip() and spec.strip():
+            overrides[scope.strip()] = spec.strip()
+    return overrides
+
+
+def limit_for(scope: str) -> RateLimit:
+    overrides = _parse_overrides(RATE_LIMIT_OVERRIDES)
+    spec = overrides.get(scope) or overrides.get("*") or DEFAULT_SCOPE_LIMITS.get(scope) or RATE_LIMIT_DEFAULT
+    return RateLimit.parse(spec)
+
+
+def _take(tokens: float, updated_at: float, now: float, limit: RateLimit) -> Tuple[float, float]:
+    """Refill a bucket up to `now` and spend one token. Returns (tokens_left, retry_after); retry_after 0 means allowed."""
+    tokens = min(limit.capacity, tokens + max(0.0, now - updated_at) * limit.refill_per_second)
+    if tokens >= 1.0:
+        return tokens - 1.0, 0.0
+    return tokens, (1.0 - tokens) / limit.refill_per_second
+
+
+def _full_at(tokens: float, now: float, limit: RateLimit) -> float:
+    # A bucket that has refilled completely is indistinguishable from a missing one, so it can be dropped.
+    return now + (limit.capacity - tokens) / limit.refill_per_second
+
+
+class MemoryBucketStore:
+    def __init__(self):
+        # Ordered by last use; the front holds the longest-idle buckets.
+        self._buckets: "OrderedDict[str, Tuple[float, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: RateLimit, now: float) -> float:
+        with self._lock:
+            tokens, updated_at, _ = self._buckets.pop(key, (limit.capacity, now, now))
+            tokens, retry_after = _take(tokens, updated_at, now, limit)
+            self._buckets[key] = (tokens, now, _full_at(tokens, now, limit))
+            while self._buckets:
+                oldest = next(iter(self._buckets))
+                if self._buckets[oldest][2] > now:
+                    break
+                del self._buckets[oldest]
+            return retry_after
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class SqliteBucketStore:
+    """One row per bucket; each check is a primary-key read and write inside a single immediate transaction."""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, full_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_buckets_full_at ON rate_buckets (full_at)")
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def take(self, key: str, limit: RateLimit, now: float) -> float:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT tokens, updated_at FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+                tokens, updated_at = row if row else (limit.capacity, now)
+                tokens, retry_after = _take(tokens, updated_at, now, limit)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (key, tokens, updated_at, full_at) VALUES (?, ?, ?, ?)",
+                    (key, tokens, now, _full_at(tokens, now, limit)),
+                )
+                if now >= self._next_sweep:
+                    self._next_sweep = now + RATE_LIMIT_SWEEP_SECONDS
+                    self._conn.execute("DELETE FROM rate_buckets WHERE full_at <= ?", (now,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return retry_after
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM rate_buckets").fetchone()[0]
+
+
+class RateLimiter:
+    def __init__(self, path: Optional[str]):
+        self.store = MemoryBucketStore()
+        if path:
+            try:
+                self.store = SqliteBucketStore(path)
+            except sqlite3.Error:
+                logger.exception("Rate limit store %s unavailable; limiting per process", path)
+        self._limits: Dict[str, RateLimit] = {}
+
+    def check(self, scope: str, identity: str) -> float:
+        """Spend one request from `identity`'s bucket for `scope`. Returns seconds to wait, 0 when allowed."""
+        limit = self._limits.get(scope)
+        if limit is None:
+            limit = self._limits.setdefault(scope, limit_for(scope))
+        try:
+            return self.store.take(f"{scope}:{identity}", limit, time.time())
+        except sqlite3.Error:
+            # A locked or broken store must not take the API down with it.
+            logger.warning("Rate limit check for %s failed; allowing request", scope, exc_info=True)
+            return 0.0
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> RateLimiter:
+    return RateLimiter(RATE_LIMIT_PATH or None)
+
+
+def _reject(scope: str, retry_after: float):
+    raise HTTPException(
+        status_code=429,
+        detail=f"Rate limit exceeded for {scope}",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def rate_limit(scope: str):
+    """Route dependency limiting the authenticated user on `scope`."""
+
+    def dependency(current_user: User = Depends(get_current_user)):
+        retry_after = get_rate_limiter().check(scope, f"user:{current_user.id}")
+        if retry_after:
+            _reject(scope, retry_after)
+
+    return dependency
+
+
+def rate_limit_by_client(scope: str):
+    """Route dependency for unauthenticated endpoints, limiting by client address when the scope is configured."""
+    if scope not in _parse_overrides(RATE_LIMIT_OVERRIDES):
+        return lambda: None
+
+    def dependency(request: Request):
+        client = request.client.host if request.client else "unknown"
+        retry_after = get_rate_limiter().check(scope, f"ip:{client}")
+        if retry_after:
+            _reject(scope, retry_after)
+
+    return dependency
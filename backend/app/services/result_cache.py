@@ -0,0 +1,252 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from .metrics import export_stats, register_collector
+
+logger = logging.getLogger("talentalign")
+
+RESULT_CACHE_MEMORY_MB = float(os.getenv("TALENTALIGN_RESULT_CACHE_MEMORY_MB", "32"))
+RESULT_CACHE_DISK_MB = float(os.getenv("TALENTALIGN_RESULT_CACHE_DISK_MB", "256"))
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("TALENTALIGN_RESULT_CACHE_TTL_SECONDS", "300"))
+# Shared tier every worker process reads and writes; empty keeps the cache in-process only.
+RESULT_CACHE_PATH = os.getenv("TALENTALIGN_RESULT_CACHE_PATH", "./talentalign_results.db")
+RESULT_CACHE_SWEEP_SECONDS = 60.0
+
+
+def content_key(namespace: str, *parts: Any) -> str:
+    """Key derived from the full content of every input, so changed inputs can never hit a stale entry."""
+    digest = hashlib.sha256(namespace.encode("utf-8"))
+    for part in parts:
+        if not isinstance(part, (str, bytes)):
+            part = json.dumps(part, sort_keys=True, default=str)
+        if isinstance(part, str):
+            part = part.encode("utf-8", errors="ignore")
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return f"{namespace}:{digest.hexdigest()}"
+
+
+def _encode(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), 3)
+
+
+def _decode(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+
+class ResultCache:
+    """
+    JSON-serialisable results under content-hash keys, with a byte-bounded in-process LRU tier in front of
+    an optional SQLite tier shared by all worker processes. Entries expire after their TTL in both tiers.
+    Values are stored encoded, so callers always get their own copy back.
+    """
+
+    def __init__(self, memory_bytes: int, disk_bytes: int, ttl_seconds: float, path: Optional[str]):
+        self.memory_bytes = max(0, memory_bytes)
+        self.disk_bytes = max(0, disk_bytes)
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, blob)
+        self._memory: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "expirations": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_used = 0
+        self._next_sweep = 0.0
+        if path and self.disk_bytes:
+            try:
+                self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                    "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+                )
+                self._conn.execute("CREATE INDEX IF NOT EXISTS ix_results_last_access ON results (last_access)")
+                self._conn.execute("CREATE INDEX IF NOT EXISTS ix_results_expires_at ON results (expires_at)")
+                self._disk_used = self._disk_size()
+            except sqlite3.Error:
+                logger.exception("Result cache store %s unavailable; caching per process", path)
+                self._conn = None
+
+    def _disk_size(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def _remember(self, key: str, expires_at: float, blob: bytes):
+        if len(blob) > self.memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_used -= len(previous[1])
+        self._memory[key] = (expires_at, blob)
+        self._memory_used += len(blob)
+        while self._memory_used > self.memory_bytes:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted)
+            self._stats["memory_evictions"] += 1
+
+    def _forget(self, key: str):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_used -= len(entry[1])
+
+    def _disk_get(self, keys: Iterable[str], now: float) -> Dict[str, Tuple[float, bytes]]:
+        keys = list(keys)
+        if self._conn is None or not keys:
+            return {}
+        found: Dict[str, Tuple[float, bytes]] = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ",".join("?" for _ in chunk)
+            rows = self._conn.execute(
+                f"SELECT key, value, expires_at FROM results WHERE key IN ({placeholders}) AND expires_at > ?",
+                [*chunk, now],
+            ).fetchall()
+            for key, blob, expires_at in rows:
+                found[key] = (expires_at, blob)
+        if found:
+            self._conn.executemany("UPDATE results SET last_access = ? WHERE key = ?", [(now, key) for key in found])
+        return found
+
+    def _disk_put(self, items: Dict[str, Tuple[float, bytes]], now: float):
+        if self._conn is None or not items:
+            return
+        rows = [(key, blob, len(blob), expires_at, now) for key, (expires_at, blob) in items.items() if len(blob) <= self.disk_bytes]
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO results (key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)", rows
+        )
+        self._disk_used += sum(row[2] for row in rows)
+        if now >= self._next_sweep:
+            self._next_sweep = now + RESULT_CACHE_SWEEP_SECONDS
+            expired = self._conn.execute("DELETE FROM results WHERE expires_at <= ?", (now,)).rowcount
+            self._stats["expirations"] += max(0, expired)
+            self._disk_used = self._disk_size()
+        if self._disk_used > self.disk_bytes:
+            # Other workers write here too, so re-measure before evicting; then trim to 95% to avoid evicting per insert.
+            self._disk_used = self._disk_size()
+            target = int(self.disk_bytes * 0.95)
+            while self._disk_used > target:
+                victims = self._conn.execute(
+                    "SELECT key, size FROM results ORDER BY last_access LIMIT 64"
+                ).fetchall()
+                if not victims:
+                    break
+                self._conn.executemany("DELETE FROM results WHERE key = ?", [(key,) for key, _ in victims])
+                self._disk_used -= sum(size for _, size in victims)
+                self._stats["disk_evictions"] += len(victims)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        now = time.time()
+        blobs: Dict[str, bytes] = {}
+        with self._lock:
+            pending = []
+            for key in dict.fromkeys(keys):
+                entry = self._memory.get(key)
+                if entry is not None and entry[0] <= now:
+                    self._forget(key)
+                    self._stats["expirations"] += 1
+                    entry = None
+                if entry is None:
+                    pending.append(key)
+                    continue
+                self._memory.move_to_end(key)
+                blobs[key] = entry[1]
+                self._stats["memory_hits"] += 1
+            try:
+                stored = self._disk_get(pending, now)
+            except sqlite3.Error:
+                logger.warning("Result cache read failed", exc_info=True)
+                stored = {}
+            for key, (expires_at, blob) in stored.items():
+                self._remember(key, expires_at, blob)
+                blobs[key] = blob
+                self._stats["disk_hits"] += 1
+            self._stats["misses"] += len(pending) - len(stored)
+        return {key: _decode(blob) for key, blob in blobs.items()}
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key]).get(key)
+
+    def set_many(self, values: Dict[str, Any], ttl_seconds: Optional[float] = None):
+        now = time.time()
+        expires_at = now + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        encoded = {key: (expires_at, _encode(value)) for key, value in values.items()}
+        with self._lock:
+            for key, (_, blob) in encoded.items():
+                self._remember(key, expires_at, blob)
+            try:
+                self._disk_put(encoded, now)
+            except sqlite3.Error:
+                logger.warning("Result cache write failed", exc_info=True)
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        self.set_many({key: value}, ttl_seconds)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._stats,
+                "memory_items": len(self._memory),
+                "memory_bytes": self._memory_used,
+                "memory_capacity_bytes": self.memory_bytes,
+                "disk_bytes": self._disk_used if self._conn is not None else 0,
+                "disk_capacity_bytes": self.disk_bytes if self._conn is not None else 0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_used = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM results")
+                self._disk_used = 0
+
+
+@lru_cache(maxsize=1)
+def get_result_cache() -> ResultCache:
+    cache = ResultCache(
+        int(RESULT_CACHE_MEMORY_MB * 1024 * 1024),
+        int(RESULT_CACHE_DISK_MB * 1024 * 1024),
+        RESULT_CACHE_TTL_SECONDS,
+        RESULT_CACHE_PATH or None,
+    )
+    register_collector(lambda: export_stats("result_cache", cache.stats()))
+    return cache
+
+
+def cached_result(namespace: str, ttl_seconds: Optional[float] = None) -> Callable:
+    """Memoise a function with JSON-serialisable arguments and result in the shared result cache."""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = content_key(namespace, args, kwargs)
+            cache = get_result_cache()
+            hit = cache.get_many([key])
+            if key in hit:
+                return hit[key]
+            value = fn(*args, **kwargs)
+            cache.set(key, value, ttl_seconds)
+            return value
+
+        return wrapper
+
+    return decorator
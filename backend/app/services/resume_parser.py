@@ -1,37 +1,94 @@
 import re
 from io import BytesIO
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator, List, Optional
 
 import fitz
 from docx import Document
 from fastapi import UploadFile
 
+from .extraction_pool import get_extraction_pool
+
 SUPPORTED_EXTENSIONS = {".pdf", ".docx"}
 SUPPORTED_CONTENT_TYPES = {
     "application/pdf",
     "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
     "application/octet-stream",
 }
+DOCX_PARAGRAPHS_PER_BLOCK = 100
 
 
 async def extract_text_from_pdf(file: UploadFile) -> str:
-    contents = await file.read()
-    with fitz.open(stream=contents, filetype="pdf") as doc:
-        text = "\n".join(page.get_text("text") for page in doc)
-    return clean_text(text)
+    return extract_text_from_pdf_bytes(await file.read())
 
 
 def extract_text_from_pdf_bytes(contents: bytes) -> str:
-    with fitz.open(stream=contents, filetype="pdf") as doc:
-        text = "\n".join(page.get_text("text") for page in doc)
-    return clean_text(text)
+    return extract_text_from_bytes(contents, "pdf")
 
 
 def extract_text_from_docx_bytes(contents: bytes) -> str:
+    return extract_text_from_bytes(contents, "docx")
+
+
+def iter_pdf_pages(contents: bytes, max_pages: Optional[int] = None) -> Iterator[str]:
+    with fitz.open(stream=contents, filetype="pdf") as doc:
+        for index, page in enumerate(doc):
+            if max_pages is not None and index >= max_pages:
+                break
+            yield page.get_text("text")
+
+
+def iter_docx_blocks(contents: bytes, paragraphs_per_block: int = DOCX_PARAGRAPHS_PER_BLOCK) -> Iterator[str]:
     doc = Document(BytesIO(contents))
-    text = "\n".join(p.text for p in doc.paragraphs if p.text)
-    return clean_text(text)
+    block: List[str] = []
+    for paragraph in doc.paragraphs:
+        if paragraph.text:
+            block.append(paragraph.text)
+        if len(block) >= paragraphs_per_block:
+            yield "\n".join(block)
+            block = []
+    if block:
+        yield "\n".join(block)
+
+
+def iter_clean_text(
+    contents: bytes,
+    kind: str,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Cleaned text one page (PDF) or paragraph block (DOCX) at a time; "".join of the pieces equals
+    clean_text over the whole document. Stops after max_pages pages or max_chars characters.
+    """
+    if kind == "pdf":
+        chunks = iter_pdf_pages(contents, max_pages)
+    elif kind == "docx":
+        chunks = iter_docx_blocks(contents)
+    else:
+        raise ValueError("Unsupported file type. Use PDF or DOCX.")
+
+    emitted = 0
+    for chunk in chunks:
+        piece = clean_text(chunk)
+        if not piece:
+            continue
+        if emitted:
+            piece = " " + piece
+        if max_chars is not None and emitted + len(piece) >= max_chars:
+            yield piece[: max_chars - emitted].rstrip()
+            return
+        emitted += len(piece)
+        yield piece
+
+
+def extract_text_from_bytes(
+    contents: bytes,
+    kind: str,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> str:
+    return "".join(iter_clean_text(contents, kind, max_pages, max_chars))
 
 
 def is_supported_upload(file: UploadFile) -> bool:
@@ -52,15 +109,9 @@ def detect_upload_kind(file: UploadFile) -> str:
 
 
 async def extract_text_from_upload(file: UploadFile) -> str:
+    """Parse an upload in an isolated extraction worker, within the configured page/char/time/memory limits."""
     contents = await file.read()
-    kind = detect_upload_kind(file)
-    if kind == "pdf":
-        with fitz.open(stream=contents, filetype="pdf") as doc:
-            text = "\n".join(page.get_text("text") for page in doc)
-        return clean_text(text)
-    if kind == "docx":
-        return extract_text_from_docx_bytes(contents)
-    raise ValueError("Unsupported file type. Use PDF or DOCX.")
+    return await get_extraction_pool().extract(contents, detect_upload_kind(file))
 
 
 def clean_text(text: str) -> str:
@@ -0,0 +1,135 @@
+import hashlib
+from datetime import datetime
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..models import RoleFeatures, RoleProfile
+from .document_features import AnalysisPlan, DocumentFeatures, extract_document_features
+from .embedding_engine import embedding_model_id
+from .skill_taxonomy import get_skill_taxonomy
+
+# Bump whenever the stored layout or the feature extraction changes; older rows are recomputed on read.
+ROLE_FEATURES_VERSION = 5
+STORED_EMBEDDING_DTYPE = np.float16
+
+
+def pack_matrix(matrix) -> bytes:
+    buffer = BytesIO()
+    np.save(buffer, np.asarray(matrix, dtype=STORED_EMBEDDING_DTYPE), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def unpack_matrix(blob: bytes) -> np.ndarray:
+    return np.load(BytesIO(blob), allow_pickle=False).astype(np.float32)
+
+
+def jd_hash(jd_text: str) -> str:
+    return hashlib.sha256(jd_text.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def compute_roles_features(jd_texts: List[str]) -> List[DocumentFeatures]:
+    """Features for many JDs, embedded together in one encode."""
+    features = [extract_document_features(jd_text) for jd_text in jd_texts]
+    # A lone ad-hoc TF-IDF fit is meaningless to store; only persist vectors from a stable model.
+    if features and embedding_model_id() is not None:
+        AnalysisPlan(features).embed()
+    return features
+
+
+def compute_role_features(jd_text: str) -> DocumentFeatures:
+    return compute_roles_features([jd_text])[0]
+
+
+def store_role_features(db: Session, role: RoleProfile, features: Optional[DocumentFeatures] = None) -> DocumentFeatures:
+    features = features or compute_role_features(role.jd_text)
+    row = db.query(RoleFeatures).filter(RoleFeatures.role_id == role.id).first()
+    if row is None:
+        row = RoleFeatures(role_id=role.id)
+
+    row.jd_hash = jd_hash(role.jd_text)
+    write_feature_columns(row, features)
+    db.add(row)
+    return features
+
+
+def write_feature_columns(row, features: DocumentFeatures):
+    """Copy features onto any model sharing the stored-feature columns (RoleFeatures, CandidateProfile)."""
+    embedded = features.is_embedded_with(features.model_id)
+    row.format_version = ROLE_FEATURES_VERSION
+    row.taxonomy_id = features.taxonomy_id
+    row.model_id = features.model_id if embedded else None
+    row.sentences = features.sentences
+    row.skills = features.skills
+    row.keyword_counts = features.keyword_counts
+    row.token_count = features.token_count
+    row.doc_embedding = pack_matrix(features.doc_embedding) if embedded else None
+    row.sentence_embeddings = pack_matrix(features.sentence_embeddings) if embedded else None
+    row.updated_at = datetime.utcnow()
+
+
+def features_from_row(row, text: str) -> DocumentFeatures:
+    features = DocumentFeatures(
+        text=text,
+        sentences=list(row.sentences or []),
+        skills=list(row.skills or []),
+        keyword_counts=dict(row.keyword_counts or {}),
+        token_count=int(row.token_count or 0),
+        taxonomy_id=row.taxonomy_id,
+    )
+    if row.model_id and row.doc_embedding is not None and row.sentence_embeddings is not None:
+        features.model_id = row.model_id
+        features.doc_embedding = unpack_matrix(row.doc_embedding)
+        features.sentence_embeddings = unpack_matrix(row.sentence_embeddings)
+    return features
+
+
+def _is_stale(row: Optional[RoleFeatures], role: RoleProfile, model_id: Optional[str]) -> bool:
+    if row is None or row.format_version != ROLE_FEATURES_VERSION or row.jd_hash != jd_hash(role.jd_text):
+        return True
+    if row.taxonomy_id != get_skill_taxonomy().fingerprint:
+        return True
+    return model_id is not None and row.model_id != model_id
+
+
+def split_role_features(db: Session, roles: List[RoleProfile]) -> Tuple[Dict[int, DocumentFeatures], List[RoleProfile]]:
+    """Usable stored features per role id, and the roles whose rows are stale (old version, edited JD, new taxonomy or model)."""
+    if not roles:
+        return {}, []
+    rows = {
+        row.role_id: row
+        for row in db.query(RoleFeatures).filter(RoleFeatures.role_id.in_([role.id for role in roles])).all()
+    }
+    model_id = embedding_model_id()
+
+    loaded: Dict[int, DocumentFeatures] = {}
+    stale: List[RoleProfile] = []
+    for role in roles:
+        row = rows.get(role.id)
+        if _is_stale(row, role, model_id):
+            stale.append(role)
+        else:
+            loaded[role.id] = features_from_row(row, role.jd_text)
+    return loaded, stale
+
+
+def save_role_features(db: Session, roles: List[RoleProfile], features: List[DocumentFeatures]):
+    for role, role_features in zip(roles, features):
+        store_role_features(db, role, role_features)
+    db.commit()
+
+
+def load_role_features(db: Session, roles: List[RoleProfile]) -> Dict[int, DocumentFeatures]:
+    """Stored features per role id; stale rows are rebuilt in one batch and saved."""
+    loaded, stale = split_role_features(db, roles)
+    if stale:
+        fresh = compute_roles_features([role.jd_text for role in stale])
+        save_role_features(db, stale, fresh)
+        loaded.update(zip((role.id for role in stale), fresh))
+    return loaded
+
+
+def delete_role_features(db: Session, role_id: int):
+    db.query(RoleFeatures).filter(RoleFeatures.role_id == role_id).delete(synchronize_session=False)
@@ -0,0 +1,143 @@
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models import RoleFeatures, RoleProfile
+from .document_features import AnalysisPlan, DocumentFeatures
+from .embedding_engine import embedding_model_id
+from .role_features import ROLE_FEATURES_VERSION, load_role_features, unpack_matrix
+from .vector_index import VectorIndex
+
+INDEX_DIR = os.getenv("TALENTALIGN_INDEX_DIR", "./talentalign_index")
+
+_loaded: Dict[Tuple[int, str], Tuple[str, VectorIndex]] = {}
+_lock = threading.Lock()
+
+
+def _short_hash(value: str) -> str:
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()[:12]
+
+
+def _signature(db: Session, owner_user_id: int, model_id: str) -> str:
+    # Cheap aggregates that change whenever a role or its stored features are created, edited or deleted.
+    roles = (
+        db.query(func.count(RoleProfile.id), func.max(RoleProfile.updated_at))
+        .filter(RoleProfile.owner_user_id == owner_user_id)
+        .one()
+    )
+    features = (
+        db.query(func.count(RoleFeatures.id), func.max(RoleFeatures.updated_at))
+        .join(RoleProfile, RoleProfile.id == RoleFeatures.role_id)
+        .filter(RoleProfile.owner_user_id == owner_user_id, RoleFeatures.model_id == model_id)
+        .one()
+    )
+    return _short_hash(repr((tuple(roles), tuple(features), ROLE_FEATURES_VERSION)))
+
+
+def unindexed_roles(db: Session, owner_user_id: int) -> List[RoleProfile]:
+    """Roles without stored vectors from the active model, which the index would miss until their features are rebuilt."""
+    model_id = embedding_model_id()
+    if model_id is None:
+        return []
+    embedded_ids = (
+        db.query(RoleFeatures.role_id)
+        .join(RoleProfile, RoleProfile.id == RoleFeatures.role_id)
+        .filter(
+            RoleProfile.owner_user_id == owner_user_id,
+            RoleFeatures.model_id == model_id,
+            RoleFeatures.format_version == ROLE_FEATURES_VERSION,
+        )
+    )
+    return (
+        db.query(RoleProfile)
+        .filter(RoleProfile.owner_user_id == owner_user_id, RoleProfile.id.notin_(embedded_ids))
+        .all()
+    )
+
+
+def _build(db: Session, base_path: str, owner_user_id: int, model_id: str, signature: str) -> VectorIndex:
+    rows = (
+        db.query(RoleFeatures.role_id, RoleFeatures.doc_embedding)
+        .join(RoleProfile, RoleProfile.id == RoleFeatures.role_id)
+        .filter(
+            RoleProfile.owner_user_id == owner_user_id,
+            RoleFeatures.model_id == model_id,
+            RoleFeatures.format_version == ROLE_FEATURES_VERSION,
+            RoleFeatures.doc_embedding.isnot(None),
+        )
+        .all()
+    )
+    if not rows:
+        return VectorIndex(np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float16), None, None)
+    matrix = np.vstack([unpack_matrix(blob) for _, blob in rows])
+    meta = {"owner_user_id": owner_user_id, "model_id": model_id, "signature": signature}
+    return VectorIndex.build(base_path, [role_id for role_id, _ in rows], matrix, meta)
+
+
+def _remove_old_generations(prefix: str, keep: str):
+    for path in Path(INDEX_DIR).glob(f"{prefix}-*"):
+        if not path.name.startswith(f"{keep}."):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def get_role_index(db: Session, owner_user_id: int) -> Optional[VectorIndex]:
+    model_id = embedding_model_id()
+    if model_id is None:
+        return None
+
+    key = (owner_user_id, model_id)
+    with _lock:
+        signature = _signature(db, owner_user_id, model_id)
+        cached = _loaded.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        os.makedirs(INDEX_DIR, exist_ok=True)
+        prefix = f"roles-{owner_user_id}-{_short_hash(model_id)}"
+        index = VectorIndex.open(os.path.join(INDEX_DIR, f"{prefix}-{signature}"))
+        if index is None:
+            # Callers on the event loop rebuild these in the task pool first; this only catches what changed since.
+            missing = unindexed_roles(db, owner_user_id)
+            if missing:
+                load_role_features(db, missing)
+            signature = _signature(db, owner_user_id, model_id)
+            base_name = f"{prefix}-{signature}"
+            index = VectorIndex.open(os.path.join(INDEX_DIR, base_name)) or _build(
+                db, os.path.join(INDEX_DIR, base_name), owner_user_id, model_id, signature
+            )
+            _remove_old_generations(prefix, keep=base_name)
+        _loaded[key] = (signature, index)
+        return index
+
+
+def _rank_by_skill_coverage(db: Session, owner_user_id: int, resume: DocumentFeatures, top_k: int) -> List[Tuple[int, float]]:
+    roles = db.query(RoleProfile).filter(RoleProfile.owner_user_id == owner_user_id).all()
+    resume_skills = set(resume.skills)
+    scored = []
+    for role_id, features in load_role_features(db, roles).items():
+        jd_skills = set(features.skills)
+        scored.append((role_id, len(resume_skills & jd_skills) / max(1, len(jd_skills))))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored[:top_k]
+
+
+def search_roles(db: Session, owner_user_id: int, resume: DocumentFeatures, top_k: int) -> Tuple[List[Tuple[int, float]], str]:
+    """
+    Top-k (role_id, retrieval_score) for a resume, plus the retrieval strategy used.
+    Without a stable embedding model there is no shared vector space, so roles are ranked by skill coverage instead.
+    """
+    index = get_role_index(db, owner_user_id)
+    if index is None:
+        return _rank_by_skill_coverage(db, owner_user_id, resume, top_k), "skills"
+
+    AnalysisPlan([resume]).embed()
+    return index.search(resume.doc_embedding, top_k), index.kind
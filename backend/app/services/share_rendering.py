@@ -0,0 +1,199 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models import AnalysisRecord, SharedReport
+from .analysis_store import analysis_result
+from .metrics import export_stats, register_collector
+
+logger = logging.getLogger("talentalign")
+
+# Bump when masking or the response shape changes; renderings stored by older versions are rebuilt on read.
+SHARE_RENDER_VERSION = 1
+SHARE_WATERMARK = "Generated by TalentAlign AI (Demo)"
+SHARE_CACHE_ITEMS = int(os.getenv("TALENTALIGN_SHARE_CACHE_ITEMS", "1000"))
+# Bounds both how long another worker may keep serving a revoked link and the max-age browsers are given.
+SHARE_CACHE_TTL_SECONDS = float(os.getenv("TALENTALIGN_SHARE_CACHE_TTL_SECONDS", "60"))
+# How often stored renderings of expired links are cleared; 0 leaves it to reads, which drop them lazily.
+SHARE_PURGE_SECONDS = int(os.getenv("TALENTALIGN_SHARE_PURGE_SECONDS", "3600"))
+
+EMAIL_RE = re.compile(r"([A-Za-z0-9._%+-])[A-Za-z0-9._%+-]*@([A-Za-z0-9.-]+\.[A-Za-z]{2,})")
+PHONE_RE = re.compile(r"\b(?:\+?\d{1,3}[\s.-]?)?(?:\(?\d{3}\)?[\s.-]?)\d{3}[\s.-]?\d{4}\b")
+
+
+def mask_pii(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: mask_pii(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [mask_pii(v) for v in value]
+    if isinstance(value, str):
+        value = EMAIL_RE.sub(lambda m: f"{m.group(1)}***@{m.group(2)}", value)
+        value = PHONE_RE.sub("***-***-****", value)
+    return value
+
+
+@dataclass(frozen=True)
+class RenderedShare:
+    etag: str
+    body: bytes
+    expires_at: datetime
+
+
+def render_share(analysis: AnalysisRecord, expires_at: datetime) -> RenderedShare:
+    """The public JSON body for a share link, serialised the way JSONResponse would, and its ETag."""
+    payload = {"analysis": mask_pii(analysis_result(analysis)), "expires_at": expires_at.isoformat(), "watermark": SHARE_WATERMARK}
+    body = json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    return RenderedShare(etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"', body=body, expires_at=expires_at)
+
+
+def store_rendering(rec: SharedReport, analysis: AnalysisRecord) -> RenderedShare:
+    rendered = render_share(analysis, rec.expires_at)
+    rec.rendered_etag = rendered.etag
+    rec.rendered_body = zlib.compress(rendered.body, 6)
+    rec.render_version = SHARE_RENDER_VERSION
+    return rendered
+
+
+def has_current_rendering(rec: SharedReport) -> bool:
+    return rec.render_version == SHARE_RENDER_VERSION and rec.rendered_etag is not None
+
+
+def load_rendering(db: Session, rec: SharedReport) -> Optional[RenderedShare]:
+    """The stored rendering, built and saved on first read for links created before renderings were stored."""
+    if has_current_rendering(rec):
+        return RenderedShare(etag=rec.rendered_etag, body=zlib.decompress(rec.rendered_body), expires_at=rec.expires_at)
+    analysis = db.query(AnalysisRecord).filter(AnalysisRecord.id == rec.analysis_id).first()
+    if not analysis:
+        return None
+    rendered = store_rendering(rec, analysis)
+    db.commit()
+    return rendered
+
+
+def drop_rendering(rec: SharedReport):
+    rec.rendered_etag = None
+    rec.rendered_body = None
+    rec.render_version = None
+
+
+def purge_expired_renderings(db: Session, now: datetime) -> int:
+    """Clear stored renderings of expired links that nobody has opened since they expired."""
+    return (
+        db.query(SharedReport)
+        .filter(SharedReport.expires_at < now, SharedReport.rendered_etag.isnot(None))
+        .update({"rendered_etag": None, "rendered_body": None, "render_version": None}, synchronize_session=False)
+    )
+
+
+def start_share_purger() -> Optional[threading.Thread]:
+    if SHARE_PURGE_SECONDS <= 0:
+        return None
+    from ..database import SessionLocal
+
+    def _loop():
+        while True:
+            db = SessionLocal()
+            try:
+                purged = purge_expired_renderings(db, datetime.utcnow())
+                db.commit()
+                if purged:
+                    logger.info("Cleared %s expired share renderings", purged)
+            except Exception:
+                logger.exception("Share rendering purge failed")
+            finally:
+                db.close()
+            time.sleep(SHARE_PURGE_SECONDS)
+
+    thread = threading.Thread(target=_loop, name="share-rendering-purger", daemon=True)
+    thread.start()
+    return thread
+
+
+def cache_headers(etag: str, expires_at: datetime) -> Dict[str, str]:
+    # Private: a revoked link must stop being served once max-age runs out, which a shared cache would not honour.
+    max_age = max(0, int(min(SHARE_CACHE_TTL_SECONDS, (expires_at - datetime.utcnow()).total_seconds())))
+    return {"ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    if not if_none_match or not etag:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+class RenderedShareCache:
+    """
+    Hot share renderings per process, least recently read evicted first. Entries live at most the TTL
+    and never past the link's own expiry; revoking a link drops it here at once, other workers within the TTL.
+    """
+
+    def __init__(self, max_items: int, ttl_seconds: float):
+        self.max_items = max(0, max_items)
+        self.ttl_seconds = ttl_seconds
+        # token -> (cached_until, rendering)
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, token: str) -> Optional[RenderedShare]:
+        with self._lock:
+            entry = self._items.get(token)
+            if entry is not None and (entry[0] <= time.time() or entry[1].expires_at < datetime.utcnow()):
+                self._forget(token)
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._items.move_to_end(token)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def put(self, token: str, rendered: RenderedShare):
+        if not self.max_items:
+            return
+        with self._lock:
+            self._forget(token)
+            self._items[token] = (time.time() + self.ttl_seconds, rendered)
+            self._bytes += len(rendered.body)
+            while len(self._items) > self.max_items:
+                self._forget(next(iter(self._items)))
+                self._stats["evictions"] += 1
+
+    def discard(self, token: str):
+        with self._lock:
+            self._forget(token)
+
+    def _forget(self, token: str):
+        entry = self._items.pop(token, None)
+        if entry is not None:
+            self._bytes -= len(entry[1].body)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "items": len(self._items), "bytes": self._bytes, "capacity_items": self.max_items}
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+
+@lru_cache(maxsize=1)
+def get_share_cache() -> RenderedShareCache:
+    cache = RenderedShareCache(SHARE_CACHE_ITEMS, SHARE_CACHE_TTL_SECONDS)
+    register_collector(lambda: export_stats("share_cache", cache.stats()))
+    return cache
@@ -1,46 +1,28 @@
-﻿import re
-from collections import Counter
-from typing import Dict, List, Set
+﻿from typing import Dict, List
 
-SKILL_KEYWORDS: Set[str] = {
-    "python", "java", "javascript", "typescript", "react", "vue", "angular", "node", "fastapi",
-    "django", "flask", "sql", "postgresql", "mysql", "mongodb", "redis", "docker", "kubernetes",
-    "aws", "azure", "gcp", "tensorflow", "pytorch", "machine learning", "deep learning", "nlp",
-    "pandas", "numpy", "scikit-learn", "git", "ci/cd", "graphql", "rest", "microservices", "linux",
-    "spark", "hadoop", "airflow", "tableau", "power bi", "communication", "leadership", "agile",
-}
+import numpy as np
 
-
-def _normalize(text: str) -> str:
-    return re.sub(r"\s+", " ", text.lower()).strip()
+from .skill_taxonomy import TOKEN_RE, get_skill_taxonomy
 
 
 def extract_skills(text: str) -> List[str]:
-    normalized = _normalize(text)
-    found = []
-    for skill in SKILL_KEYWORDS:
-        pattern = r"\b" + re.escape(skill) + r"\b"
-        if re.search(pattern, normalized):
-            found.append(skill)
-    return sorted(set(found))
+    return sorted({match.skill for match in get_skill_taxonomy().matcher.iter_matches(text)})
+
+
+def word_count(text: str) -> int:
+    """Words that density is measured against: tokens starting with a letter."""
+    return sum(1 for match in TOKEN_RE.finditer(text) if match.group()[0].isalpha())
+
+
+def density_from_counts(counts: Dict[str, int], total_words: int, keywords: List[str]) -> Dict[str, float]:
+    total = total_words or 1
+    return {keyword: round((counts.get(keyword, 0) / total) * 100, 3) for keyword in keywords}
 
 
-def tokenize_words(text: str) -> List[str]:
-    return re.findall(r"[a-zA-Z][a-zA-Z0-9+\-/#.]*", text.lower())
+def density_array(counts: np.ndarray, total_words: int) -> np.ndarray:
+    return np.round(counts / (total_words or 1) * 100, 3)
 
 
 def keyword_density(text: str, keywords: List[str]) -> Dict[str, float]:
-    words = tokenize_words(text)
-    total = len(words) or 1
-    counts = Counter(words)
-
-    density: Dict[str, float] = {}
-    for keyword in keywords:
-        key_words = keyword.lower().split()
-        if len(key_words) == 1:
-            density[keyword] = round((counts[key_words[0]] / total) * 100, 3)
-        else:
-            pattern = re.escape(keyword.lower())
-            occurrences = len(re.findall(pattern, text.lower()))
-            density[keyword] = round((occurrences / total) * 100, 3)
-    return density
+    """Density per canonical skill, counted by the same matcher analysis uses (aliases included)."""
+    return density_from_counts(get_skill_taxonomy().matcher.count(text), word_count(text), keywords)
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("talentalign")
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).resolve().parent.parent / "data" / "skill_taxonomy.json"
+SKILL_TAXONOMY_PATH = os.getenv("TALENTALIGN_SKILL_TAXONOMY_PATH", str(DEFAULT_TAXONOMY_PATH))
+TAXONOMY_RELOAD_CHECK_SECONDS = 5.0
+
+# Word runs and single punctuation characters; matching over these tokens gives the same
+# boundaries as wrapping every skill in \b...\b.
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def tokenize_phrase(text: str) -> Tuple[str, ...]:
+    return tuple(token.lower() for token in TOKEN_RE.findall(text))
+
+
+@dataclass(frozen=True)
+class SkillMatch:
+    skill: str
+    start: int
+    end: int
+    matched_text: str
+
+
+def _dot_joined(text: str, start: int, end: int) -> bool:
+    """True when the span is glued to a neighbouring word by a dot, as "js" is in "Next.js"."""
+    before = start >= 2 and text[start - 1] == "." and text[start - 2].isalnum()
+    after = end + 1 < len(text) and text[end] == "." and text[end + 1].isalnum()
+    return before or after
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over word tokens: one pass over the text regardless of taxonomy size.
+    Patterns in `guarded` (aliases) only match when they stand alone, never as part of a dotted name.
+    """
+
+    def __init__(self, patterns: Dict[Tuple[str, ...], str], guarded: FrozenSet[Tuple[str, ...]] = frozenset()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, int, bool]]] = [[]]
+        self.max_tokens = max((len(tokens) for tokens in patterns), default=1)
+
+        for tokens, skill in patterns.items():
+            if not tokens:
+                continue
+            state = 0
+            for token in tokens:
+                nxt = self._goto[state].get(token)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][token] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((skill, len(tokens), tokens in guarded))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(token, 0)
+                self._fail[nxt] = candidate if candidate != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[SkillMatch]:
+        # Only the last max_tokens token offsets are ever needed to resolve where a match starts.
+        spans: deque = deque(maxlen=self.max_tokens)
+        state = 0
+        for match in TOKEN_RE.finditer(text):
+            token = match.group().lower()
+            spans.append(match.start())
+            while state and token not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(token, 0)
+            for skill, length, alias in self._out[state]:
+                start = spans[-length]
+                if alias and _dot_joined(text, start, match.end()):
+                    continue
+                yield SkillMatch(skill=skill, start=start, end=match.end(), matched_text=text[start : match.end()])
+
+    def count(self, text: str) -> Dict[str, int]:
+        """
+        Occurrences per canonical skill, aliases included. Overlapping hits on one skill count once, so
+        "node.js" is one node and "Apache Spark" one spark even though both spellings match there.
+        """
+        counts: Dict[str, int] = {}
+        counted_until: Dict[str, int] = {}
+        for match in self.iter_matches(text):
+            if match.start < counted_until.get(match.skill, 0):
+                continue
+            counts[match.skill] = counts.get(match.skill, 0) + 1
+            counted_until[match.skill] = match.end
+        return counts
+
+
+@dataclass
+class SkillTaxonomy:
+    names: FrozenSet[str]
+    name_phrases: Dict[Tuple[str, ...], str]
+    matcher: SkillMatcher
+    fingerprint: str
+    source: str
+
+
+def build_taxonomy(payload: dict, source: str = "<memory>", fingerprint: Optional[str] = None) -> SkillTaxonomy:
+    patterns: Dict[Tuple[str, ...], str] = {}
+    aliases = set()
+    names = set()
+    for entry in payload.get("skills") or []:
+        name = " ".join(str(entry["name"]).lower().split())
+        if not name:
+            continue
+        names.add(name)
+        for phrase in [name, *(entry.get("aliases") or [])]:
+            tokens = tokenize_phrase(str(phrase))
+            # A canonical name always wins over another skill's alias with the same spelling.
+            if tokens and (tokens not in patterns or phrase == name):
+                patterns[tokens] = name
+                if phrase == name:
+                    aliases.discard(tokens)
+                else:
+                    aliases.add(tokens)
+    if fingerprint is None:
+        fingerprint = hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return SkillTaxonomy(
+        names=frozenset(names),
+        name_phrases={tokenize_phrase(name): name for name in names},
+        matcher=SkillMatcher(patterns, frozenset(aliases)),
+        fingerprint=fingerprint,
+        source=source,
+    )
+
+
+def load_taxonomy(path: str) -> SkillTaxonomy:
+    raw = Path(path).read_bytes()
+    return build_taxonomy(json.loads(raw), source=path, fingerprint=hashlib.sha256(raw).hexdigest()[:16])
+
+
+class _TaxonomyHolder:
+    def __init__(self, path: str):
+        self.path = path
+        self.taxonomy: Optional[SkillTaxonomy] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> SkillTaxonomy:
+        now = time.monotonic()
+        if self.taxonomy is not None and now - self._checked_at < TAXONOMY_RELOAD_CHECK_SECONDS:
+            return self.taxonomy
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError:
+                if self.taxonomy is None:
+                    raise
+                return self.taxonomy
+            if self.taxonomy is None or mtime != self._mtime:
+                try:
+                    self.taxonomy = load_taxonomy(self.path)
+                    self._mtime = mtime
+                    logger.info("Loaded skill taxonomy %s (%s skills)", self.taxonomy.fingerprint, len(self.taxonomy.names))
+                except Exception:
+                    if self.taxonomy is None:
+                        raise
+                    logger.exception("Failed to reload skill taxonomy from %s; keeping previous", self.path)
+            return self.taxonomy
+
+
+_holder = _TaxonomyHolder(SKILL_TAXONOMY_PATH)
+
+
+def get_skill_taxonomy() -> SkillTaxonomy:
+    return _holder.get()
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+
+from .metrics import export_stats, register_collector
+from .tracing import current_trace, run_traced
+
+logger = logging.getLogger("talentalign")
+
+# 0 keeps the work in the API process on a thread pool (still off the event loop).
+TASK_POOL_WORKERS = int(os.getenv("TALENTALIGN_ANALYSIS_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Tasks allowed to wait for a free worker before new submissions are rejected with 503.
+TASK_POOL_QUEUE_SIZE = int(os.getenv("TALENTALIGN_ANALYSIS_QUEUE_SIZE", "32"))
+TASK_POOL_TIMEOUT_SECONDS = float(os.getenv("TALENTALIGN_ANALYSIS_TIMEOUT_SECONDS", "60"))
+# spawn avoids forking a process that already runs threads (refresher, thread pools, sqlite).
+TASK_POOL_START_METHOD = os.getenv("TALENTALIGN_ANALYSIS_START_METHOD", "spawn")
+
+
+class TaskPoolUnavailable(Exception):
+    pass
+
+
+class TaskTimeout(Exception):
+    pass
+
+
+def preload_models():
+    # Load the taxonomy and embedding backends once per worker process instead of on its first request.
+    from .embedding_engine import embedding_model_id, get_model
+    from .skill_taxonomy import get_skill_taxonomy
+
+    get_skill_taxonomy()
+    get_model()
+    embedding_model_id()
+
+
+class TaskPool:
+    """
+    Runs CPU-bound parsing and scoring outside the event loop. Submissions beyond
+    workers + queue_size are rejected instead of queueing without bound; a slot is only
+    released when its task has actually finished, so timed-out work still counts.
+    """
+
+    def __init__(self, workers: int, queue_size: int, timeout: float, start_method: str = TASK_POOL_START_METHOD):
+        self.workers = max(0, workers)
+        self.capacity = max(1, self.workers) + max(0, queue_size)
+        self.timeout = timeout
+        self.start_method = start_method
+        self._executor: Optional[Executor] = None
+        self._outstanding = 0
+        self._lock = threading.Lock()
+
+    @property
+    def outstanding(self) -> int:
+        return self._outstanding
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.workers:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=preload_models,
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="analysis")
+        return self._executor
+
+    def _release(self, _future: Future):
+        with self._lock:
+            self._outstanding -= 1
+
+    def _discard(self, executor: Executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, fn: Callable, *args) -> Tuple[Executor, Future]:
+        with self._lock:
+            if self._outstanding >= self.capacity:
+                raise TaskPoolUnavailable("Analysis queue is full, retry shortly")
+            executor = self._get_executor()
+            self._outstanding += 1
+        try:
+            future = executor.submit(fn, *args)
+        except (BrokenProcessPool, RuntimeError) as exc:
+            self._release(None)
+            self._discard(executor)
+            raise TaskPoolUnavailable("Analysis workers are restarting, retry shortly") from exc
+        future.add_done_callback(self._release)
+        return executor, future
+
+    async def run(self, fn: Callable, *args):
+        trace = current_trace()
+        if trace is None:
+            executor, future = self._submit(fn, *args)
+        else:
+            executor, future = self._submit(run_traced, fn, args, trace.request_id, trace.profile)
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+            if trace is None:
+                return result
+            result, stages = result
+            trace.merge(stages)
+            return result
+        except asyncio.TimeoutError as exc:
+            raise TaskTimeout(f"Analysis did not finish within {self.timeout:g}s") from exc
+        except BrokenProcessPool as exc:
+            logger.error("Analysis worker died; restarting the pool")
+            self._discard(executor)
+            raise TaskPoolUnavailable("Analysis worker crashed, retry shortly") from exc
+
+    def warm_up(self):
+        """Start the workers (and their model preload) ahead of the first request."""
+        if self.workers:
+            for _ in range(self.workers):
+                self._submit(os.getpid)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache(maxsize=1)
+def get_task_pool() -> TaskPool:
+    pool = TaskPool(TASK_POOL_WORKERS, TASK_POOL_QUEUE_SIZE, TASK_POOL_TIMEOUT_SECONDS)
+    register_collector(lambda: export_stats("task_pool", {"outstanding": pool.outstanding, "capacity": pool.capacity}))
+    return pool
@@ -0,0 +1,107 @@
+import cProfile
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from .metrics import STAGE_LATENCY
+
+logger = logging.getLogger("talentalign")
+
+# Fraction of requests whose offloaded analysis runs under cProfile; 0 disables profiling entirely.
+PROFILE_SAMPLE_RATE = float(os.getenv("TALENTALIGN_PROFILE_SAMPLE_RATE", "0"))
+PROFILE_THRESHOLD_MS = float(os.getenv("TALENTALIGN_PROFILE_THRESHOLD_MS", "1000"))
+PROFILE_DIR = os.getenv("TALENTALIGN_PROFILE_DIR", "./talentalign_profiles")
+
+STAGE_ORDER = ("parse", "embed", "skills", "density", "heatmap", "persist")
+
+
+class StageTrace:
+    """Wall time per pipeline stage for one request, summed when a stage runs more than once (e.g. per role)."""
+
+    def __init__(self, request_id: Optional[str] = None, profile: bool = False):
+        self.request_id = request_id
+        self.profile = profile
+        self.stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def merge(self, stages: Dict[str, float]):
+        for stage, seconds in stages.items():
+            self.add(stage, seconds)
+
+    def breakdown_ms(self) -> Dict[str, float]:
+        with self._lock:
+            ordered = sorted(self.stages.items(), key=lambda item: (_stage_rank(item[0]), item[0]))
+        return {stage: round(seconds * 1000, 2) for stage, seconds in ordered}
+
+    def server_timing(self, total_ms: float) -> str:
+        entries = [f"{stage};dur={ms}" for stage, ms in self.breakdown_ms().items()]
+        entries.append(f"total;dur={round(total_ms, 2)}")
+        return ", ".join(entries)
+
+
+def _stage_rank(stage: str) -> int:
+    return STAGE_ORDER.index(stage) if stage in STAGE_ORDER else len(STAGE_ORDER)
+
+
+_current_trace: ContextVar[Optional[StageTrace]] = ContextVar("talentalign_stage_trace", default=None)
+
+
+def current_trace() -> Optional[StageTrace]:
+    return _current_trace.get()
+
+
+def start_trace(request_id: Optional[str] = None) -> StageTrace:
+    trace = StageTrace(request_id, profile=PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE)
+    _current_trace.set(trace)
+    return trace
+
+
+@contextmanager
+def time_stage(stage: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_LATENCY.observe(elapsed, stage=stage)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(stage, elapsed)
+
+
+def _profiled(request_id: Optional[str], fn: Callable, args: tuple):
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    try:
+        return profiler.runcall(fn, *args)
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms >= PROFILE_THRESHOLD_MS:
+            Path(PROFILE_DIR).mkdir(parents=True, exist_ok=True)
+            path = Path(PROFILE_DIR) / f"{int(time.time())}-{request_id or os.getpid()}-{fn.__name__}.prof"
+            profiler.dump_stats(str(path))
+            logger.info("Profiled %s for request %s (%.0f ms): %s", fn.__name__, request_id, elapsed_ms, path)
+
+
+def run_traced(fn: Callable, args: tuple, request_id: Optional[str], profile: bool) -> Tuple[object, Dict[str, float]]:
+    """
+    Task-pool entry wrapper: runs `fn` under a fresh trace (optionally profiled) and returns its stage
+    timings with the result, since the caller's trace cannot cross the process boundary.
+    """
+    trace = StageTrace(request_id)
+    token = _current_trace.set(trace)
+    try:
+        result = _profiled(request_id, fn, args) if profile else fn(*args)
+    finally:
+        _current_trace.reset(token)
+    return result, trace.stages
@@ -0,0 +1,124 @@
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+INDEX_DTYPE = np.float16
+SEARCH_BLOCK_ROWS = 8192
+IVF_MIN_ROWS = int(os.getenv("TALENTALIGN_INDEX_IVF_MIN_ROWS", "50000"))
+IVF_PROBES = int(os.getenv("TALENTALIGN_INDEX_IVF_PROBES", "8"))
+IVF_TRAIN_ITERATIONS = 10
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    if k >= scores.shape[0]:
+        return np.argsort(-scores)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+def _kmeans(matrix: np.ndarray, n_lists: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    centroids = matrix[rng.choice(matrix.shape[0], size=n_lists, replace=False)].copy()
+    assignments = np.zeros(matrix.shape[0], dtype=np.int32)
+    for _ in range(IVF_TRAIN_ITERATIONS):
+        assignments = np.argmax(matrix @ centroids.T, axis=1).astype(np.int32)
+        for list_id in range(n_lists):
+            members = matrix[assignments == list_id]
+            if members.shape[0]:
+                centroid = members.mean(axis=0)
+                centroids[list_id] = centroid / (np.linalg.norm(centroid) or 1.0)
+    return centroids, assignments
+
+
+class VectorIndex:
+    """
+    Inner-product index over L2-normalized vectors.
+    Vectors live in a memory-mapped float16 .npy file and are scanned in blocks; above IVF_MIN_ROWS rows
+    they are grouped into k-means partitions and only the closest IVF_PROBES partitions are scanned.
+    """
+
+    def __init__(self, ids: np.ndarray, vectors: np.ndarray, centroids: Optional[np.ndarray], offsets: Optional[np.ndarray]):
+        self.ids = ids
+        self.vectors = vectors
+        self.centroids = centroids
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return int(self.ids.shape[0])
+
+    @property
+    def kind(self) -> str:
+        return "ivf" if self.centroids is not None else "flat"
+
+    @classmethod
+    def build(cls, base_path: str, ids: List[int], matrix: np.ndarray, meta: dict) -> "VectorIndex":
+        matrix = np.asarray(matrix, dtype=np.float32)
+        ids_array = np.asarray(ids, dtype=np.int64)
+        centroids = offsets = None
+
+        if matrix.shape[0] >= IVF_MIN_ROWS:
+            n_lists = max(1, int(np.sqrt(matrix.shape[0])))
+            centroids, assignments = _kmeans(matrix, n_lists)
+            # Store each partition contiguously so a probe is a single slice of the memmap.
+            order = np.argsort(assignments, kind="stable")
+            matrix, ids_array = matrix[order], ids_array[order]
+            offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=n_lists))]).astype(np.int64)
+
+        tmp_suffix = f".{os.getpid()}.tmp"
+        vectors = np.lib.format.open_memmap(
+            f"{base_path}.vectors.npy{tmp_suffix}", mode="w+", dtype=INDEX_DTYPE, shape=matrix.shape
+        )
+        vectors[:] = matrix
+        vectors.flush()
+        del vectors
+        np.save(f"{base_path}.ids{tmp_suffix}.npy", ids_array)
+        if centroids is not None:
+            np.savez(f"{base_path}.ivf{tmp_suffix}.npz", centroids=centroids, offsets=offsets)
+
+        os.replace(f"{base_path}.vectors.npy{tmp_suffix}", f"{base_path}.vectors.npy")
+        os.replace(f"{base_path}.ids{tmp_suffix}.npy", f"{base_path}.ids.npy")
+        if centroids is not None:
+            os.replace(f"{base_path}.ivf{tmp_suffix}.npz", f"{base_path}.ivf.npz")
+        # Meta is written last: its presence marks the index as complete for other workers.
+        Path(f"{base_path}.meta.json{tmp_suffix}").write_text(json.dumps({**meta, "rows": int(matrix.shape[0])}))
+        os.replace(f"{base_path}.meta.json{tmp_suffix}", f"{base_path}.meta.json")
+        return cls.open(base_path)
+
+    @classmethod
+    def open(cls, base_path: str) -> Optional["VectorIndex"]:
+        if not os.path.exists(f"{base_path}.meta.json"):
+            return None
+        ids = np.load(f"{base_path}.ids.npy")
+        vectors = np.load(f"{base_path}.vectors.npy", mmap_mode="r")
+        centroids = offsets = None
+        if os.path.exists(f"{base_path}.ivf.npz"):
+            with np.load(f"{base_path}.ivf.npz") as ivf:
+                centroids, offsets = ivf["centroids"], ivf["offsets"]
+        return cls(ids, vectors, centroids, offsets)
+
+    def _scan(self, query: np.ndarray, start: int, stop: int) -> np.ndarray:
+        scores = np.empty(stop - start, dtype=np.float32)
+        for block in range(start, stop, SEARCH_BLOCK_ROWS):
+            end = min(stop, block + SEARCH_BLOCK_ROWS)
+            scores[block - start : end - start] = self.vectors[block:end].astype(np.float32) @ query
+        return scores
+
+    def search(self, query, top_k: int) -> List[Tuple[int, float]]:
+        if not len(self) or top_k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+
+        if self.centroids is None:
+            scores = self._scan(query, 0, len(self))
+            positions = np.arange(len(self))
+        else:
+            probes = _top_k(self.centroids @ query, min(IVF_PROBES, self.centroids.shape[0]))
+            ranges = [(int(self.offsets[p]), int(self.offsets[p + 1])) for p in probes]
+            scores = np.concatenate([self._scan(query, a, b) for a, b in ranges])
+            positions = np.concatenate([np.arange(a, b) for a, b in ranges])
+
+        best = _top_k(scores, min(top_k, scores.shape[0]))
+        return [(int(self.ids[positions[i]]), float(scores[i])) for i in best]
@@ -0,0 +1,118 @@
+import io
+import json
+import random
+from dataclasses import dataclass
+from typing import List
+
+from app.services.skill_taxonomy import DEFAULT_TAXONOMY_PATH
+
+FILLER_WORDS = (
+    "team product customers delivery platform services design quality ownership roadmap process data "
+    "stakeholders release reliability performance scale migration documentation mentoring review cost "
+    "latency throughput incident analysis reporting planning strategy operations support growth users"
+).split()
+
+RESUME_TEMPLATES = (
+    "Led the {filler} {filler} work using {skill} and {skill}, improving {filler} by {number}%.",
+    "Built {filler} {filler} with {skill} for {number} {filler} across {filler} teams.",
+    "Owned {filler} and {filler} for the {skill} {filler}, cutting {filler} {filler} by {number}%.",
+    "Mentored {number} engineers on {skill} {filler} and {filler} {filler}.",
+    "Delivered {filler} {filler} on {skill}, {skill} and {filler} {filler} ahead of {filler}.",
+)
+JD_TEMPLATES = (
+    "You will own {filler} {filler} built on {skill} and {skill}.",
+    "Experience with {skill} is required; {skill} is a plus.",
+    "Work with {filler} and {filler} to improve {filler} {filler} for {number} {filler}.",
+    "Strong {filler} and {filler} skills, plus {number}+ years of {skill}.",
+    "Help us scale {filler} {filler} using {skill} and modern {filler} practices.",
+)
+
+
+def taxonomy_skills() -> List[str]:
+    payload = json.loads(DEFAULT_TAXONOMY_PATH.read_text(encoding="utf-8"))
+    return [skill["name"] for skill in payload["skills"]]
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    resume_words: int = 600
+    jd_words: int = 350
+    # Share of template slots that name a taxonomy skill rather than a filler word.
+    skill_density: float = 0.5
+    seed: int = 1234
+
+
+class SyntheticCorpus:
+    """Deterministic resumes and JDs: the same spec and seed always produce the same documents."""
+
+    def __init__(self, spec: CorpusSpec):
+        self.spec = spec
+        self.skills = taxonomy_skills()
+
+    def _document(self, rng: random.Random, templates, words: int, skills: List[str]) -> str:
+        sentences: List[str] = []
+        count = 0
+        while count < words:
+            template = rng.choice(templates)
+            sentence = template.format_map(_Slots(rng, skills, self.spec.skill_density))
+            sentences.append(sentence)
+            count += len(sentence.split())
+        return " ".join(sentences)
+
+    def _skill_profile(self, rng: random.Random) -> List[str]:
+        return rng.sample(self.skills, k=min(len(self.skills), rng.randint(8, 16)))
+
+    def resume(self, index: int) -> str:
+        rng = random.Random(f"{self.spec.seed}:resume:{index}")
+        header = f"Candidate {index} candidate{index}@example.com 555-010-{index % 10000:04d}. "
+        return header + self._document(rng, RESUME_TEMPLATES, self.spec.resume_words, self._skill_profile(rng))
+
+    def job_description(self, index: int) -> str:
+        rng = random.Random(f"{self.spec.seed}:jd:{index}")
+        return self._document(rng, JD_TEMPLATES, self.spec.jd_words, self._skill_profile(rng))
+
+    def resumes(self, count: int) -> List[str]:
+        return [self.resume(i) for i in range(count)]
+
+    def job_descriptions(self, count: int) -> List[str]:
+        return [self.job_description(i) for i in range(count)]
+
+
+class _Slots(dict):
+    def __init__(self, rng: random.Random, skills: List[str], skill_density: float):
+        super().__init__()
+        self.rng = rng
+        self.skills = skills
+        self.skill_density = skill_density
+
+    def __missing__(self, key: str) -> str:
+        if key == "number":
+            return str(self.rng.randint(2, 90))
+        if key == "skill" and self.rng.random() < self.skill_density:
+            return self.rng.choice(self.skills)
+        return self.rng.choice(FILLER_WORDS)
+
+
+def pdf_bytes(text: str, words_per_page: int = 450) -> bytes:
+    import fitz
+
+    words = text.split()
+    doc = fitz.open()
+    for start in range(0, max(1, len(words)), words_per_page):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(40, 40, 560, 800), " ".join(words[start : start + words_per_page]), fontsize=8)
+    contents = doc.tobytes()
+    doc.close()
+    return contents
+
+
+def docx_bytes(text: str, sentences_per_paragraph: int = 3) -> bytes:
+    from docx import Document
+
+    document = Document()
+    sentences = [sentence.strip() + "." for sentence in text.split(".") if sentence.strip()]
+    for start in range(0, len(sentences), sentences_per_paragraph):
+        document.add_paragraph(" ".join(sentences[start : start + sentences_per_paragraph]))
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
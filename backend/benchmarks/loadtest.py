@@ -0,0 +1,496 @@
+"""
+End-to-end load test against the HTTP API.
+
+    cd backend
+    python -m benchmarks.loadtest --duration 30 --rate 20 --concurrency 8        # in-process app
+    python -m benchmarks.loadtest --serve --workers 4 --duration 60 --rate 40     # local uvicorn
+    python -m benchmarks.loadtest --target http://127.0.0.1:8000 --duration 60   # running server
+    python -m benchmarks.loadtest --replay api.log --concurrency 16              # replay a request log
+
+Users, roles, one analysis and one share link per user are seeded through the API first. The in-process
+and --serve targets run on a throwaway database with rate limits lifted (see --keep-rate-limits).
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from .corpus import CorpusSpec, SyntheticCorpus, docx_bytes, pdf_bytes
+from .run import BACKEND_ROOT
+
+DEFAULT_MIX = "analyze=4,compare=2,roles.create=1,roles.list=2,share.read=4"
+PASSWORD = "loadtest-password"
+UPLOAD_VARIANTS = 8
+COMPARE_ROLES = 5
+SEED_RETRIES = 5
+PERCENTILES = (50, 90, 95, 99)
+
+# Raw request paths from the middleware log, mapped to the scenario that reproduces them.
+ROUTES: List[Tuple[str, str, "re.Pattern"]] = [
+    ("analyze", "POST", re.compile(r"^/match/analyze$")),
+    ("compare", "POST", re.compile(r"^/match/compare-roles$")),
+    ("history", "GET", re.compile(r"^/match/history$")),
+    ("roles.create", "POST", re.compile(r"^/roles$")),
+    ("roles.list", "GET", re.compile(r"^/roles$")),
+    ("roles.get", "GET", re.compile(r"^/roles/\d+$")),
+    ("share.read", "GET", re.compile(r"^/share/[^/]+$")),
+    ("auth.me", "GET", re.compile(r"^/auth/me$")),
+]
+SCENARIOS = [name for name, _, _ in ROUTES]
+
+
+@dataclass
+class Fixtures:
+    resumes: List[Tuple[str, bytes, str]]
+    job_descriptions: List[str]
+
+    @classmethod
+    def build(cls, spec: CorpusSpec) -> "Fixtures":
+        corpus = SyntheticCorpus(spec)
+        resumes = []
+        for index, text in enumerate(corpus.resumes(UPLOAD_VARIANTS)):
+            if index % 2:
+                resumes.append((f"resume-{index}.docx", docx_bytes(text), "application/vnd.openxmlformats-officedocument.wordprocessingml.document"))
+            else:
+                resumes.append((f"resume-{index}.pdf", pdf_bytes(text), "application/pdf"))
+        return cls(resumes=resumes, job_descriptions=corpus.job_descriptions(UPLOAD_VARIANTS))
+
+
+@dataclass
+class SeededUser:
+    email: str
+    token: str
+    role_ids: List[int] = field(default_factory=list)
+    share_tokens: List[str] = field(default_factory=list)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+@dataclass
+class Sample:
+    scenario: str
+    status: int
+    latency_ms: float
+    stages_ms: Dict[str, float]
+    error: Optional[str] = None
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    for name, route_method, pattern in ROUTES:
+        if method == route_method and pattern.match(path):
+            return name
+    return None
+
+
+def parse_server_timing(header: Optional[str]) -> Dict[str, float]:
+    stages: Dict[str, float] = {}
+    for entry in (header or "").split(","):
+        name, _, params = entry.strip().partition(";")
+        match = re.search(r"dur=([\d.]+)", params)
+        if name and match:
+            stages[name] = float(match.group(1))
+    return stages
+
+
+class Scenarios:
+    def __init__(self, fixtures: Fixtures, users: List[SeededUser], rng: random.Random):
+        self.fixtures = fixtures
+        self.users = users
+        self.rng = rng
+
+    def _resume(self):
+        name, contents, content_type = self.rng.choice(self.fixtures.resumes)
+        return {"resume_file": (name, contents, content_type)}
+
+    async def run(self, client: httpx.AsyncClient, scenario: str, user: SeededUser) -> httpx.Response:
+        if scenario == "analyze":
+            data = {"jd_text": self.rng.choice(self.fixtures.job_descriptions), "analysis_mode": "standard"}
+            return await client.post("/match/analyze", headers=user.headers, files=self._resume(), data=data)
+        if scenario == "compare":
+            data = {"role_profile_ids_json": json.dumps(user.role_ids[:COMPARE_ROLES]), "analysis_mode": "standard"}
+            return await client.post("/match/compare-roles", headers=user.headers, files=self._resume(), data=data)
+        if scenario == "history":
+            return await client.get("/match/history", headers=user.headers, params={"limit": 20})
+        if scenario == "roles.create":
+            data = {"title": f"Load test role {uuid.uuid4().hex[:8]}", "jd_text": self.rng.choice(self.fixtures.job_descriptions)}
+            return await client.post("/roles", headers=user.headers, data=data)
+        if scenario == "roles.list":
+            return await client.get("/roles", headers=user.headers)
+        if scenario == "roles.get":
+            return await client.get(f"/roles/{self.rng.choice(user.role_ids)}", headers=user.headers)
+        if scenario == "share.read":
+            owner = self.rng.choice([u for u in self.users if u.share_tokens] or [user])
+            return await client.get(f"/share/{self.rng.choice(owner.share_tokens or ['missing'])}")
+        if scenario == "auth.me":
+            return await client.get("/auth/me", headers=user.headers)
+        raise ValueError(f"Unknown scenario {scenario!r}")
+
+
+async def _seed_call(send) -> httpx.Response:
+    """Seeding must succeed even against a rate-limited server, so it waits out 429s."""
+    for _ in range(SEED_RETRIES):
+        response = await send()
+        if response.status_code != 429:
+            response.raise_for_status()
+            return response
+        await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+    response.raise_for_status()
+    return response
+
+
+async def seed(client: httpx.AsyncClient, fixtures: Fixtures, users: int, roles_per_user: int) -> List[SeededUser]:
+    run_id = uuid.uuid4().hex[:8]
+    scenarios = Scenarios(fixtures, [], random.Random(0))
+
+    async def _seed_user(index: int) -> SeededUser:
+        credentials = {"email": f"loadtest-{run_id}-{index}@example.com", "password": PASSWORD}
+        auth = await _seed_call(lambda: client.post("/auth/register", json=credentials))
+        user = SeededUser(email=credentials["email"], token=auth.json()["access_token"])
+        for role in range(roles_per_user):
+            jd = fixtures.job_descriptions[(index + role) % len(fixtures.job_descriptions)]
+            data = {"title": f"Seed role {role}", "jd_text": jd}
+            created = await _seed_call(lambda: client.post("/roles", headers=user.headers, data=data))
+            user.role_ids.append(created.json()["id"])
+        analysis = await _seed_call(lambda: scenarios.run(client, "analyze", user))
+        payload = {"analysis_id": analysis.json()["analysis_id"], "expires_in_days": 1}
+        share = await _seed_call(lambda: client.post("/share/create", headers=user.headers, json=payload))
+        user.share_tokens.append(share.json()["token"])
+        return user
+
+    return list(await asyncio.gather(*(_seed_user(index) for index in range(users))))
+
+
+def mix_plan(mix: Dict[str, float], users: int, rng: random.Random) -> Iterator[Tuple[str, int]]:
+    names, weights = list(mix), list(mix.values())
+    while True:
+        yield rng.choices(names, weights)[0], rng.randrange(users)
+
+
+def read_request_log(path: str) -> Tuple[List[Tuple[str, str]], Counter]:
+    """(scenario, original user) per replayable log line, in log order, plus counts of routes that were skipped."""
+    entries: List[Tuple[str, str]] = []
+    skipped: Counter = Counter()
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            start = line.find("{")
+            if start < 0:
+                continue
+            try:
+                record = json.loads(line[start:])
+            except ValueError:
+                continue
+            if not isinstance(record, dict) or "route" not in record or "method" not in record:
+                continue
+            scenario = classify(record["method"], record["route"])
+            if scenario is None:
+                skipped[f"{record['method']} {record['route']}"] += 1
+                continue
+            entries.append((scenario, str(record.get("user_id"))))
+    return entries, skipped
+
+
+def replay_plan(entries: List[Tuple[str, str]], users: int, loop: bool) -> Iterator[Tuple[str, int]]:
+    # Each user in the log keeps to one seeded user, so per-user traffic (and per-user limits) stay realistic.
+    mapping: Dict[str, int] = {}
+    while True:
+        for scenario, original_user in entries:
+            yield scenario, mapping.setdefault(original_user, len(mapping) % users)
+        if not loop:
+            return
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    scenarios: Scenarios,
+    plan: Iterator[Tuple[str, int]],
+    rate: float,
+    concurrency: int,
+    duration: Optional[float],
+    total: Optional[int],
+) -> Tuple[List[Sample], float]:
+    """
+    Open loop at `rate` requests/second (closed loop when 0), never more than `concurrency` in flight.
+    Latency is measured from when a request is sent, so time spent waiting for a free slot is not included.
+    """
+    samples: List[Sample] = []
+    slots = asyncio.Semaphore(concurrency)
+    tasks = set()
+    started = time.perf_counter()
+
+    async def _one(scenario: str, user: SeededUser):
+        sent = time.perf_counter()
+        try:
+            response = await scenarios.run(client, scenario, user)
+            samples.append(
+                Sample(scenario, response.status_code, (time.perf_counter() - sent) * 1000, parse_server_timing(response.headers.get("Server-Timing")))
+            )
+        except Exception as exc:
+            samples.append(Sample(scenario, 0, (time.perf_counter() - sent) * 1000, {}, error=type(exc).__name__))
+        finally:
+            slots.release()
+
+    for index, (scenario, user_index) in enumerate(plan):
+        if total is not None and index >= total:
+            break
+        if rate > 0:
+            delay = started + index / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if duration is not None and time.perf_counter() - started >= duration:
+            break
+        await slots.acquire()
+        task = asyncio.create_task(_one(scenario, scenarios.users[user_index]))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+    return samples, time.perf_counter() - started
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, math.ceil(percentile / 100 * len(values)) - 1))
+    return values[index]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict:
+    by_scenario: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_scenario[sample.scenario].append(sample)
+
+    def _stats(group: List[Sample]) -> Dict:
+        latencies = sorted(sample.latency_ms for sample in group)
+        errors = [sample for sample in group if not 200 <= sample.status < 400]
+        stages: Dict[str, List[float]] = defaultdict(list)
+        for sample in group:
+            for stage, ms in sample.stages_ms.items():
+                stages[stage].append(ms)
+        return {
+            "requests": len(group),
+            "throughput_rps": round(len(group) / elapsed, 3) if elapsed else 0.0,
+            "error_rate": round(len(errors) / len(group), 4) if group else 0.0,
+            "statuses": dict(Counter(str(sample.error or sample.status) for sample in group)),
+            **{f"p{p}_ms": round(_percentile(latencies, p), 2) for p in PERCENTILES},
+            "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+            "mean_stage_ms": {stage: round(sum(values) / len(values), 2) for stage, values in stages.items()},
+        }
+
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "overall": _stats(samples),
+        "routes": {scenario: _stats(group) for scenario, group in sorted(by_scenario.items())},
+    }
+
+
+def print_report(summary: Dict):
+    header = f"{'route':<14} {'reqs':>6} {'rps':>8} {'err%':>6} " + " ".join(f"{f'p{p} ms':>9}" for p in PERCENTILES) + f" {'max ms':>9}"
+    print(header)
+    for name, stats in [*summary["routes"].items(), ("overall", summary["overall"])]:
+        percentiles = " ".join(f"{stats[f'p{p}_ms']:>9.1f}" for p in PERCENTILES)
+        print(
+            f"{name:<14} {stats['requests']:>6} {stats['throughput_rps']:>8.2f} {stats['error_rate'] * 100:>6.1f} "
+            f"{percentiles} {stats['max_ms']:>9.1f}"
+        )
+    for name, stats in summary["routes"].items():
+        failures = {status: count for status, count in stats["statuses"].items() if not status.startswith(("2", "3"))}
+        if failures:
+            print(f"{name}: {failures}")
+
+
+def isolated_env(workdir: str, keep_rate_limits: bool) -> Dict[str, str]:
+    """Settings for a server owned by the harness: every store lives in `workdir`."""
+    env = {
+        "TALENTALIGN_DATABASE_URL": f"sqlite:///{workdir}/talentalign.db",
+        "TALENTALIGN_RATE_LIMIT_PATH": os.path.join(workdir, "ratelimit.db"),
+        "TALENTALIGN_RESULT_CACHE_PATH": os.path.join(workdir, "results.db"),
+        "TALENTALIGN_EMBED_CACHE_PATH": os.path.join(workdir, "embeddings.db"),
+        "TALENTALIGN_LEXICAL_MODEL_PATH": os.path.join(workdir, "lexical.pkl"),
+        "TALENTALIGN_INDEX_DIR": os.path.join(workdir, "index"),
+        "TALENTALIGN_METRICS_DIR": os.path.join(workdir, "metrics"),
+        "TALENTALIGN_PROFILE_DIR": os.path.join(workdir, "profiles"),
+    }
+    if not keep_rate_limits:
+        env["TALENTALIGN_RATE_LIMITS"] = "*=1000000/1"
+    return env
+
+
+@asynccontextmanager
+async def in_process_client(workdir: str, keep_rate_limits: bool, quiet: bool) -> AsyncIterator[httpx.AsyncClient]:
+    # Settings are read at import time, so the app is imported only after the environment is in place.
+    for key, value in isolated_env(workdir, keep_rate_limits).items():
+        os.environ.setdefault(key, value)
+    import logging
+
+    if quiet:
+        for name in ("talentalign", "httpx"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+            yield client
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def served_client(workdir: str, workers: int, keep_rate_limits: bool, quiet: bool) -> AsyncIterator[httpx.AsyncClient]:
+    port = _free_port()
+    env = {**os.environ, **isolated_env(workdir, keep_rate_limits)}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BACKEND_ROOT), env.get("PYTHONPATH")]))
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers)]
+    output = subprocess.DEVNULL if quiet else None
+    server = subprocess.Popen(command, cwd=workdir, env=env, stdout=output, stderr=output)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=None) as client:
+            await _wait_until_ready(client, server)
+            yield client
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+async def _wait_until_ready(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 120.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"uvicorn exited with status {server.returncode}")
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.5)
+    raise SystemExit("uvicorn did not become ready in time")
+
+
+@asynccontextmanager
+async def target_client(args: argparse.Namespace, workdir: str) -> AsyncIterator[httpx.AsyncClient]:
+    if args.target:
+        async with httpx.AsyncClient(base_url=args.target.rstrip("/"), timeout=None) as client:
+            yield client
+    elif args.serve:
+        async with served_client(workdir, args.workers, args.keep_rate_limits, not args.verbose) as client:
+            yield client
+    else:
+        async with in_process_client(workdir, args.keep_rate_limits, not args.verbose) as client:
+            yield client
+
+
+def parse_mix(raw: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for item in raw.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if not name:
+            continue
+        if name not in SCENARIOS:
+            raise SystemExit(f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise SystemExit("--mix needs at least one scenario with a positive weight")
+    return mix
+
+
+async def main_async(args: argparse.Namespace) -> Dict:
+    fixtures = Fixtures.build(CorpusSpec(resume_words=args.resume_words, jd_words=args.jd_words, seed=args.seed))
+    rng = random.Random(args.seed)
+    skipped: Counter = Counter()
+    if args.replay:
+        entries, skipped = read_request_log(args.replay)
+        if not entries:
+            raise SystemExit(f"no replayable requests in {args.replay}")
+        plan = replay_plan(entries, args.users, loop=args.duration is not None)
+        mix = dict(Counter(scenario for scenario, _ in entries))
+    else:
+        mix = parse_mix(args.mix)
+        plan = mix_plan(mix, args.users, rng)
+    total = args.requests
+    if total is None and args.duration is None and not args.replay:
+        total = 200
+
+    with tempfile.TemporaryDirectory(prefix="talentalign-load-") as workdir:
+        async with target_client(args, workdir) as client:
+            users = await seed(client, fixtures, args.users, args.roles_per_user)
+            samples, elapsed = await drive(client, Scenarios(fixtures, users, rng), plan, args.rate, args.concurrency, args.duration, total)
+
+    summary = summarize(samples, elapsed)
+    summary["meta"] = {
+        "target": args.target or ("uvicorn" if args.serve else "in-process"),
+        "workers": args.workers if args.serve else None,
+        "rate": args.rate,
+        "concurrency": args.concurrency,
+        "users": args.users,
+        "mix": mix,
+        "replay": args.replay,
+        "skipped_log_routes": dict(skipped),
+    }
+    return summary
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest", description=__doc__.strip().splitlines()[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--target", help="base URL of a running server (default: the app in-process)")
+    target.add_argument("--serve", action="store_true", help="start a local uvicorn on a throwaway database")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes with --serve")
+    parser.add_argument("--rate", type=float, default=0.0, help="requests per second; 0 sends as fast as concurrency allows")
+    parser.add_argument("--concurrency", type=int, default=8, help="maximum requests in flight")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--requests", type=int, help="stop after this many requests (default 200 without --duration)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"weighted scenarios, from: {', '.join(SCENARIOS)}")
+    parser.add_argument("--replay", help="request log to replay; its traffic mix and per-user order are preserved")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--roles-per-user", type=int, default=5)
+    parser.add_argument("--resume-words", type=int, default=800)
+    parser.add_argument("--jd-words", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--keep-rate-limits", action="store_true", help="keep the default limits on harness-owned servers")
+    parser.add_argument("--output", help="write the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="show server logs")
+    args = parser.parse_args(argv)
+    if args.users < 1 or args.roles_per_user < 1 or args.concurrency < 1:
+        parser.error("--users, --roles-per-user and --concurrency must be at least 1")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    summary = asyncio.run(main_async(args))
+    print_report(summary)
+    if summary["meta"]["skipped_log_routes"]:
+        print(f"skipped log routes: {summary['meta']['skipped_log_routes']}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(summary, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+"""
+Microbenchmarks for the analysis services.
+
+    cd backend
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --baseline bench.json          # exit 1 on regression
+
+Every backend runs in its own interpreter so module-level settings (embedding backend, caches) are
+picked up cleanly. Caches are disabled so repeated iterations measure the real work.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .corpus import CorpusSpec, SyntheticCorpus, docx_bytes, pdf_bytes
+
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+SIZES = {
+    "small": (250, 150),
+    "medium": (800, 400),
+    "large": (3000, 1200),
+}
+BACKENDS = ("tfidf", "lexical", "transformer")
+# Documents used to fit the lexical model; above TALENTALIGN_LEXICAL_MIN_DOCUMENTS.
+LEXICAL_CORPUS_SIZE = 60
+BATCH_ROLES = 10
+RESULTS_VERSION = 1
+
+Timings = Dict[str, float]
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 1) -> Timings:
+    for _ in range(warmup):
+        fn()
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "min_ms": round(samples[0], 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "repeat": repeat,
+    }
+
+
+def worker_env(backend: str, workdir: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        {
+            "TALENTALIGN_EMBED_CACHE_PATH": "",
+            "TALENTALIGN_EMBED_CACHE_MEMORY_ITEMS": "0",
+            "TALENTALIGN_RESULT_CACHE_PATH": "",
+            "TALENTALIGN_METRICS_DIR": "",
+            "TALENTALIGN_DATABASE_URL": f"sqlite:///{workdir}/bench.db",
+            "TALENTALIGN_LEXICAL_MODEL_PATH": os.path.join(workdir, f"{backend}-lexical.pkl"),
+            "TALENTALIGN_ENABLE_ST": "1" if backend == "transformer" else "0",
+            "PYTHONPATH": os.pathsep.join(filter(None, [str(BACKEND_ROOT), env.get("PYTHONPATH")])),
+        }
+    )
+    if backend == "transformer":
+        # Offline only: use the locally cached model or skip the backend.
+        env.setdefault("HF_HUB_OFFLINE", "1")
+        env.setdefault("TRANSFORMERS_OFFLINE", "1")
+    return env
+
+
+def _core_benchmarks(corpus: SyntheticCorpus, size: str, repeat: int) -> Dict[str, Timings]:
+    from app.services.document_features import extract_document_features
+    from app.services.resume_parser import extract_text_from_bytes, split_sentences
+    from app.services.skill_extractor import extract_skills
+
+    resume = corpus.resume(0)
+    pdf = pdf_bytes(resume)
+    docx = docx_bytes(resume)
+    return {
+        f"core.split_sentences[{size}]": measure(lambda: split_sentences(resume), repeat),
+        f"core.extract_skills[{size}]": measure(lambda: extract_skills(resume), repeat),
+        f"core.extract_document_features[{size}]": measure(lambda: extract_document_features(resume), repeat),
+        f"core.extract_pdf[{size}]": measure(lambda: extract_text_from_bytes(pdf, "pdf"), repeat),
+        f"core.extract_docx[{size}]": measure(lambda: extract_text_from_bytes(docx, "docx"), repeat),
+    }
+
+
+def _backend_benchmarks(backend: str, corpus: SyntheticCorpus, size: str, repeat: int) -> Dict[str, Timings]:
+    from app.services.analysis_engine import run_analysis, run_batch_analysis
+    from app.services.document_features import AnalysisPlan, extract_document_features
+    from app.services.insights_generator import build_heatmap
+
+    resume = corpus.resume(0)
+    jd = corpus.job_description(0)
+    resume_features = extract_document_features(resume)
+    jd_features = extract_document_features(jd)
+    role_features = [extract_document_features(text) for text in corpus.job_descriptions(BATCH_ROLES)]
+    # Drop vectors from the previous iteration so every run pays for its embedding.
+    fresh = lambda doc: replace(doc, model_id=None, doc_embedding=None, sentence_embeddings=None)
+    embedded_resume, embedded_jd = AnalysisPlan([fresh(resume_features), fresh(jd_features)]).embed()
+
+    def _heatmap():
+        return build_heatmap(
+            embedded_resume.sentences,
+            embedded_jd.sentences,
+            embedded_resume.sentence_embeddings,
+            embedded_jd.sentence_embeddings,
+        )
+
+    def _batch():
+        return run_batch_analysis(fresh(resume_features), [fresh(doc) for doc in role_features])
+
+    prefix = f"{backend}."
+    return {
+        f"{prefix}analysis_plan_embed[{size}]": measure(lambda: AnalysisPlan([fresh(resume_features), fresh(jd_features)]).embed(), repeat),
+        f"{prefix}build_heatmap[{size}]": measure(_heatmap, repeat),
+        f"{prefix}run_analysis[{size}]": measure(lambda: run_analysis(resume, jd), repeat),
+        f"{prefix}run_batch_analysis[{size}x{BATCH_ROLES}]": measure(_batch, repeat),
+    }
+
+
+def _prepare_backend(backend: str, spec: CorpusSpec) -> Optional[str]:
+    """Returns why the backend cannot run here, or None when it is active."""
+    if backend == "lexical":
+        from app.services.lexical_model import LEXICAL_MODEL_PATH, fit_lexical_model, save_lexical_model
+
+        corpus = SyntheticCorpus(replace(spec, seed=spec.seed + 1))
+        half = LEXICAL_CORPUS_SIZE // 2
+        model = fit_lexical_model([*corpus.resumes(half), *corpus.job_descriptions(half)])
+        if model is None:
+            return "lexical model could not be fitted on the synthetic corpus"
+        save_lexical_model(model, LEXICAL_MODEL_PATH)
+
+    from app.services.embedding_engine import embedding_model_id, get_model
+
+    if backend == "transformer" and get_model() is None:
+        return "sentence-transformers or its model is not available offline"
+    model_id = embedding_model_id()
+    expected = {"tfidf": None, "lexical": "tfidf:", "transformer": "st:"}[backend]
+    if expected is None and model_id is None:
+        return None
+    if expected is not None and model_id is not None and model_id.startswith(expected):
+        return None
+    if backend == "transformer":
+        return "sentence-transformers or its model is not available offline"
+    return f"unexpected embedding model {model_id!r}"
+
+
+def run_worker(backend: str, specs: Dict[str, CorpusSpec], repeat: int) -> Dict:
+    if backend == "core":
+        results: Dict[str, Timings] = {}
+        for size, spec in specs.items():
+            results.update(_core_benchmarks(SyntheticCorpus(spec), size, repeat))
+        return {"results": results}
+
+    reason = _prepare_backend(backend, next(iter(specs.values())))
+    if reason is not None:
+        return {"skipped": reason}
+    results = {}
+    for size, spec in specs.items():
+        results.update(_backend_benchmarks(backend, SyntheticCorpus(spec), size, repeat))
+    return {"results": results}
+
+
+def spawn_worker(backend: str, args: argparse.Namespace, workdir: str) -> Dict:
+    command = [sys.executable, "-m", "benchmarks.run", "--worker", backend, *_forwarded(args)]
+    completed = subprocess.run(
+        command, cwd=workdir, env=worker_env(backend, workdir), capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        return {"skipped": f"worker failed: {completed.stderr.strip().splitlines()[-1:] or completed.returncode}"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _forwarded(args: argparse.Namespace) -> List[str]:
+    forwarded = ["--sizes", args.sizes, "--repeat", str(args.repeat), "--seed", str(args.seed)]
+    forwarded += ["--skill-density", str(args.skill_density)]
+    if args.resume_words:
+        forwarded += ["--resume-words", str(args.resume_words)]
+    if args.jd_words:
+        forwarded += ["--jd-words", str(args.jd_words)]
+    return forwarded
+
+
+def corpus_specs(args: argparse.Namespace) -> Dict[str, CorpusSpec]:
+    specs: Dict[str, CorpusSpec] = {}
+    for size in [s.strip() for s in args.sizes.split(",") if s.strip()]:
+        if size not in SIZES:
+            raise SystemExit(f"unknown size {size!r}; choose from {', '.join(SIZES)}")
+        resume_words, jd_words = SIZES[size]
+        specs[size] = CorpusSpec(
+            resume_words=args.resume_words or resume_words,
+            jd_words=args.jd_words or jd_words,
+            skill_density=args.skill_density,
+            seed=args.seed,
+        )
+    return specs
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float, min_delta_ms: float) -> List[Dict]:
+    """Benchmarks whose median got slower than the baseline by more than `tolerance` (and `min_delta_ms`)."""
+    regressions = []
+    for name, timing in sorted(current["results"].items()):
+        before = baseline.get("results", {}).get(name)
+        if before is None or not before["median_ms"]:
+            continue
+        ratio = timing["median_ms"] / before["median_ms"]
+        if ratio > 1 + tolerance and timing["median_ms"] - before["median_ms"] > min_delta_ms:
+            regressions.append(
+                {"name": name, "baseline_ms": before["median_ms"], "current_ms": timing["median_ms"], "ratio": round(ratio, 3)}
+            )
+    return regressions
+
+
+def print_report(report: Dict, baseline: Optional[Dict]):
+    width = max((len(name) for name in report["results"]), default=20)
+    print(f"{'benchmark':<{width}}  {'median ms':>10}  {'p95 ms':>10}  {'baseline':>10}  {'change':>8}")
+    for name, timing in sorted(report["results"].items()):
+        before = (baseline or {}).get("results", {}).get(name)
+        reference = f"{before['median_ms']:>10.3f}" if before else f"{'-':>10}"
+        change = f"{(timing['median_ms'] / before['median_ms'] - 1) * 100:>+7.1f}%" if before and before["median_ms"] else f"{'-':>8}"
+        print(f"{name:<{width}}  {timing['median_ms']:>10.3f}  {timing['p95_ms']:>10.3f}  {reference}  {change}")
+    for backend, reason in report["skipped"].items():
+        print(f"skipped {backend}: {reason}")
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="comma separated: tfidf, lexical, transformer")
+    parser.add_argument("--sizes", default="small,medium", help=f"comma separated corpus presets: {', '.join(SIZES)}")
+    parser.add_argument("--resume-words", type=int, default=0, help="override the resume length of every preset")
+    parser.add_argument("--jd-words", type=int, default=0, help="override the JD length of every preset")
+    parser.add_argument("--skill-density", type=float, default=0.5, help="share of skill slots filled with taxonomy skills")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="compare against a saved results file and exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown of the median, as a fraction")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="ignore slowdowns smaller than this")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    specs = corpus_specs(args)
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, specs, args.repeat)))
+        return 0
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    unknown = set(backends) - set(BACKENDS)
+    if unknown:
+        raise SystemExit(f"unknown backend(s): {', '.join(sorted(unknown))}")
+
+    report = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "corpus": {size: asdict(spec) for size, spec in specs.items()},
+        },
+        "results": {},
+        "skipped": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="talentalign-bench-") as workdir:
+        for backend in ["core", *backends]:
+            outcome = spawn_worker(backend, args, workdir)
+            report["results"].update(outcome.get("results", {}))
+            if "skipped" in outcome:
+                report["skipped"][backend] = outcome["skipped"]
+
+    baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else None
+    print_report(report, baseline)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, sort_keys=True))
+
+    if baseline is None:
+        return 0
+    regressions = compare(report, baseline, args.tolerance, args.min_delta_ms)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['name']}: {regression['baseline_ms']:.3f} ms -> "
+            f"{regression['current_ms']:.3f} ms (x{regression['ratio']})"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
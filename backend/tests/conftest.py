@@ -0,0 +1,65 @@
+import os
+import tempfile
+import uuid
+
+import pytest
+
+# Everything the app writes goes to a throwaway directory and every pool runs in-process; this has to be in
+# place before the app is imported because settings are read at import time.
+WORKDIR = tempfile.mkdtemp(prefix="talentalign-tests-")
+os.environ.update(
+    {
+        "TALENTALIGN_DATABASE_URL": f"sqlite:///{WORKDIR}/test.db",
+        "TALENTALIGN_EMBED_CACHE_PATH": "",
+        "TALENTALIGN_RESULT_CACHE_PATH": "",
+        "TALENTALIGN_RATE_LIMIT_PATH": "",
+        "TALENTALIGN_RATE_LIMITS": "*=100000/60",
+        "TALENTALIGN_METRICS_DIR": "",
+        "TALENTALIGN_LEXICAL_MODEL_PATH": os.path.join(WORKDIR, "lexical.pkl"),
+        "TALENTALIGN_INDEX_DIR": os.path.join(WORKDIR, "index"),
+        "TALENTALIGN_PROFILE_DIR": os.path.join(WORKDIR, "profiles"),
+        "TALENTALIGN_ANALYSIS_WORKERS": "0",
+        "TALENTALIGN_EXTRACT_WORKERS": "0",
+        "TALENTALIGN_JOB_WORKERS": "0",
+        "TALENTALIGN_SHARE_PURGE_SECONDS": "0",
+        "TALENTALIGN_ENABLE_ST": "0",
+    }
+)
+
+RESUME = (
+    "Jane Doe jane.doe@example.com 555-123-4567. Senior engineer with Python, FastAPI, Docker and Kubernetes experience. "
+    "Built machine learning pipelines with pandas and numpy on AWS. Led agile teams and improved communication. "
+    "Designed REST microservices backed by PostgreSQL and Redis. Deployed CI/CD with git and linux tooling. "
+) * 3
+JD = (
+    "We are hiring a backend engineer. Must know Python, Django, PostgreSQL and AWS. Experience with Kubernetes and "
+    "Docker is required. Familiarity with machine learning, Spark and Airflow is a plus. Strong communication skills. "
+) * 3
+
+
+def pdf_bytes(text: str) -> bytes:
+    import fitz
+
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_textbox(fitz.Rect(40, 40, 560, 800), text, fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers(client):
+    """A fresh user per test, so stored roles, candidates and analyses never leak between tests."""
+    response = client.post("/auth/register", json={"email": f"{uuid.uuid4().hex}@example.com", "password": "password123"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
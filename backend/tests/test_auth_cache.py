@@ -0,0 +1,93 @@
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from app import auth
+from app.auth import AuthIdentity, _IdentityCache, verify_token
+from app.database import SessionLocal, engine
+from app.models import User
+
+
+@pytest.fixture
+def account(client):
+    email = f"{uuid.uuid4().hex}@example.com"
+    response = client.post("/auth/register", json={"email": email, "password": "password123"})
+    token = response.json()["access_token"]
+    return email, token, {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def user_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_token_is_decoded_once(account, monkeypatch):
+    _, token, _ = account
+    decode, calls = auth.jwt.decode, []
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+
+    first, second = verify_token(token), verify_token(token)
+    assert first == second and first.sub == account[0]
+    assert calls == [token]
+    assert verify_token(token + "x") is None
+
+
+def test_hot_token_skips_the_user_lookup(client, account, user_queries):
+    email, _, headers = account
+    first = client.get("/auth/me", headers=headers)
+    assert first.status_code == 200
+    looked_up = len(user_queries)
+
+    second = client.get("/auth/me", headers=headers)
+    assert second.json() == first.json() == {"id": first.json()["id"], "email": email}
+    assert len(user_queries) == looked_up
+
+
+@pytest.mark.parametrize("change", ["update", "delete"])
+def test_changed_user_drops_cached_tokens(client, account, change):
+    email, token, headers = account
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    assert auth._identities.get(token).user_id is not None
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == email).one()
+        if change == "update":
+            user.email = f"renamed-{email}"
+        else:
+            db.delete(user)
+        db.commit()
+    finally:
+        db.close()
+
+    assert auth._identities.get(token) is None
+    # The token's subject no longer resolves to a user.
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+
+def test_identity_cache_is_bounded_and_expires():
+    cache = _IdentityCache(max_items=2, ttl_seconds=60)
+    far = auth.time.time() + 3600
+    for token in ("a", "b"):
+        cache.put(token, AuthIdentity(sub=token, expires_at=far))
+    assert cache.get("a") is not None  # a is now the most recently used
+    cache.put("c", AuthIdentity(sub="c", expires_at=far))
+    assert [cache.get(token) is not None for token in ("a", "b", "c")] == [True, False, True]
+
+    # Entries never outlive the token itself.
+    cache.put("d", AuthIdentity(sub="d", expires_at=auth.time.time() - 1))
+    assert cache.get("d") is None
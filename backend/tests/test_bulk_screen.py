@@ -0,0 +1,93 @@
+import io
+import json
+import zipfile
+
+from conftest import JD, RESUME, pdf_bytes
+
+from app.database import SessionLocal
+from app.models import AnalysisRecord
+from app.routes import match
+
+OTHER_RESUME = (
+    "Sam Poe, platform engineer. Runs Kubernetes and Docker on AWS, automates with Python and Airflow, "
+    "tunes PostgreSQL and Spark jobs, and mentors through clear communication. "
+) * 3
+
+
+def _zip(entries) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def _screen(client, headers, role_id, files):
+    response = client.post("/match/bulk-screen", data={"role_id": str(role_id)}, files=files, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_bulk_screen_streams_results_errors_and_persisted_batches(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(match, "BULK_PERSIST_BATCH", 2)
+    role_id = client.post("/roles", data={"title": "Backend", "jd_text": JD}, headers=auth_headers).json()["id"]
+    archive = _zip(
+        {
+            "batch/jane.pdf": pdf_bytes(RESUME),
+            "batch/sam.pdf": pdf_bytes(OTHER_RESUME),
+            "batch/notes.txt": b"not a resume",
+            "__MACOSX/._jane.pdf": b"",
+        }
+    )
+    files = [
+        ("resume_files", ("resumes.zip", archive, "application/zip")),
+        ("resume_files", ("loose.pdf", pdf_bytes(RESUME), "application/pdf")),
+    ]
+    rows = _screen(client, auth_headers, role_id, files)
+
+    by_type = {}
+    for row in rows:
+        by_type.setdefault(row["type"], []).append(row)
+    summary = rows[-1]
+    assert summary["type"] == "summary" and summary["role_title"] == "Backend"
+    assert (summary["processed"], summary["failed"], summary["truncated"]) == (3, 1, False)
+    assert {row["filename"] for row in by_type["result"]} == {"batch/jane.pdf", "batch/sam.pdf", "loose.pdf"}
+    assert [row["filename"] for row in by_type["error"]] == ["batch/notes.txt"]
+
+    # Two persisted batches (2 + 1), each pointing at a stored analysis for a streamed result.
+    assert [len(row["items"]) for row in by_type["persisted"]] == [2, 1]
+    persisted = {item["index"]: item["analysis_id"] for row in by_type["persisted"] for item in row["items"]}
+    scores = {row["index"]: row["score"] for row in by_type["result"]}
+    assert set(persisted) == set(scores)
+    db = SessionLocal()
+    try:
+        for index, analysis_id in persisted.items():
+            assert db.get(AnalysisRecord, analysis_id).score == scores[index]
+    finally:
+        db.close()
+
+    # The same resume scores the same in bulk as through /match/analyze.
+    analyzed = client.post(
+        "/match/analyze",
+        files={"resume_file": ("resume.pdf", pdf_bytes(RESUME), "application/pdf")},
+        data={"jd_text": JD},
+        headers=auth_headers,
+    ).json()
+    jane = next(row for row in by_type["result"] if row["filename"] == "loose.pdf")
+    assert jane["score"] == analyzed["score"]
+
+
+def test_bulk_screen_reports_truncation(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(match, "BULK_MAX_FILES", 2)
+    role_id = client.post("/roles", data={"title": "Backend", "jd_text": JD}, headers=auth_headers).json()["id"]
+    archive = _zip({f"r{i}.pdf": pdf_bytes(RESUME) for i in range(3)})
+    rows = _screen(client, auth_headers, role_id, [("resume_files", ("resumes.zip", archive, "application/zip"))])
+    summary = rows[-1]
+    assert summary["processed"] == 2 and summary["truncated"] is True
+
+
+def test_bulk_screen_requires_an_owned_role(client, auth_headers):
+    files = [("resume_files", ("r.pdf", pdf_bytes(RESUME), "application/pdf"))]
+    response = client.post("/match/bulk-screen", data={"role_id": "999999"}, files=files, headers=auth_headers)
+    assert response.status_code == 404
@@ -0,0 +1,88 @@
+import uuid
+
+import pytest
+
+from app.database import SessionLocal
+from app.models import CandidateProfile
+from app.services import lexical_model
+from app.services.analysis_engine import run_analysis
+from app.services.lexical_model import fit_lexical_model
+
+from conftest import JD, RESUME, pdf_bytes
+
+OTHER_RESUME = (
+    "John Roe, data analyst. Built dashboards in Tableau and Power BI on top of SQL warehouses. "
+    "Wrote Python and pandas reports, trained scikit-learn models and presented results to stakeholders. "
+) * 4
+
+
+def _create_role(client, headers) -> int:
+    response = client.post("/roles", data={"title": "Backend", "jd_text": JD}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def _analyze(client, headers, resume: str) -> dict:
+    files = {"resume_file": ("resume.pdf", pdf_bytes(resume), "application/pdf")}
+    response = client.post("/match/analyze", files=files, data={"jd_text": JD}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _candidates(client, headers, role_id: int) -> list:
+    response = client.get(f"/roles/{role_id}/candidates", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["items"]
+
+
+def test_candidate_score_equals_analyze_score_on_tfidf_fallback(client, auth_headers):
+    role_id = _create_role(client, auth_headers)
+    analyzed = [_analyze(client, auth_headers, resume) for resume in (RESUME, OTHER_RESUME)]
+
+    items = _candidates(client, auth_headers, role_id)
+    assert sorted(item["score"] for item in items) == sorted(result["score"] for result in analyzed)
+    assert [item["score"] for item in items] == sorted((item["score"] for item in items), reverse=True)
+    assert all(item["semantic_similarity"] is not None for item in items)
+
+
+def test_candidates_stored_without_vectors_are_backfilled(client, auth_headers, monkeypatch):
+    role_id = _create_role(client, auth_headers)
+    first = _analyze(client, auth_headers, RESUME)
+
+    # A stable model appears after the first candidate was stored without vectors.
+    corpus = [f"{text} Document {i}." for i in range(12) for text in (RESUME, JD, OTHER_RESUME)]
+    monkeypatch.setattr(lexical_model._holder, "model", fit_lexical_model(corpus))
+    second = _analyze(client, auth_headers, OTHER_RESUME)
+
+    db = SessionLocal()
+    try:
+        first_text = (
+            db.query(CandidateProfile.resume_text).filter(CandidateProfile.latest_analysis_id == first["analysis_id"]).scalar()
+        )
+    finally:
+        db.close()
+
+    items = _candidates(client, auth_headers, role_id)
+    assert len(items) == 2
+    assert all(item["semantic_similarity"] is not None for item in items)
+    # Stored vectors are float16, so scores agree to within rounding rather than bit for bit.
+    scores = sorted(item["score"] for item in items)
+    assert scores == pytest.approx(sorted([run_analysis(first_text, JD)["score"], second["score"]]), abs=0.05)
+
+
+def test_snapshot_cache_evicts_least_recently_used_owner(client, monkeypatch):
+    from app.services import candidate_store
+
+    monkeypatch.setattr(candidate_store, "SNAPSHOT_CACHE_ITEMS", 1)
+    before = candidate_store.snapshot_cache_stats()["evictions"]
+    for _ in range(2):
+        response = client.post("/auth/register", json={"email": f"{uuid.uuid4().hex}@example.com", "password": "password123"})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        role_id = _create_role(client, headers)
+        _analyze(client, headers, RESUME)
+        assert len(_candidates(client, headers, role_id)) == 1
+
+    stats = candidate_store.snapshot_cache_stats()
+    assert stats["items"] == 1
+    assert stats["evictions"] > before
+    assert stats["bytes"] == sum(snapshot.nbytes for snapshot in candidate_store._snapshots.values())
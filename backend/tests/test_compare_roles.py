@@ -0,0 +1,48 @@
+import json
+from types import SimpleNamespace
+
+from conftest import JD, RESUME, pdf_bytes
+
+from app.services import offload
+from app.services.result_cache import get_result_cache
+from app.services.task_pool import get_task_pool
+
+ROLE_SKILLS = ["Tableau", "Spark and Airflow", "React", "Go and gRPC", "Terraform", "Java and Spring", "Redis", "NLP"]
+
+
+def _compare(client, headers, role_ids, adhoc):
+    response = client.post(
+        "/match/compare-roles",
+        files={"resume_file": ("resume.pdf", pdf_bytes(RESUME), "application/pdf")},
+        data={"role_profile_ids_json": json.dumps(role_ids), "adhoc_jds_json": json.dumps(adhoc)},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    return [(item["role_title"], item["score"]) for item in response.json()["ranked"]]
+
+
+def test_chunked_comparison_matches_single_batch(client, auth_headers, monkeypatch):
+    role_ids = []
+    for i, skills in enumerate(ROLE_SKILLS[:4]):
+        response = client.post("/roles", data={"title": f"Role {i}", "jd_text": f"{JD} {skills} wanted."}, headers=auth_headers)
+        role_ids.append(response.json()["id"])
+    adhoc = [{"title": f"Adhoc {i}", "jd_text": f"{JD} {skills} preferred."} for i, skills in enumerate(ROLE_SKILLS[4:])]
+
+    single = _compare(client, auth_headers, role_ids, adhoc)
+    get_result_cache().clear()
+
+    chunks = []
+    offload_score_against = offload.score_against
+
+    def counting_score_against(resume, jds, mode):
+        chunks.append((type(resume).__name__, len(jds)))
+        return offload_score_against(resume, jds, mode)
+
+    monkeypatch.setattr(offload, "COMPARE_MIN_CHUNK", 2)
+    monkeypatch.setattr(offload, "score_against", counting_score_against)
+    monkeypatch.setattr(offload, "get_task_pool", lambda: SimpleNamespace(workers=3, run=get_task_pool().run))
+    chunked = _compare(client, auth_headers, role_ids, adhoc)
+
+    assert chunked == single
+    # The resume is prepared once up front, then each chunk gets its features rather than the raw text.
+    assert chunks == [("DocumentFeatures", 3), ("DocumentFeatures", 3), ("DocumentFeatures", 2)]
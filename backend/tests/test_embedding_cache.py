@@ -0,0 +1,50 @@
+import numpy as np
+
+from app.services.embedding_cache import EmbeddingCache
+
+
+class Encoder:
+    def __init__(self):
+        self.seen = []
+
+    def __call__(self, texts):
+        self.seen.extend(texts)
+        return np.array([[len(text), text.count("a"), 1.0] for text in texts], dtype=np.float32)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache, encode = EmbeddingCache(memory_items=2, disk_items=0, path=None), Encoder()
+    cache.get_or_compute("m", ["alpha", "beta"], encode)
+    cache.get_or_compute("m", ["alpha"], encode)  # alpha is now the most recently used
+    cache.get_or_compute("m", ["gamma"], encode)  # evicts beta
+    encode.seen.clear()
+
+    vectors = cache.get_or_compute("m", ["alpha", "beta"], encode)
+    assert encode.seen == ["beta"]
+    assert vectors.dtype == np.float32 and vectors.tolist() == [[5, 2, 1], [4, 1, 1]]
+    stats = cache.stats()
+    assert stats["memory_items"] == 2 and stats["memory_evictions"] == 2
+
+
+def test_keys_are_scoped_by_model_and_normalised_whitespace():
+    cache, encode = EmbeddingCache(memory_items=10, disk_items=0, path=None), Encoder()
+    cache.get_or_compute("m", ["hello  world", "hello world"], encode)
+    cache.get_or_compute("other", ["hello world"], encode)
+    assert encode.seen == ["hello  world", "hello world"]
+
+
+def test_disk_tier_survives_restarts_and_evicts_oldest(tmp_path):
+    path = str(tmp_path / "embeddings.db")
+    cache, encode = EmbeddingCache(memory_items=1, disk_items=20, path=path), Encoder()
+    texts = [f"text {i}" for i in range(25)]
+    for text in texts:
+        cache.get_or_compute("m", [text], encode)
+    stats = cache.stats()
+    assert stats["disk_evictions"] > 0 and stats["disk_items"] <= 20
+
+    reopened, encode = EmbeddingCache(memory_items=1, disk_items=20, path=path), Encoder()
+    reopened.get_or_compute("m", texts[-5:], encode)
+    assert encode.seen == []
+    assert reopened.stats()["disk_hits"] == 5
+    reopened.get_or_compute("m", texts[:1], encode)
+    assert encode.seen == texts[:1]
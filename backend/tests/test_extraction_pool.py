@@ -0,0 +1,24 @@
+import asyncio
+import time
+
+from conftest import RESUME, pdf_bytes
+
+from app.services.extraction_pool import ExtractionLimits, ExtractionPool
+
+
+def test_warm_up_starts_a_worker_per_driver_thread():
+    pool = ExtractionPool(2, 4, ExtractionLimits(), max_jobs_per_worker=10)
+    try:
+        pool.warm_up()
+        deadline = time.monotonic() + 20
+        while len(pool._live) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        warmed = set(pool._live)
+        assert len(warmed) == 2 and all(worker.alive() for worker in warmed)
+
+        text = asyncio.run(pool.extract(pdf_bytes(RESUME), "pdf"))
+        assert "Jane Doe" in text
+        # The upload reused a warmed worker instead of spawning one.
+        assert pool._live == warmed
+    finally:
+        pool.shutdown()
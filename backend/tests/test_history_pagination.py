@@ -0,0 +1,127 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database import SessionLocal
+from app.models import AnalysisRecord, User
+from app.services.analysis_store import analysis_columns
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def owner(client):
+    email = f"{uuid.uuid4().hex}@example.com"
+    response = client.post("/auth/register", json={"email": email, "password": "password123"})
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.id).filter(User.email == email).scalar()
+    finally:
+        db.close()
+    return user_id, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _seed(user_id, rows):
+    """rows: (score, created_at, mode, role_title). Returns the ids in insertion order."""
+    db = SessionLocal()
+    try:
+        records = [
+            AnalysisRecord(
+                owner_user_id=user_id,
+                mode=mode,
+                role_title=role_title,
+                created_at=created_at,
+                **analysis_columns({"score": score, "input_metadata": {"role_title": role_title}}),
+            )
+            for score, created_at, mode, role_title in rows
+        ]
+        db.add_all(records)
+        db.commit()
+        return [record.id for record in records]
+    finally:
+        db.close()
+
+
+def _walk(client, headers, **params):
+    ids, cursor = [], None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/match/history", params=query, headers=headers)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page["items"]) <= params["limit"]
+        ids.extend(item["analysis_id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_pages_through_score_ties_without_gaps_or_repeats(client, owner):
+    user_id, headers = owner
+    scores = [50.0, 50.0, 70.0, 50.0, 30.0, 70.0, 50.0]
+    ids = _seed(user_id, [(score, T0 + timedelta(minutes=i), "standard", "Backend") for i, score in enumerate(scores)])
+    by_score = dict(zip(ids, scores))
+
+    walked = _walk(client, headers, sort="score", order="desc", limit=2)
+    assert walked == sorted(ids, key=lambda record_id: (-by_score[record_id], -record_id))
+
+    walked = _walk(client, headers, sort="score", order="asc", limit=3)
+    assert walked == sorted(ids, key=lambda record_id: (by_score[record_id], record_id))
+
+
+def test_pages_through_created_at_ties(client, owner):
+    user_id, headers = owner
+    times = [T0, T0, T0 + timedelta(seconds=1), T0, T0 - timedelta(seconds=1), T0]
+    ids = _seed(user_id, [(60.0, created_at, "standard", "Backend") for created_at in times])
+    by_time = dict(zip(ids, times))
+
+    assert _walk(client, headers, sort="created_at", order="desc", limit=2) == sorted(
+        ids, key=lambda record_id: (by_time[record_id], record_id), reverse=True
+    )
+    assert _walk(client, headers, sort="created_at", order="asc", limit=4) == sorted(
+        ids, key=lambda record_id: (by_time[record_id], record_id)
+    )
+
+
+def test_cursor_from_another_sort_is_rejected(client, owner):
+    user_id, headers = owner
+    _seed(user_id, [(float(score), T0, "standard", "Backend") for score in range(5)])
+    page = client.get("/match/history", params={"sort": "score", "limit": 2}, headers=headers).json()
+    cursor = page["next_cursor"]
+    assert cursor
+
+    for params in ({"sort": "created_at"}, {"sort": "score", "order": "asc"}):
+        response = client.get("/match/history", params={**params, "cursor": cursor}, headers=headers)
+        assert response.status_code == 400
+    assert client.get("/match/history", params={"cursor": "not-a-cursor"}, headers=headers).status_code == 400
+    assert client.get("/match/history", params={"sort": "score", "cursor": cursor}, headers=headers).status_code == 200
+
+
+def test_filters_apply_on_every_page(client, owner):
+    user_id, headers = owner
+    rows = []
+    for i in range(12):
+        mode = "strict" if i % 3 == 0 else "standard"
+        role_title = "Backend" if i % 2 == 0 else "Data"
+        rows.append((40.0 + (i % 4) * 10, T0 + timedelta(minutes=i // 2), mode, role_title))
+    ids = _seed(user_id, rows)
+    created_from = T0 + timedelta(minutes=1)
+    expected = [
+        record_id
+        for record_id, (score, created_at, mode, role_title) in zip(ids, rows)
+        if mode == "standard" and role_title == "Backend" and score >= 50 and created_at >= created_from
+    ]
+    by_row = dict(zip(ids, rows))
+
+    walked = _walk(
+        client,
+        headers,
+        sort="score",
+        limit=1,
+        analysis_mode="standard",
+        role_title="Backend",
+        min_score=50,
+        created_from=created_from.isoformat(),
+    )
+    assert expected and walked == sorted(expected, key=lambda record_id: (-by_row[record_id][0], -record_id))
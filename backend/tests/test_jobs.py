@@ -0,0 +1,129 @@
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database import SessionLocal
+from app.models import Job, User
+from app.services.jobs import _finish, claim_next_job, enqueue_job, process_next_job, renew_lease
+
+from conftest import JD, RESUME
+
+
+@pytest.fixture
+def owner_id(client):
+    email = f"{uuid.uuid4().hex}@example.com"
+    client.post("/auth/register", json={"email": email, "password": "password123"})
+    db = SessionLocal()
+    try:
+        # Claims take the oldest claimable job, so nothing left over from another test may be ahead of ours.
+        db.query(Job).filter(Job.status.in_(["queued", "running"])).update({Job.status: "failed"}, synchronize_session=False)
+        db.commit()
+        return db.query(User.id).filter(User.email == email).scalar()
+    finally:
+        db.close()
+
+
+def _enqueue(owner_id: int) -> int:
+    db = SessionLocal()
+    try:
+        payload = {"resume_text": RESUME, "job_description": JD, "mode": "standard"}
+        return enqueue_job(db, owner_id, "analyze", payload, total=1).id
+    finally:
+        db.close()
+
+
+def _job(job_id: int) -> Job:
+    db = SessionLocal()
+    try:
+        return db.get(Job, job_id)
+    finally:
+        db.close()
+
+
+def _expire_lease(job_id: int):
+    db = SessionLocal()
+    try:
+        db.query(Job).filter(Job.id == job_id).update({Job.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)})
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_only_one_worker_claims_a_job(owner_id):
+    job_id = _enqueue(owner_id)
+    workers = 4
+    barrier = threading.Barrier(workers)
+    claims = {}
+
+    def claim(worker_id: str):
+        db = SessionLocal()
+        try:
+            barrier.wait()
+            claims[worker_id] = claim_next_job(db, worker_id)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=claim, args=(f"worker-{i}",)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    winners = [worker_id for worker_id, claimed in claims.items() if claimed == job_id]
+    assert len(claims) == workers
+    assert len(winners) == 1
+    assert all(claimed is None for worker_id, claimed in claims.items() if worker_id not in winners)
+    job = _job(job_id)
+    assert (job.status, job.lease_owner, job.attempts) == ("running", winners[0], 1)
+
+
+def test_expired_lease_moves_to_another_worker(owner_id):
+    job_id = _enqueue(owner_id)
+    db = SessionLocal()
+    try:
+        assert claim_next_job(db, "first") == job_id
+        # A live lease is not claimable.
+        assert claim_next_job(db, "second") is None
+
+        _expire_lease(job_id)
+        assert claim_next_job(db, "second") == job_id
+        job = _job(job_id)
+        assert (job.lease_owner, job.attempts) == ("second", 2)
+
+        # The worker that lost the lease can neither extend it nor finish the job.
+        assert not renew_lease(db, job_id, "first")
+        assert not _finish(db, job_id, "first", "succeeded", result={})
+        assert renew_lease(db, job_id, "second")
+        assert _job(job_id).lease_owner == "second"
+    finally:
+        db.close()
+
+
+def test_worker_runs_claimed_job_to_completion(owner_id):
+    job_id = _enqueue(owner_id)
+    assert process_next_job("worker")
+    job = _job(job_id)
+    assert job.status == "succeeded"
+    assert job.lease_owner is None
+    assert job.progress_done == job.progress_total == 1
+    assert 0 <= job.result["score"] <= 100
+    assert not process_next_job("worker")
+
+
+def test_job_that_keeps_losing_its_worker_is_given_up(owner_id):
+    job_id = _enqueue(owner_id)
+    db = SessionLocal()
+    try:
+        for attempt in range(_job(job_id).max_attempts):
+            assert claim_next_job(db, f"crashed-{attempt}") == job_id
+            _expire_lease(job_id)
+    finally:
+        db.close()
+
+    assert process_next_job("worker")
+    job = _job(job_id)
+    assert job.status == "failed"
+    assert job.error.startswith("Gave up after")
+    assert job.result is None
@@ -0,0 +1,28 @@
+import fcntl
+
+import pytest
+
+from app.services import lexical_model
+
+
+@pytest.fixture
+def lock_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(lexical_model._holder, "path", str(tmp_path / "lexical.pkl"))
+    monkeypatch.setattr(lexical_model, "_refresher_lock", None)
+    yield tmp_path / "lexical.pkl.refresh.lock"
+    if lexical_model._refresher_lock is not None:
+        lexical_model._refresher_lock.close()
+
+
+def test_only_one_process_is_elected_refresher(lock_path):
+    # Another worker already holds the lock.
+    other = open(lock_path, "a")
+    fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    assert not lexical_model._elect_refresher()
+
+    # Once it exits, the next attempt takes over and keeps the lock.
+    other.close()
+    assert lexical_model._elect_refresher()
+    assert lexical_model._elect_refresher()
+    with open(lock_path, "a") as contender, pytest.raises(BlockingIOError):
+        fcntl.flock(contender, fcntl.LOCK_EX | fcntl.LOCK_NB)
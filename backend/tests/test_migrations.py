@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, MetaData, String, Table, create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.migrations import MIGRATIONS, run_migrations
+from app.models import AnalysisRecord, SharedReport
+from app.services.analysis_store import analysis_result
+
+# The tables as they were before versioned migrations: the score as a string and the whole result as JSON.
+baseline = MetaData()
+users = Table(
+    "users",
+    baseline,
+    Column("id", Integer, primary_key=True),
+    Column("email", String, unique=True, nullable=False),
+    Column("hashed_password", String, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+)
+analysis_records = Table(
+    "analysis_records",
+    baseline,
+    Column("id", Integer, primary_key=True),
+    Column("owner_user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("mode", String, nullable=False),
+    Column("score", String, nullable=False),
+    Column("result_json", JSON, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+)
+shared_reports = Table(
+    "shared_reports",
+    baseline,
+    Column("id", Integer, primary_key=True),
+    Column("owner_user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("analysis_id", Integer, ForeignKey("analysis_records.id"), nullable=False),
+    Column("token", String, nullable=False, unique=True),
+    Column("expires_at", DateTime, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+)
+
+
+def _result(score: float, role_title):
+    return {
+        "score": score,
+        "confidence": 71.0,
+        "summary": f"Match {score}",
+        "overlapping_skills": ["python", "aws"],
+        "missing_skills": ["spark"],
+        "strengths": ["Strong python"],
+        "suggestions": ["Learn spark"],
+        "heatmap_data": [{"resume_index": 0, "jd_index": 1, "value": 88.2, "resume_chunk": "a", "jd_chunk": "b"}],
+        "keyword_density": [{"keyword": "python", "resume_density": 0.2, "jd_density": 0.4, "gap": 0.2}],
+        "top_matching_sections": [{"resume_index": 0, "jd_index": 1, "value": 88.2}],
+        "input_metadata": {
+            "semantic_similarity": 64.1,
+            "skill_coverage": 66.67,
+            "keyword_alignment": 52.0,
+            **({"role_title": role_title} if role_title else {}),
+        },
+    }
+
+
+def test_baseline_database_migrates_without_losing_analyses(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    baseline.create_all(engine)
+    now = datetime.utcnow()
+    results = {1: _result(82.5, "Backend Engineer"), 2: _result(40.25, None)}
+    with engine.begin() as conn:
+        conn.execute(users.insert(), [{"id": 1, "email": "a@example.com", "hashed_password": "x", "created_at": now}])
+        conn.execute(
+            analysis_records.insert(),
+            [
+                {
+                    "id": record_id,
+                    "owner_user_id": 1,
+                    "mode": "standard",
+                    "score": str(result["score"]),
+                    "result_json": result,
+                    "created_at": now,
+                }
+                for record_id, result in results.items()
+            ],
+        )
+        conn.execute(
+            shared_reports.insert(),
+            [{"id": 1, "owner_user_id": 1, "analysis_id": 1, "token": "t", "expires_at": now + timedelta(days=1), "created_at": now}],
+        )
+
+    assert run_migrations(engine) == [version for version, _, _ in MIGRATIONS]
+    assert run_migrations(engine) == []
+
+    session = sessionmaker(bind=engine)()
+    try:
+        records = {record.id: record for record in session.query(AnalysisRecord).all()}
+        assert set(records) == set(results)
+        for record_id, result in results.items():
+            record = records[record_id]
+            assert record.score == result["score"]
+            assert record.role_title == result["input_metadata"].get("role_title")
+            assert record.semantic_similarity == 64.1
+            assert record.detail_blob is not None
+            assert analysis_result(record) == result
+        share = session.query(SharedReport).one()
+        assert share.analysis_id == 1 and share.rendered_etag is None
+    finally:
+        session.close()
+        engine.dispose()
@@ -0,0 +1,45 @@
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.services import rate_limiter
+from app.services.rate_limiter import RateLimiter, limit_for, rate_limit_by_client
+
+
+def test_match_endpoints_share_one_budget(client, auth_headers, monkeypatch):
+    limiter = RateLimiter(None)
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_OVERRIDES", "match=2/60")
+    monkeypatch.setattr(rate_limiter, "get_rate_limiter", lambda: limiter)
+
+    # Empty forms fail validation, but only after the limiter has spent a token.
+    assert client.post("/match/analyze", headers=auth_headers).status_code == 422
+    assert client.post("/match/search-roles", headers=auth_headers).status_code == 422
+    response = client.post("/match/compare-roles", headers=auth_headers)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+
+
+def test_default_limits_keep_the_old_match_budget(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_OVERRIDES", "")
+    assert limit_for("match") == rate_limiter.RateLimit(30, 60)
+
+
+def _request(host: str) -> Request:
+    return Request({"type": "http", "method": "POST", "path": "/auth/login", "headers": [], "client": (host, 1234)})
+
+
+def test_client_address_limits_are_opt_in(monkeypatch):
+    limiter = RateLimiter(None)
+    monkeypatch.setattr(rate_limiter, "get_rate_limiter", lambda: limiter)
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_OVERRIDES", "")
+    unconfigured = rate_limit_by_client("auth")
+    for _ in range(100):
+        unconfigured()
+
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_OVERRIDES", "auth=1/60")
+    configured = rate_limit_by_client("auth")
+    configured(_request("10.0.0.1"))
+    configured(_request("10.0.0.2"))
+    with pytest.raises(HTTPException) as excinfo:
+        configured(_request("10.0.0.1"))
+    assert excinfo.value.status_code == 429
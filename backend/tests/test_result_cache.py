@@ -0,0 +1,82 @@
+from app.services import result_cache
+from app.services.result_cache import ResultCache, _encode, cached_result, content_key
+
+
+def _value(i: int) -> dict:
+    return {"score": i, "skills": [f"skill-{i}-{n}" for n in range(8)]}
+
+
+def test_content_key_covers_every_part():
+    assert content_key("pair", "a", "b") == content_key("pair", "a", "b")
+    assert content_key("pair", "a", "b") != content_key("other", "a", "b")
+    # Lengths are hashed with each part, so shifting text between parts changes the key.
+    assert content_key("pair", "ab", "c") != content_key("pair", "a", "bc")
+    assert content_key("pair", {"x": 1, "y": 2}) == content_key("pair", {"y": 2, "x": 1})
+
+
+def test_memory_tier_is_bounded_by_bytes_and_evicts_least_recently_used():
+    size = max(len(_encode(_value(i))) for i in range(3))
+    cache = ResultCache(memory_bytes=2 * size, disk_bytes=0, ttl_seconds=60, path=None)
+    cache.set_many({"a": _value(0), "b": _value(1)})
+    assert cache.get("a") == _value(0)  # a is now the most recently used
+    cache.set("c", _value(2))  # evicts b
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": _value(0), "c": _value(2)}
+    stats = cache.stats()
+    assert stats["memory_evictions"] == 1
+    assert stats["memory_bytes"] <= stats["memory_capacity_bytes"]
+    assert stats["misses"] == 1
+
+
+def test_values_come_back_as_copies():
+    cache = ResultCache(memory_bytes=1 << 20, disk_bytes=0, ttl_seconds=60, path=None)
+    cache.set("a", _value(0))
+    cache.get("a")["skills"].clear()
+    assert cache.get("a") == _value(0)
+
+
+def test_expired_entries_are_misses_in_both_tiers(tmp_path):
+    cache = ResultCache(memory_bytes=1 << 20, disk_bytes=1 << 20, ttl_seconds=60, path=str(tmp_path / "results.db"))
+    cache.set("stale", _value(0), ttl_seconds=0)
+    cache.set("fresh", _value(1))
+
+    assert cache.get_many(["stale", "fresh"]) == {"fresh": _value(1)}
+    assert cache.stats()["expirations"] >= 1
+    reopened = ResultCache(memory_bytes=1 << 20, disk_bytes=1 << 20, ttl_seconds=60, path=str(tmp_path / "results.db"))
+    assert reopened.get_many(["stale", "fresh"]) == {"fresh": _value(1)}
+
+
+def test_disk_tier_is_shared_and_evicts_oldest_access(tmp_path):
+    path = str(tmp_path / "results.db")
+    size = max(len(_encode(_value(i))) for i in range(20))
+    writer = ResultCache(memory_bytes=0, disk_bytes=10 * size, ttl_seconds=60, path=path)
+    writer.set_many({f"k{i}": _value(i) for i in range(5)})
+    for i in range(5, 20):
+        writer.set(f"k{i}", _value(i))
+    stats = writer.stats()
+    assert stats["disk_evictions"] > 0
+    assert stats["disk_bytes"] <= stats["disk_capacity_bytes"]
+
+    # Another process sees what survived: the most recent entries, never the oldest.
+    reader = ResultCache(memory_bytes=1 << 20, disk_bytes=10 * size, ttl_seconds=60, path=path)
+    found = reader.get_many(f"k{i}" for i in range(20))
+    assert found["k19"] == _value(19)
+    assert "k0" not in found
+    assert reader.stats()["disk_hits"] == len(found)
+    assert reader.get("k19") == _value(19)
+    assert reader.stats()["memory_hits"] == 1
+
+
+def test_cached_result_memoises_by_arguments(monkeypatch):
+    cache = ResultCache(memory_bytes=1 << 20, disk_bytes=0, ttl_seconds=60, path=None)
+    monkeypatch.setattr(result_cache, "get_result_cache", lambda: cache)
+    calls = []
+
+    @cached_result("double")
+    def double(x, scale=2):
+        calls.append((x, scale))
+        return {"value": x * scale}
+
+    assert double(3) == double(3) == {"value": 6}
+    assert double(3, scale=3) == {"value": 9}
+    assert calls == [(3, 2), (3, 3)]
@@ -0,0 +1,60 @@
+import numpy as np
+
+from conftest import JD, RESUME
+
+from app.database import SessionLocal
+from app.models import RoleFeatures, RoleProfile
+from app.services import lexical_model
+from app.services.lexical_model import fit_lexical_model
+from app.services.document_features import extract_document_features
+from app.services.role_features import jd_hash, load_role_features, split_role_features
+
+
+def _stored(role_id):
+    db = SessionLocal()
+    try:
+        role = db.get(RoleProfile, role_id)
+        row = db.query(RoleFeatures).filter(RoleFeatures.role_id == role_id).first()
+        return role, row, split_role_features(db, [role]) if role else ({}, [])
+    finally:
+        db.close()
+
+
+def test_features_are_stored_on_create_and_refreshed_on_jd_edit(client, auth_headers):
+    role_id = client.post("/roles", data={"title": "Backend", "jd_text": JD}, headers=auth_headers).json()["id"]
+    role, row, (loaded, stale) = _stored(role_id)
+    assert row.jd_hash == jd_hash(role.jd_text) and not stale
+    assert loaded[role_id].keyword_counts == extract_document_features(role.jd_text).keyword_counts
+
+    client.put(f"/roles/{role_id}", json={"title": "Platform"}, headers=auth_headers)
+    assert _stored(role_id)[1].jd_hash == row.jd_hash
+
+    edited = JD + " GraphQL and React are a plus."
+    client.put(f"/roles/{role_id}", json={"jd_text": edited}, headers=auth_headers)
+    role, row, (loaded, stale) = _stored(role_id)
+    assert row.jd_hash == jd_hash(role.jd_text) and not stale
+    assert {"graphql", "react"} <= set(loaded[role_id].skills)
+
+    client.delete(f"/roles/{role_id}", headers=auth_headers)
+    assert _stored(role_id)[1] is None
+
+
+def test_roles_stored_before_a_stable_model_are_reembedded_once(client, auth_headers, monkeypatch):
+    role_id = client.post("/roles", data={"title": "Backend", "jd_text": JD}, headers=auth_headers).json()["id"]
+    assert _stored(role_id)[1].doc_embedding is None
+
+    model = fit_lexical_model([f"{text} Document {i}." for i in range(12) for text in (RESUME, JD)])
+    monkeypatch.setattr(lexical_model._holder, "model", model)
+    _, _, (_, stale) = _stored(role_id)
+    assert [role.id for role in stale] == [role_id]
+
+    db = SessionLocal()
+    try:
+        role = db.get(RoleProfile, role_id)
+        features = load_role_features(db, [role])[role_id]
+        db.commit()
+    finally:
+        db.close()
+    _, row, (loaded, stale) = _stored(role_id)
+    assert not stale and row.model_id == model.model_id
+    np.testing.assert_allclose(loaded[role_id].doc_embedding, features.doc_embedding, atol=1e-3)
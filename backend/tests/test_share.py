@@ -0,0 +1,112 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database import SessionLocal
+from app.models import SharedReport, User
+from app.services.analysis_store import persist_analysis
+from app.services.share_rendering import get_share_cache, purge_expired_renderings
+
+RESULT = {
+    "score": 81.5,
+    "confidence": 0.9,
+    "strengths": ["Reach jane.doe@example.com or 555-123-4567 for references."],
+    "input_metadata": {"role_title": "Backend"},
+}
+
+
+@pytest.fixture
+def owner(client):
+    email = f"{uuid.uuid4().hex}@example.com"
+    response = client.post("/auth/register", json={"email": email, "password": "password123"})
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.id).filter(User.email == email).scalar()
+        analysis_id = persist_analysis(db, user_id, "standard", dict(RESULT)).id
+    finally:
+        db.close()
+    return analysis_id, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _share(client, owner) -> str:
+    analysis_id, headers = owner
+    response = client.post("/share/create", json={"analysis_id": analysis_id}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["token"]
+
+
+def _stored(token: str) -> tuple:
+    """The link's stored (ETag, rendered body)."""
+    db = SessionLocal()
+    try:
+        return db.query(SharedReport.rendered_etag, SharedReport.rendered_body).filter(SharedReport.token == token).one()
+    finally:
+        db.close()
+
+
+def _expire(*tokens: str):
+    db = SessionLocal()
+    try:
+        db.query(SharedReport).filter(SharedReport.token.in_(tokens)).update(
+            {SharedReport.expires_at: datetime.utcnow() - timedelta(minutes=1)}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+    for token in tokens:
+        get_share_cache().discard(token)
+
+
+def test_shared_report_is_masked_and_revalidates_with_etag(client, owner):
+    token = _share(client, owner)
+    response = client.get(f"/share/{token}")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"].startswith("private, max-age=")
+    strengths = response.json()["analysis"]["strengths"]
+    assert strengths == ["Reach j***@example.com or ***-***-**** for references."]
+
+    assert client.get(f"/share/{token}", headers={"If-None-Match": '"stale"'}).status_code == 200
+    cached = client.get(f"/share/{token}", headers={"If-None-Match": f"W/{etag}"})
+    assert (cached.status_code, cached.content, cached.headers["ETag"]) == (304, b"", etag)
+
+    # Another worker, without the rendering in memory, answers from the stored ETag alone.
+    get_share_cache().discard(token)
+    assert client.get(f"/share/{token}", headers={"If-None-Match": etag}).status_code == 304
+    reloaded = client.get(f"/share/{token}")
+    assert (reloaded.headers["ETag"], reloaded.content) == (etag, response.content)
+
+
+def test_expired_link_is_gone_and_drops_its_rendering(client, owner):
+    token = _share(client, owner)
+    etag = client.get(f"/share/{token}").headers["ETag"]
+    _expire(token)
+
+    assert client.get(f"/share/{token}").status_code == 410
+    assert client.get(f"/share/{token}", headers={"If-None-Match": etag}).status_code == 410
+    assert tuple(_stored(token)) == (None, None)
+
+
+def test_purge_clears_only_expired_renderings(client, owner):
+    expired, live = _share(client, owner), _share(client, owner)
+    _expire(expired)
+
+    db = SessionLocal()
+    try:
+        assert purge_expired_renderings(db, datetime.utcnow()) >= 1
+        db.commit()
+        assert purge_expired_renderings(db, datetime.utcnow()) == 0
+    finally:
+        db.close()
+    assert tuple(_stored(expired)) == (None, None)
+    assert _stored(live).rendered_body is not None
+    assert client.get(f"/share/{expired}").status_code == 410
+    assert client.get(f"/share/{live}").status_code == 200
+
+
+def test_revoked_link_stops_serving(client, owner):
+    token = _share(client, owner)
+    assert client.get(f"/share/{token}").status_code == 200
+    assert client.post("/share/revoke", json={"token": token}, headers=owner[1]).json() == {"ok": True}
+    assert client.get(f"/share/{token}").status_code == 404
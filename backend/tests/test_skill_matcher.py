@@ -0,0 +1,83 @@
+import pytest
+
+from app.services.skill_taxonomy import DEFAULT_TAXONOMY_PATH, build_taxonomy, load_taxonomy
+
+
+@pytest.fixture(scope="module")
+def taxonomy():
+    return load_taxonomy(str(DEFAULT_TAXONOMY_PATH))
+
+
+def skills(taxonomy, text):
+    return sorted({match.skill for match in taxonomy.matcher.iter_matches(text)})
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Worked in R&D, C++ and C# codebases, Next.js.", []),
+        ("Shipped Node.js and React.js services.", ["node", "react"]),
+        ("Built dashboards in Vue.js", ["vue"]),
+        ("Trained models with ML.NET", []),
+    ],
+)
+def test_alias_joined_by_dot_does_not_match(taxonomy, text, expected):
+    assert skills(taxonomy, text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Strong JS, TypeScript and SQL.", ["javascript", "sql", "typescript"]),
+        ("Ran workloads on k8s.", ["kubernetes"]),
+        ("Modern ML pipelines", ["machine learning"]),
+        ("Wrote plain js.", ["javascript"]),
+        ("Continuous Integration with Apache Airflow", ["airflow", "ci/cd"]),
+    ],
+)
+def test_standalone_alias_matches(taxonomy, text, expected):
+    assert skills(taxonomy, text) == expected
+
+
+def test_canonical_name_is_not_guarded():
+    taxonomy = build_taxonomy({"skills": [{"name": "node"}, {"name": "javascript", "aliases": ["js"]}]})
+    assert skills(taxonomy, "node.js") == ["node"]
+    assert skills(taxonomy, "the node.") == ["node"]
+
+
+def test_canonical_name_wins_over_alias_spelling():
+    taxonomy = build_taxonomy({"skills": [{"name": "go", "aliases": ["golang"]}, {"name": "golang"}]})
+    assert skills(taxonomy, "golang.org tooling") == ["golang"]
+
+
+def test_match_spans_point_at_source_text(taxonomy):
+    text = "Deployed to Amazon Web Services and k8s"
+    matches = {match.skill: match.matched_text for match in taxonomy.matcher.iter_matches(text)}
+    assert matches == {"aws": "Amazon Web Services", "kubernetes": "k8s"}
+
+
+def test_alias_counts_toward_canonical_name(taxonomy):
+    counts = taxonomy.matcher.count("Deployed workloads on k8s, then moved every Kubernetes cluster to AWS.")
+    assert counts == {"aws": 1, "kubernetes": 2}
+
+
+def test_overlapping_spellings_count_once(taxonomy):
+    assert taxonomy.matcher.count("Shipped node.js and Node services") == {"node": 2}
+
+
+def test_document_features_count_alias_skills():
+    from app.services.document_features import extract_document_features
+
+    features = extract_document_features("Deployed workloads on k8s with Helm charts.")
+    assert features.keyword_counts.get("kubernetes") == 1
+    assert set(features.keyword_counts) == set(features.skills)
+
+
+def test_keyword_density_agrees_with_document_features():
+    from app.services.document_features import extract_document_features
+    from app.services.skill_extractor import keyword_density
+
+    text = "Deployed workloads on k8s, then moved every Kubernetes cluster to AWS."
+    keywords = ["kubernetes", "aws", "python"]
+    assert keyword_density(text, keywords) == extract_document_features(text).density(keywords)
+    assert keyword_density(text, keywords)["kubernetes"] > keyword_density(text, keywords)["aws"] > 0
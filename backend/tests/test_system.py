@@ -0,0 +1,15 @@
+def test_api_metrics_keeps_json_totals(client, auth_headers):
+    for path in ("/api/metrics", "/api/metrics/summary"):
+        response = client.get(path)
+        assert response.status_code == 200
+        totals = response.json()
+        assert set(totals) == {"total_analyses", "total_users", "total_roles", "total_shared_reports"}
+        assert totals["total_users"] >= 1
+
+
+def test_prometheus_metrics_count_inserted_rows(client, auth_headers):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'talentalign_rows_created_total{table="users"}' in response.text
+    assert "# TYPE talentalign_http_request_duration_seconds histogram" in response.text
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from conftest import JD, RESUME, pdf_bytes
+
+from app.services import lexical_model, vector_index
+from app.services.lexical_model import fit_lexical_model
+from app.services.vector_index import VectorIndex
+
+
+def _unit(rows: np.ndarray) -> np.ndarray:
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def _exact(ids, matrix, query, k):
+    # Against the float16 vectors the index stores, so near-ties order the same way.
+    scores = matrix.astype(np.float16).astype(np.float32) @ query
+    return [ids[i] for i in np.argsort(-scores)[:k]]
+
+
+def test_flat_index_matches_exact_search_and_reopens(tmp_path):
+    rng = np.random.default_rng(1)
+    matrix = _unit(rng.normal(size=(300, 32)).astype(np.float32))
+    ids = list(range(1000, 1300))
+    base = str(tmp_path / "flat")
+    assert VectorIndex.open(base) is None
+
+    index = VectorIndex.build(base, ids, matrix, {"model_id": "m"})
+    query = _unit(rng.normal(size=(1, 32)).astype(np.float32))[0]
+    assert index.kind == "flat" and len(index) == 300
+    hits = index.search(query, 5)
+    assert [role_id for role_id, _ in hits] == _exact(ids, matrix, query, 5)
+    assert [score for _, score in hits] == sorted((score for _, score in hits), reverse=True)
+
+    assert VectorIndex.open(base).search(query, 5) == hits
+    assert index.search(query, 0) == [] and len(index.search(query, 1000)) == 300
+
+
+def test_ivf_index_probes_the_nearest_partitions(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_index, "IVF_MIN_ROWS", 100)
+    monkeypatch.setattr(vector_index, "IVF_PROBES", 3)
+    rng = np.random.default_rng(2)
+    centres = _unit(rng.normal(size=(8, 32)).astype(np.float32))
+    matrix = _unit(np.repeat(centres, 50, axis=0) + rng.normal(scale=0.05, size=(400, 32)).astype(np.float32))
+    ids = list(range(400))
+
+    index = VectorIndex.build(str(tmp_path / "ivf"), ids, matrix, {})
+    assert index.kind == "ivf"
+    # Rows are generated 50 per cluster; probing must land in the query's own cluster.
+    for cluster, centre in enumerate(centres):
+        assert {role_id // 50 for role_id, _ in index.search(centre, 20)} == {cluster}
+    for row in (0, 123, 399):
+        assert index.search(matrix[row], 1)[0][0] == row
+
+
+DESIGN_JD = "Visual designer for print campaigns, typography and illustration. " * 4
+
+
+@pytest.fixture
+def stable_model(monkeypatch):
+    model = fit_lexical_model([f"{text} Document {i}." for i in range(8) for text in (RESUME, JD, DESIGN_JD)])
+    monkeypatch.setattr(lexical_model._holder, "model", model)
+    return model
+
+
+def _search(client, headers, top_k):
+    response = client.post(
+        "/match/search-roles",
+        files={"resume_file": ("resume.pdf", pdf_bytes(RESUME), "application/pdf")},
+        data={"top_k": str(top_k)},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_search_roles_uses_the_index_and_picks_up_new_roles(client, auth_headers, stable_model):
+    titles = {"Backend": JD, "Design": DESIGN_JD}
+    for title, jd_text in titles.items():
+        assert client.post("/roles", data={"title": title, "jd_text": jd_text}, headers=auth_headers).status_code == 200
+
+    first = _search(client, auth_headers, 1)
+    assert first["retrieval"] == "flat"
+    assert [item["role_title"] for item in first["ranked"]] == ["Backend"]
+
+    client.post("/roles", data={"title": "Backend 2", "jd_text": JD + " Kubernetes."}, headers=auth_headers)
+    second = _search(client, auth_headers, 3)
+    assert {item["role_title"] for item in second["ranked"]} == {"Backend", "Backend 2", "Design"}
+
+
+def test_search_roles_ranks_by_skill_coverage_without_a_stable_model(client, auth_headers):
+    client.post("/roles", data={"title": "Backend", "jd_text": JD}, headers=auth_headers)
+    result = _search(client, auth_headers, 5)
+    assert result["retrieval"] == "skills"
+    assert [item["role_title"] for item in result["ranked"]] == ["Backend"]